@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+
+"""
+$ python3 benchmarks/benchmark_solver.py --help
+
+Benchmark how WordSearchPuzzle scales with the size of the puzzle and the amount of words.
+Puzzles with planted words are made by puzzle_generator from a seed, so every run measures the same puzzles.
+
+Per puzzle size, word count, engine and method the wall time of
+construction, find_words_in_puzzle and get_left_over_letters is measured
+and, in a second pass under tracemalloc, the peak memory of each phase.
+The results are written to a JSON file that can be compared to the file of an earlier run.
+
+    # a quick run, of the methods along straight lines
+    $ python3 benchmarks/benchmark_solver.py --output bench.json
+
+    # bent-path finds words that turn corners as well, so it is only measured when it is asked for
+    $ python3 benchmarks/benchmark_solver.py --methods index bent-path --output bench.json
+
+    # the full matrix, making a 1000 x 1000 puzzle of 10000 words takes a few minutes
+    $ python3 benchmarks/benchmark_solver.py --sizes 10 100 500 1000 --word-counts 10 1000 10000 \\
+          --engines numpy --output bench.json
+
+    # compare with an earlier run, exits with 1 if a phase got slower than the threshold allows
+    $ python3 benchmarks/benchmark_solver.py --output new.json --compare bench.json
+"""
+
+import io
+import os
+import sys
+import json
+import time
+import random
+import string
+import argparse
+import platform
+import tempfile
+import tracemalloc
+import contextlib
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
+
+import numpy as np
+
+from word_search_puzzle import puzzle_generator
+from word_search_puzzle.word_search_solver import WordSearchPuzzle
+
+PHASES = ('construction', 'find_words_in_puzzle', 'get_left_over_letters')
+
+
+def generate_puzzle(size: int, word_count: int, seed: int, min_word_length: int = 3,
+                    max_word_length: int = 10) -> tuple:
+    """
+    Generate a square puzzle with words planted in all 8 directions by puzzle_generator.PuzzleGenerator
+    The words are planted until they cover half of the cells, the other words are only in the word set
+
+    :param size:  The width and height of the puzzle
+    :param word_count:  The amount of words in the word set
+    :param seed:  The seed of the random generator
+    :return tuple:  The grid_engine.GridEngine of the puzzle, a set of words and the amount of planted words
+    """
+    rng = random.Random(seed)
+    words = set()
+    while len(words) < word_count:
+        length = rng.randint(min(min_word_length, size), min(max_word_length, size))
+        words.add(''.join(rng.choice(string.ascii_lowercase) for _ in range(length)))
+
+    planted, cells = [], 0
+    for word in sorted(words):
+        if cells + len(word) > size * size // 2:
+            break
+        planted.append(word)
+        cells += len(word)
+
+    grid, placements = puzzle_generator.PuzzleGenerator(size, size).generate(planted, rng=rng)
+    return grid, words, len(placements)  # -> tuple
+
+
+def run_phases(puzzle_file: str, word_set_file: str, engine: str, method: str, measure_memory: bool) -> dict:
+    """
+    Run the phases of a solve once
+
+    :return dict:  phase -> seconds, or phase -> peak bytes if measure_memory is True
+    """
+    measurements = {}
+
+    def measure(phase: str, function):
+        if measure_memory:
+            tracemalloc.start()
+        start = time.perf_counter()
+        result = function()
+        measurements[phase] = time.perf_counter() - start
+        if measure_memory:
+            measurements[phase] = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+        return result
+
+    with contextlib.redirect_stdout(io.StringIO()):  # the words that are not found are printed
+        ws = measure('construction', lambda: WordSearchPuzzle(puzzle_file, word_set_file, get_solution=False,
+                                                              engine=engine))
+        measure('find_words_in_puzzle', lambda: ws.find_words_in_puzzle(method=method))
+        measure('get_left_over_letters', ws.get_left_over_letters)
+    measurements['found'] = len(ws.solution_coordinates)
+    return measurements  # -> dict
+
+
+def run_benchmark(args: argparse.Namespace) -> dict:
+    """ run every case of the matrix, return the report """
+    report = {
+        'meta': {
+            'time': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'numpy': np.__version__,
+            'seed': args.seed,
+            'repeat': args.repeat,
+        },
+        'results': [],
+    }
+    try:
+        import pandas as pd
+        report['meta']['pandas'] = pd.__version__
+    except ImportError:
+        pass
+
+    with tempfile.TemporaryDirectory() as directory:
+        for size in args.sizes:
+            for word_count in args.word_counts:
+                grid, words, planted_count = generate_puzzle(size, word_count, args.seed)
+                puzzle_file = os.path.join(directory, 'benchmark_puzzle.txt')
+                word_set_file = os.path.join(directory, 'benchmark_set.txt')
+                puzzle_generator.write_puzzle(grid, words, puzzle_file, word_set_file)
+
+                for engine in args.engines:
+                    for method in args.methods:
+                        result = {'size': size, 'word_count': word_count, 'planted': planted_count,
+                                  'engine': engine, 'method': method}
+                        timings = [run_phases(puzzle_file, word_set_file, engine, method, False)
+                                   for _ in range(args.repeat)]
+                        for phase in PHASES:  # the best of the repeats is the least disturbed
+                            result['%s_s' % phase] = min(timing[phase] for timing in timings)
+                        result['found'] = timings[0]['found']
+                        if args.memory:
+                            peaks = run_phases(puzzle_file, word_set_file, engine, method, True)
+                            for phase in PHASES:
+                                result['%s_peak_bytes' % phase] = peaks[phase]
+
+                        report['results'].append(result)
+                        sys.stderr.write('size %5s words %6s %-6s %-12s %s\n' % (
+                            size, word_count, engine, method,
+                            ' '.join('%s %.4fs' % (phase, result['%s_s' % phase]) for phase in PHASES)))
+    return report  # -> dict
+
+
+def compare_reports(report: dict, previous: dict, threshold: float) -> list:
+    """
+    Compare the timings of two reports
+
+    :param threshold:  A phase is a regression when it takes longer than threshold times the previous time
+    :return list:  A list of messages of the regressions
+    """
+    def case(result: dict) -> tuple:
+        return result['size'], result['word_count'], result['engine'], result['method']
+
+    previous_results = {case(result): result for result in previous['results']}
+    regressions = []
+    for result in report['results']:
+        previous_result = previous_results.get(case(result))
+        if previous_result is None:
+            continue
+        for phase in PHASES:
+            key = '%s_s' % phase
+            old, new = previous_result.get(key), result[key]
+            if old and new > old * threshold:
+                regressions.append('size %s words %s %s %s: %s %.4fs -> %.4fs (x%.2f)'
+                                   % (case(result) + (phase, old, new, new / old)))
+    return regressions  # -> list
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark WordSearchPuzzle on generated puzzles')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10, 100, 500],
+                        help='The widths and heights of the puzzles')
+    parser.add_argument('--word-counts', type=int, nargs='+', default=[10, 1000],
+                        help='The amounts of words to search for')
+    parser.add_argument('--engines', type=str, nargs='+', default=['numpy'], choices=WordSearchPuzzle.ENGINES,
+                        help='The engines to measure')
+    parser.add_argument('--methods', type=str, nargs='+',
+                        default=[method for method in WordSearchPuzzle.METHODS if method != 'bent-path'],
+                        choices=WordSearchPuzzle.METHODS,
+                        help='The methods to measure, the methods along straight lines by default, '
+                             'bent-path finds more words and is only measured when it is given')
+    parser.add_argument('--seed', type=int, default=0, help='The seed of the generated puzzles')
+    parser.add_argument('--repeat', type=int, default=3, help='The amount of times a case is timed')
+    parser.add_argument('--no-memory', action='store_false', dest='memory',
+                        help='Skip the peak memory pass')
+    parser.add_argument('--output', type=str, default=None, help='The JSON file to write the results to')
+    parser.add_argument('--compare', type=str, default=None, help='A JSON file of an earlier run')
+    parser.add_argument('--threshold', type=float, default=1.25,
+                        help='The slow down of a phase that counts as a regression')
+    args = parser.parse_args()
+
+    report = run_benchmark(args)
+    if args.output is not None:
+        with open(args.output, 'w') as open_file:
+            json.dump(report, open_file, indent=2)
+    else:
+        sys.stdout.write(json.dumps(report, indent=2) + '\n')
+
+    if args.compare is not None:
+        with open(args.compare, 'r') as open_file:
+            regressions = compare_reports(report, json.load(open_file), args.threshold)
+        for message in regressions:
+            sys.stderr.write('regression: %s\n' % message)
+        sys.exit(1 if regressions else 0)
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+
+"""
+$ python3 benchmarks/benchmark_startup.py --help
+
+Benchmark the cold start of main.py, the cost paid by every call from a shell pipeline.
+Every run is a new interpreter, the median wall time of the runs is compared to a budget.
+
+    --help   only parses the arguments, main.py imports the solver and numpy after parsing
+    solve    solves the 10x10 test puzzle with the numpy engine, without importing pandas
+
+A run also lists the modules imported with  python3 -X importtime,
+a command fails the budget when it imports one of the --forbidden modules, --help when it imports numpy as well.
+
+    # exits with 1 if a command takes longer than its budget or imports a module it should not
+    $ python3 benchmarks/benchmark_startup.py --help-budget 0.3 --solve-budget 0.4
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import statistics
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+MAIN = os.path.join(ROOT, 'word_search_puzzle', 'main.py')
+PUZZLE = os.path.join(ROOT, 'tests', 'puzzles', 'test_word_search_puzzle.txt')
+WORD_SET = os.path.join(ROOT, 'tests', 'puzzles', 'test_word_search_set.txt')
+
+
+def get_imported_modules(arguments: list) -> set:
+    """
+    Run main.py once with  -X importtime  to find the modules it imports
+
+    :param arguments:  The arguments given to main.py
+    :return set:  The names of the imported modules
+    """
+    process = subprocess.run([sys.executable, '-X', 'importtime', MAIN] + arguments,
+                             stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, universal_newlines=True)
+    # import time: self [us] | cumulative | imported package
+    return {line.rsplit('|', 1)[-1].strip() for line in process.stderr.splitlines()
+            if line.startswith('import time:') and '|' in line}  # -> set
+
+
+def time_command(arguments: list, repeat: int) -> list:
+    """
+    Time main.py with the arguments in a new interpreter per run
+
+    :return list:  The wall time in seconds of every run
+    """
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, MAIN] + arguments, stdout=subprocess.DEVNULL, check=True)
+        timings.append(time.perf_counter() - start)
+    return timings  # -> list
+
+
+def run_benchmark(args: argparse.Namespace) -> dict:
+    """ time every command and check it against its budget """
+    commands = (('help', ['--help'], args.help_budget, ['numpy']),
+                ('solve', ['-p', PUZZLE, '-s', WORD_SET], args.solve_budget, []))
+
+    report = {'python': sys.version.split()[0], 'repeat': args.repeat, 'results': []}
+    for name, arguments, budget, also_forbidden in commands:
+        time_command(arguments, 1)  # warm up the file system cache and the byte code
+        timings = time_command(arguments, args.repeat)
+        forbidden = sorted(set(args.forbidden + also_forbidden).intersection(get_imported_modules(arguments)))
+        result = {'command': name, 'median_s': statistics.median(timings), 'min_s': min(timings),
+                  'budget_s': budget, 'forbidden_imports': forbidden}
+        result['within_budget'] = result['median_s'] <= budget and not forbidden
+        report['results'].append(result)
+        sys.stderr.write('%-6s median %.3fs min %.3fs budget %.3fs %s\n'
+                         % (name, result['median_s'], result['min_s'], budget,
+                            'ok' if result['within_budget'] else 'OVER BUDGET %s' % ' '.join(forbidden)))
+    return report  # -> dict
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark the cold start of main.py')
+    parser.add_argument('--repeat', type=int, default=10, help='The amount of times a command is timed')
+    parser.add_argument('--help-budget', type=float, default=0.35,
+                        help='The median seconds allowed for main.py --help')
+    parser.add_argument('--solve-budget', type=float, default=0.45,
+                        help='The median seconds allowed to solve the 10x10 test puzzle')
+    parser.add_argument('--forbidden', type=str, nargs='*', default=['pandas', 'tkinter'],
+                        help='The modules the numpy engine may not import')
+    parser.add_argument('--output', type=str, default=None, help='The JSON file to write the results to')
+    args = parser.parse_args()
+
+    report = run_benchmark(args)
+    if args.output is not None:
+        with open(args.output, 'w') as open_file:
+            json.dump(report, open_file, indent=2)
+    else:
+        sys.stdout.write(json.dumps(report, indent=2) + '\n')
+    sys.exit(0 if all(result['within_budget'] for result in report['results']) else 1)
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+
+import unittest
+from unittest.mock import patch, call
+
+from word_search_puzzle.aho_corasick import AhoCorasick
+from word_search_puzzle.word_search_solver import WordSearchPuzzle
+
+
+class AhoCorasickTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.word_search_puzzle = r"puzzles/test_word_search_puzzle.txt"
+        cls.word_search_set = r"puzzles/test_word_search_set.txt"
+
+    def test_iter_matches(self):
+
+        automaton = AhoCorasick({'he', 'she', 'hers', 'his', ''})
+        result = list(automaton.iter_matches('ushers ahishers'))
+
+        # every occurrence is found, also the ones that overlap
+        self.assertEqual(result, [(1, 'she'), (2, 'he'), (2, 'hers'), (8, 'his'),
+                                  (10, 'she'), (11, 'he'), (11, 'hers')])
+
+        # nothing is found in a text without the words
+        self.assertEqual(list(automaton.iter_matches('abc')), [])
+
+    def test_search_lines(self):
+
+        automaton = AhoCorasick(['level', 'eve'])
+        result = list(automaton.search_lines(['xlevelx', 'eve', 'lev']))
+        self.assertEqual(sorted(result), [('eve', 0, 2), ('eve', 1, 0), ('level', 0, 1)])
+
+    def test_find_words_in_puzzle(self):
+
+        ws = WordSearchPuzzle(self.word_search_puzzle, self.word_search_set, get_solution=False)
+
+        # should get an error when an unknown method is given
+        with self.assertRaises(AssertionError):
+            ws.find_words_in_puzzle(method='unknown')
+
+        with patch('builtins.print') as mocked_print:
+            index_result = ws.find_words_in_puzzle(method='index')
+            result = ws.find_words_in_puzzle(method='aho-corasick')
+            self.assertIn(call('not_found is not found'), mocked_print.mock_calls)
+
+        # both methods give the same coordinates
+        self.assertEqual(result, index_result)
+        self.assertEqual(result, ws.solution_coordinates)
+
+
+if __name__ == '__main__':
+    unittest.main()
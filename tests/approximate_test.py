@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+
+import random
+import unittest
+from unittest.mock import patch, call
+
+from word_search_puzzle.approximate import ShiftAnd
+from word_search_puzzle.word_search_solver import WordSearchPuzzle
+
+
+class ShiftAndTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.word_search_puzzle = r"puzzles/test_word_search_puzzle.txt"
+        cls.word_search_set = r"puzzles/test_word_search_set.txt"
+
+    def test_iter_matches(self):
+
+        automaton = ShiftAnd({'cat', 'dog'}, max_mismatches=1)
+        self.assertEqual(list(automaton.iter_matches('a cot')), [(2, 'cat', 1)])
+        self.assertEqual(list(automaton.iter_matches('catdog')), [(0, 'cat', 0), (3, 'dog', 0)])
+
+        # words not longer than the amount of mismatches would match everywhere
+        self.assertEqual(ShiftAnd({'a', 'ab'}, max_mismatches=1).words, ['ab'])
+        with self.assertRaises(AssertionError):
+            ShiftAnd({'cat'}, max_mismatches=-1)
+
+    def test_brute_force(self):
+
+        rng = random.Random(0)
+        for _ in range(200):
+            text = ''.join(rng.choice('abc') for _ in range(30))
+            words = {''.join(rng.choice('abc') for _ in range(rng.randint(1, 6))) for _ in range(5)}
+            max_mismatches = rng.randint(0, 2)
+
+            expected = []
+            for word in words:
+                for start in range(len(text) - len(word) + 1):
+                    wrong = sum(letter != found for letter, found in zip(word, text[start:]))
+                    if len(word) > max_mismatches and wrong <= max_mismatches:
+                        expected.append((start, word, wrong))
+            result = ShiftAnd(words, max_mismatches).iter_matches(text)
+            self.assertEqual(sorted(result), sorted(expected))
+
+    def test_find_words_in_puzzle(self):
+
+        with patch('builtins.print') as mocked_print:
+            ws = WordSearchPuzzle(self.word_search_puzzle, get_solution=False, engine='numpy')
+            (coordinates, ) = ws.find_words_in_puzzle({'horizontal'})
+
+            # without mismatches a typing error is not found
+            self.assertEqual(ws.find_words_in_puzzle({'horizoxtal'}), set())
+            self.assertEqual(ws.words_not_found, ['horizoxtal'])
+
+            # the match with the fewest wrong letters is added to the solution
+            self.assertEqual(ws.find_words_in_puzzle({'horizoxtal', 'horizontal'}, mismatches=1), {coordinates})
+            self.assertEqual(ws.words_not_found, [])
+            self.assertEqual(ws.approximate_matches, {'horizoxtal': [(coordinates, (coordinates[6], ))]})
+            message = 'horizoxtal is found with wrong letters on %s' % str((coordinates[6], ))
+            mocked_print.assert_has_calls([call(message)])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+
+import os
+import json
+import tempfile
+import unittest
+
+from word_search_puzzle import batch
+
+
+class BatchTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.word_search_puzzle = os.path.realpath(r"puzzles/test_word_search_puzzle.txt")
+        cls.word_search_set = os.path.realpath(r"puzzles/test_word_search_set.txt")
+
+    def test_find_puzzle_pairs(self):
+
+        # should get an error when an invalid path is given
+        with self.assertRaises(AssertionError):
+            batch.find_puzzle_pairs('/not/a/path')
+
+        # a directory pairs <name>_puzzle.txt with <name>_set.txt
+        result = batch.find_puzzle_pairs('puzzles')
+        self.assertEqual(result, [(self.word_search_puzzle, self.word_search_set)])
+
+        # a manifest lists the pairs, relative to the manifest
+        with tempfile.TemporaryDirectory() as temp_dir:
+            manifest = os.path.join(temp_dir, 'manifest.txt')
+            with open(manifest, 'w') as open_file:
+                open_file.write('# puzzle, set\n\n%s, %s\nfoo.txt bar.txt\n'
+                                % (self.word_search_puzzle, self.word_search_set))
+            result = batch.find_puzzle_pairs(manifest)
+        self.assertEqual(result, [(self.word_search_puzzle, self.word_search_set),
+                                  (os.path.join(temp_dir, 'foo.txt'), os.path.join(temp_dir, 'bar.txt'))])
+
+    def test_solve_pair(self):
+
+        result = batch.solve_pair((self.word_search_puzzle, self.word_search_set))
+        self.assertNotIn('error', result)
+        self.assertEqual(result['words_not_found'], ['not_found'])
+        self.assertTrue(result['solution_coordinates'])
+        self.assertTrue(isinstance(result['left_over_letters'], str))
+
+        # a puzzle that can not be solved gives an error instead of stopping the batch
+        result = batch.solve_pair(('/not/a/path.txt', self.word_search_set))
+        self.assertIn('error', result)
+
+    def test_solve_batch(self):
+
+        pairs = [(self.word_search_puzzle, self.word_search_set)] * 3 + [('/not/a/path.txt', self.word_search_set)]
+        expected = batch.solve_pair(pairs[0])
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            output = os.path.join(temp_dir, 'results.json')
+            results = batch.solve_batch(pairs, max_workers=2, engine='numpy', method='aho-corasick')
+            errors = batch.write_results(results, output)
+            with open(output) as open_file:
+                result = json.load(open_file)
+
+        self.assertEqual(errors, 1)
+        self.assertEqual(result[:3], [expected] * 3)
+
+        # a directory gets a JSON file per puzzle
+        with tempfile.TemporaryDirectory() as temp_dir:
+            batch.write_results([expected], temp_dir)
+            self.assertEqual(os.listdir(temp_dir), ['test_word_search.json'])
+
+        # the options of the search and the cache reach the workers
+        with tempfile.TemporaryDirectory() as temp_dir:
+            results = list(batch.solve_batch(pairs[:2], max_workers=2, engine='numpy', method='aho-corasick',
+                                             directions=4, cache_dir=temp_dir))
+            self.assertTrue(os.listdir(temp_dir))
+        self.assertEqual(results[0], results[1])
+        # a palindrome is found once in 4 directions
+        self.assertLess(len(results[0]['solution_coordinates']), len(expected['solution_coordinates']))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+
+import random
+import unittest
+from unittest.mock import patch
+
+from word_search_puzzle.bent_path import BentPathSearch
+from word_search_puzzle.grid_engine import GridEngine, DIRECTIONS
+from word_search_puzzle.word_search_solver import WordSearchPuzzle
+
+
+class BentPathSearchTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.word_search_puzzle = r"puzzles/test_word_search_puzzle.txt"
+        cls.word_search_set = r"puzzles/test_word_search_set.txt"
+
+    def get_paths(self, grid: GridEngine, words: set) -> set:
+        """ every path of every word, by trying every path """
+        height, width = grid.shape
+        paths = set()
+
+        def extend(word: str, path: list):
+            if len(path) == len(word):
+                paths.add((word, tuple(path)))
+                return
+            x, y = path[-1]
+            for step_x, step_y in DIRECTIONS:
+                cell = (x + step_x, y + step_y)
+                if 0 <= cell[0] < width and 0 <= cell[1] < height and cell not in path \
+                        and grid.get_letters([cell]) == word[len(path)]:
+                    extend(word, path + [cell])
+
+        for word in words:
+            for y in range(height):
+                for x in range(width):
+                    if grid.get_letters([(x, y)]) == word[0]:
+                        extend(word, [(x, y)])
+        return paths  # -> set
+
+    def test_search(self):
+
+        grid = GridEngine.from_lines(['ca', 'xt'])
+        self.assertEqual(list(BentPathSearch(grid).search({'cat', 'tax'})),
+                         [('cat', ((0, 0), (1, 0), (1, 1))), ('tax', ((1, 1), (1, 0), (0, 1)))])
+
+        # a cell is not used twice, words with letters that are not in the grid are left out
+        self.assertEqual(list(BentPathSearch(grid).search({'cac', 'cab', 'ca'}, min_length=3)), [])
+
+        rng = random.Random(0)
+        for _ in range(100):
+            lines = [''.join(rng.choice('ab ') for _ in range(rng.randint(1, 5))) for _ in range(rng.randint(1, 5))]
+            grid = GridEngine.from_lines(lines)
+            words = {''.join(rng.choice('abc') for _ in range(rng.randint(1, 7))) for _ in range(6)}
+            result = list(BentPathSearch(grid).search(words))
+            self.assertEqual(len(result), len(set(result)))
+            self.assertEqual(set(result), self.get_paths(grid, words))
+
+    def test_find_words_in_puzzle(self):
+
+        with patch('builtins.print'):
+            ws = WordSearchPuzzle(self.word_search_puzzle, self.word_search_set, get_solution=False, engine='numpy')
+            straight = ws.find_words_in_puzzle(method='aho-corasick')
+            bent = ws.find_words_in_puzzle(method='bent-path')
+
+            # the straight paths are bent paths too
+            self.assertTrue(straight <= bent)
+            self.assertTrue(isinstance(ws.get_left_over_letters(), str))
+
+            with self.assertRaises(AssertionError):
+                ws.find_words_in_puzzle(method='bent-path', partition='tiles')
+
+
+if __name__ == '__main__':
+    unittest.main()
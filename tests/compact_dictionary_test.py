@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+
+import os
+import random
+import tempfile
+import unittest
+
+from word_search_puzzle.compact_dictionary import (dump_compact_dictionary, load_compact_dictionary,
+                                                   is_compact_dictionary)
+from word_search_puzzle.word_search_solver import WordSearchPuzzle
+
+
+class CompactDictionaryTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.word_search_puzzle = r"puzzles/test_word_search_puzzle.txt"
+        cls.word_search_set = r"puzzles/test_word_search_set.txt"
+
+        cls.temp_dir = tempfile.TemporaryDirectory()
+        cls.compact_file = os.path.join(cls.temp_dir.name, 'dictionary.wsd')
+
+        rng = random.Random(4)
+        cls.words = {''.join(rng.choice('abcdeéf') for _ in range(rng.randint(1, 9))) for _ in range(2000)}
+        dump_compact_dictionary(cls.compact_file, cls.words, block_size=8)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.temp_dir.cleanup()
+
+    def test_dump_compact_dictionary(self):
+
+        # should get an error when the directory does not exist
+        with self.assertRaises(AssertionError):
+            dump_compact_dictionary('/not/a/dir/dictionary.wsd', self.words)
+
+        self.assertTrue(is_compact_dictionary(self.compact_file))
+        self.assertFalse(is_compact_dictionary(self.word_search_set))
+
+    def test_membership(self):
+
+        with load_compact_dictionary(self.compact_file) as dictionary:
+            self.assertEqual(len(dictionary), len(self.words))
+            self.assertEqual(list(dictionary), sorted(self.words, key=lambda word: word.encode('utf-8')))
+
+            for word in self.words:
+                self.assertIn(word, dictionary)
+            for word in ('', 'g', 'aaaaaaaaaa', 'fffffffffa'):
+                self.assertNotIn(word, dictionary)
+
+    def test_prefix(self):
+
+        with load_compact_dictionary(self.compact_file) as dictionary:
+            for prefix in ('', 'a', 'ab', 'éf', 'fff', 'g', 'abcdeabcd'):
+                expected = sorted((word for word in self.words if word.startswith(prefix)),
+                                  key=lambda word: word.encode('utf-8'))
+                self.assertEqual(list(dictionary.iter_prefix(prefix)), expected)
+                self.assertEqual(dictionary.has_prefix(prefix), bool(expected))
+
+    def test_discover_words(self):
+
+        ws = WordSearchPuzzle(self.word_search_puzzle, self.word_search_set, get_solution=False)
+        compact_file = os.path.join(self.temp_dir.name, 'word_set.wsd')
+        dump_compact_dictionary(compact_file, ws.word_set)
+
+        # the compact dictionary finds the same words as the set
+        with load_compact_dictionary(compact_file) as dictionary:
+            self.assertEqual(ws.discover_words(dictionary, min_length=3), ws.discover_words(min_length=3))
+
+        # a mixed case word list is made lowercase, like the trie of a set
+        mixed_case = {word.title() if number % 2 else word.upper() for number, word in enumerate(sorted(ws.word_set))}
+        dump_compact_dictionary(compact_file, mixed_case)
+        with load_compact_dictionary(compact_file) as dictionary:
+            self.assertEqual(set(dictionary), ws.word_set)
+            self.assertEqual(ws.discover_words(dictionary, min_length=3), ws.discover_words(mixed_case, min_length=3))
+
+
+if __name__ == '__main__':
+    unittest.main()
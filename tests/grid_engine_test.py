@@ -0,0 +1,354 @@
+#!/usr/bin/env python3
+
+import os
+import random
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+
+from word_search_puzzle import profiling
+from word_search_puzzle.grid_engine import GridEngine, DIRECTIONS, FORWARD_DIRECTIONS, BLANK
+from word_search_puzzle.word_search_solver import WordSearchPuzzle
+
+
+class GridEngineTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.word_search_puzzle = r"puzzles/test_word_search_puzzle.txt"
+        cls.word_search_set = r"puzzles/test_word_search_set.txt"
+
+        cls.grid = GridEngine.from_file(cls.word_search_puzzle)
+
+    def test_from_file(self):
+
+        # should get an error when an invalid file path is given
+        with self.assertRaises(AssertionError):
+            GridEngine.from_file('/not/a/path.txt')
+
+        # the grid is a contiguous array in the size of the puzzle
+        self.assertEqual(self.grid.shape, (14, 14))
+        self.assertEqual(self.grid.grid.dtype, np.uint8)
+        self.assertTrue(self.grid.grid.flags['C_CONTIGUOUS'])
+
+        # DataFrame[column][row] and grid[row, column] hold the same letter
+        puzzle_df = WordSearchPuzzle(self.word_search_puzzle).puzzle_df
+        for (row, column), value in np.ndenumerate(self.grid.grid):
+            self.assertEqual(chr(value), puzzle_df[column][row])
+
+    def test_from_lines(self):
+
+        # short lines are filled with blanks, letters are made lowercase
+        grid = GridEngine.from_lines(['AB', 'c\td', 'e'])
+        self.assertEqual(grid.shape, (3, 3))
+        self.assertEqual(grid.get_letters(((0, 0), (1, 0), (2, 0))), 'ab ')
+        self.assertEqual(grid.get_letters(((0, 1), (1, 1), (2, 1))), 'c d')
+        self.assertEqual(int(grid.grid[2, 2]), BLANK)
+
+        # letters outside of a byte are stored as uint32
+        grid = GridEngine.from_lines(['ab', 'cā'])
+        self.assertEqual(grid.grid.dtype, np.uint32)
+        self.assertEqual(grid.get_letters(((1, 1), )), 'ā')
+
+    def test_from_text(self):
+
+        # windows line endings, a missing last newline and an empty line
+        grid = GridEngine.from_text('AbC\r\nd\x0be\r\n\r\nfg')
+        self.assertEqual(grid.shape, (4, 3))
+        rows = [grid.get_letters((x, y) for x in range(3)) for y in range(4)]
+        self.assertEqual(rows, ['abc', 'd e', '   ', 'fg '])
+
+        # an empty text is an empty grid
+        self.assertEqual(GridEngine.from_text('').shape, (0, 0))
+
+        # lines of the same length give the same grid as lines of different lengths
+        self.assertTrue(np.array_equal(GridEngine.from_text('ab\ncd\n').grid,
+                                       GridEngine.from_lines(['ab', 'cd']).grid))
+
+        # 'İ' is 2 letters in lowercase, its cell keeps the first one and the columns after it stay in place
+        grid = GridEngine.from_text('AİB\nCDE')
+        self.assertEqual(grid.shape, (2, 3))
+        self.assertEqual([grid.get_letters((x, y) for x in range(3)) for y in range(2)], ['aib', 'cde'])
+
+    def test_get_direction_views(self):
+
+        # should get an error when an invalid direction is given
+        with self.assertRaises(AssertionError):
+            self.grid.get_direction_views(self.grid.grid, (2, 0))
+
+        for direction in DIRECTIONS:
+            for view in self.grid.get_direction_views(self.grid.grid, direction):
+                # the views do not copy the grid
+                self.assertTrue(np.shares_memory(view, self.grid.grid))
+
+    def test_get_direction_table(self):
+
+        # should get an error when an invalid direction is given
+        with self.assertRaises(AssertionError):
+            self.grid.get_direction_table((0, 2))
+
+        for direction in DIRECTIONS:
+            views = self.grid.get_direction_views(self.grid.grid, direction)
+            table = self.grid.get_direction_table(direction)
+            self.assertEqual(len(views), len(table))
+
+            for view, line in zip(views, table):
+                self.assertEqual((line['step_x'], line['step_y']), direction)
+                self.assertEqual(line['length'], len(view))
+
+                # the coordinates of the line spell the letters of the view
+                coordinates = self.grid.get_coordinates(line, 0, len(view))
+                self.assertEqual(self.grid.get_letters(coordinates), self.grid._to_string(view))
+
+    def test_directions(self):
+
+        # the reverse of a direction is 2 places further in its group of 4, match_records.AXES depends on it
+        for number, (step_x, step_y) in enumerate(DIRECTIONS):
+            self.assertEqual(DIRECTIONS[number // 4 * 4 + (number + 2) % 4], (-step_x, -step_y))
+        self.assertEqual(set(FORWARD_DIRECTIONS) | {(-x, -y) for x, y in FORWARD_DIRECTIONS}, set(DIRECTIONS))
+
+    def test_get_all_lines(self):
+
+        list_of_strings, line_table = self.grid.get_all_lines()
+
+        # 4 * 14(height) + 4 * 27, the same as get_all_possibilities
+        self.assertEqual(len(list_of_strings), 164)
+        self.assertEqual(len(line_table), 164)
+
+        # 'horizontal' is on the 2nd row, starting at the 2nd letter
+        start_pos = list_of_strings[1].index('horizontal')
+        coordinates = self.grid.get_coordinates(line_table[1], start_pos, len('horizontal'))
+        self.assertEqual(coordinates[0], (1, 1))
+        self.assertEqual(coordinates[-1], (10, 1))
+
+    def test_set_cells(self):
+
+        grid = GridEngine.from_lines(['abc', 'def'])
+
+        # the lines are made once
+        list_of_strings, _ = grid.get_all_lines()
+        self.assertIs(grid.get_all_lines()[0], list_of_strings)
+
+        # should get an error when the coordinates are outside of the grid
+        with self.assertRaises(AssertionError):
+            grid.set_cells({(3, 0): 'x'})
+
+        # changing the grid changes the letters in the lines through the cells
+        changed_lines = grid.set_cells({(0, 0): 'X', (1, 1): '\t', (2, 1): 'ā'})
+        self.assertIs(grid.get_all_lines()[0], list_of_strings)
+        self.assertEqual(list_of_strings[:2], ['xbc', 'd ā'])
+        self.assertEqual(grid.grid.dtype, np.uint32)
+        self.assertEqual(changed_lines, sorted({line for cell in ((0, 0), (1, 1), (2, 1))
+                                                for line, _ in grid.get_cell_lines(*cell)}))
+
+        # the same lines as made from the changed grid
+        expected = GridEngine(grid.grid).get_all_lines()[0]
+        self.assertEqual(list_of_strings, expected)
+
+    def test_get_cell_lines(self):
+
+        grid = GridEngine.from_lines(['abcd', 'efgh', 'ijkl'])
+        list_of_strings, line_table = grid.get_all_lines()
+        for y in range(3):
+            for x in range(4):
+                cell_lines = grid.get_cell_lines(x, y)
+                self.assertEqual(len(cell_lines), len(DIRECTIONS))
+                for direction, (line_number, position) in zip(DIRECTIONS, cell_lines):
+                    line = line_table[line_number]
+                    self.assertEqual((line['step_x'], line['step_y']), direction)
+                    self.assertEqual(grid.get_coordinates(line, position, 1), ((x, y), ))
+
+    def test_puzzle_set_cells(self):
+
+        for engine in WordSearchPuzzle.ENGINES:
+            ws = WordSearchPuzzle(self.word_search_puzzle, engine=engine)
+            with patch('builtins.print'):
+                self.assertFalse(ws.find_words_in_puzzle({'qqz'}))
+
+                # the solver searches in the changed puzzle
+                ws.set_cells({(0, 0): 'q', (1, 0): 'Q', (2, 0): 'z'})
+                self.assertIsNone(ws.solution_coordinates)
+                self.assertEqual(ws.find_words_in_puzzle({'qqz'}), {((0, 0), (1, 0), (2, 0))})
+                self.assertEqual(ws.puzzle_df[1][0], 'q')
+
+    def test_update_cells(self):
+
+        rng = random.Random(0)
+        for engine in WordSearchPuzzle.ENGINES:
+            for method in ('index', 'aho-corasick'):
+                profile = profiling.Profile(trace_memory=False)
+                with patch('builtins.print'):
+                    ws = WordSearchPuzzle(self.word_search_puzzle, self.word_search_set, get_solution=False,
+                                          engine=engine, profile=profile)
+                    full_solve = WordSearchPuzzle(self.word_search_puzzle, self.word_search_set, get_solution=False,
+                                                  engine='numpy')
+                    # should get an error when the puzzle is not solved first
+                    with self.assertRaises(AssertionError):
+                        ws.update_cells({(0, 0): 'a'})
+                    ws.find_words_in_puzzle(method=method)
+                    words = len(ws.word_set) if method == 'index' else 1
+
+                    for _ in range(10):
+                        cells = {(rng.randrange(14), rng.randrange(14)): rng.choice('aeiost ')
+                                 for _ in range(rng.randint(1, 3))}
+                        profile.reset()
+                        solution = ws.update_cells(cells)
+
+                        # only the lines through the changed cells are searched
+                        self.assertLessEqual(profile.counters['lines_scanned'], 8 * len(cells) * words)
+
+                        # the same as solving the changed puzzle
+                        full_solve.set_cells(cells)
+                        self.assertEqual(solution, full_solve.find_words_in_puzzle(method=method))
+                        self.assertEqual(ws.words_not_found, full_solve.words_not_found)
+                        self.assertEqual(ws.get_left_over_letters(), full_solve.get_left_over_letters())
+
+    def test_forward_lines(self):
+
+        grid = GridEngine.from_lines(['abcd', 'efgh', 'ijkl'])
+        list_of_strings, line_table = grid.get_all_lines()
+        forward_strings, forward_table = grid.get_all_lines(FORWARD_DIRECTIONS)
+
+        # half of the lines, the other half are the same lines read backwards
+        self.assertEqual(len(forward_strings) * 2, len(list_of_strings))
+        self.assertEqual(sorted(forward_strings + [string[::-1] for string in forward_strings]),
+                         sorted(list_of_strings))
+
+        # set_cells changes the lines of every direction
+        grid.set_cells({(1, 1): 'x'})
+        self.assertEqual(forward_strings, GridEngine(grid.grid).get_all_lines(FORWARD_DIRECTIONS)[0])
+        self.assertEqual(list_of_strings, GridEngine(grid.grid).get_all_lines()[0])
+        for line_number, position in grid.get_cell_lines(1, 1, FORWARD_DIRECTIONS):
+            self.assertEqual(grid.get_coordinates(forward_table[line_number], position, 1), ((1, 1), ))
+
+    def test_four_directions(self):
+
+        with patch('builtins.print'):
+            ws = WordSearchPuzzle(self.word_search_puzzle, self.word_search_set, get_solution=False, engine='numpy')
+            for method in ('index', 'aho-corasick', 'suffix-array'):
+                expected = ws.find_words_in_puzzle(method=method)
+                words_not_found = ws.words_not_found
+                result = ws.find_words_in_puzzle(method=method, directions=4)
+
+                # the same words, only the palindromes are found once
+                self.assertEqual(ws.words_not_found, words_not_found)
+                palindromes = {coordinates[::-1] for coordinates in result
+                               if ws.get_word(coordinates) == ws.get_word(coordinates)[::-1]}
+                self.assertEqual(result | palindromes, expected)
+
+            # should get an error when the amount of directions is not 8 or 4
+            with self.assertRaises(AssertionError):
+                ws.find_words_in_puzzle(directions=2)
+            with self.assertRaises(AssertionError):
+                ws.find_words_in_puzzle(directions=4, partition='words')
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            puzzle_file = os.path.join(temp_dir, 'palindrome_puzzle.txt')
+            with open(puzzle_file, 'w') as open_file:
+                open_file.write('racecar\nqxyyxqq\n')
+
+            with patch('builtins.print'):
+                ws = WordSearchPuzzle(puzzle_file, get_solution=False)
+                words = {'racecar', 'xyyx', 'xy', 'yx'}
+                self.assertEqual(len(ws.find_words_in_puzzle(words)), 8)
+
+                # a palindrome is found once, read forwards, the reverse of a word is found by its reverse
+                result = ws.find_words_in_puzzle(words, directions=4)
+                self.assertEqual(result, {tuple((x, 0) for x in range(7)), ((1, 1), (2, 1), (3, 1), (4, 1)),
+                                          ((1, 1), (2, 1)), ((4, 1), (3, 1)), ((2, 1), (1, 1)), ((3, 1), (4, 1))})
+
+                # the cells of the lines are changed in the lines of the forward directions
+                self.assertEqual(ws.update_cells({(6, 1): 'a'}), ws.find_words_in_puzzle(words, directions=4))
+
+    def test_rectangular_grid(self):
+
+        grid = GridEngine.from_lines(['abcd', 'efgh'])
+        list_of_strings, line_table = grid.get_all_lines()
+
+        # 2 rows, 4 columns and 5 diagonals, in both directions
+        self.assertEqual(len(list_of_strings), 2 * (2 + 4 + 5 + 5))
+        for string, line in zip(list_of_strings, line_table):
+            coordinates = grid.get_coordinates(line, 0, len(string))
+            self.assertEqual(grid.get_letters(coordinates), string)
+
+    def test_rectangular_puzzle(self):
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            puzzle_file = os.path.join(temp_dir, 'strip_puzzle.txt')
+            with open(puzzle_file, 'w') as open_file:
+                open_file.write('abcdefg\nhijklmn\nopqrstu\n')
+
+            with patch('builtins.print'):
+                pandas_ws = WordSearchPuzzle(puzzle_file, get_solution=False)
+                numpy_ws = WordSearchPuzzle(puzzle_file, get_solution=False, engine='numpy')
+
+        # the puzzle is not padded to a square
+        self.assertEqual(pandas_ws.puzzle_df.shape, (3, 7))
+        self.assertEqual(numpy_ws.puzzle_df.shape, (3, 7))
+        self.assertEqual(pandas_ws.position_df.shape, (3, 7))
+        self.assertEqual(pandas_ws.position_df[6][2], (6, 2))
+
+        # the lines of all the angles have the letters of the puzzle on the positions of the letters
+        combined_data = pandas_ws.get_all_possibilities(pandas_ws.puzzle_df)
+        combined_positions = pandas_ws.get_all_possibilities(pandas_ws.position_df)
+        self.assertEqual(combined_data.shape, combined_positions.shape)
+        for (_, letters), (_, positions) in zip(combined_data.iterrows(), combined_positions.iterrows()):
+            for letter, position in zip(letters, positions):
+                if letter != ' ':
+                    self.assertEqual(pandas_ws.find_word_with_coordinates(pandas_ws.puzzle_df, (position, )), letter)
+
+        words = {'abc', 'gnu', 'aho', 'ume', 'tmf', 'not_found'}
+        with patch('builtins.print'):
+            expected = pandas_ws.find_words_in_puzzle(words)
+            self.assertEqual(numpy_ws.find_words_in_puzzle(words), expected)
+        self.assertEqual(len(expected), 5)
+        self.assertEqual(numpy_ws.get_left_over_letters(), pandas_ws.get_left_over_letters())
+        self.assertEqual(pandas_ws.get_left_over_letters(), 'dijklpqrs')
+
+    def test_left_over_letters(self):
+
+        grid = GridEngine.from_lines(['abc', 'd f', 'ghi'])
+        mask = grid.get_coverage_mask({((0, 0), (1, 1), (2, 2)), ((2, 0), (2, 1))})
+        self.assertEqual(mask.tolist(), [[True, False, True], [False, True, True], [False, False, True]])
+
+        # the letters that are not covered, row by row, without the empty cells
+        self.assertEqual(grid.get_left_over_letters(mask), 'bdgh')
+        self.assertEqual(grid.get_left_over_letters(grid.get_coverage_mask(set())), 'abcdfghi')
+
+        with self.assertRaises(AssertionError):
+            grid.get_left_over_letters(np.zeros((2, 2), dtype=bool))
+
+    def test_to_dataframe(self):
+
+        result = self.grid.to_dataframe()
+        self.assertTrue(isinstance(result, pd.DataFrame))
+
+        puzzle_df = WordSearchPuzzle(self.word_search_puzzle).puzzle_df
+        self.assertTrue(result.equals(puzzle_df))
+
+    def test_numpy_engine(self):
+
+        # should get an error when an unknown engine is given
+        with self.assertRaises(AssertionError):
+            WordSearchPuzzle(self.word_search_puzzle, engine='unknown')
+
+        with patch('builtins.print'):
+            pandas_ws = WordSearchPuzzle(self.word_search_puzzle, self.word_search_set)
+            numpy_ws = WordSearchPuzzle(self.word_search_puzzle, self.word_search_set, engine='numpy')
+
+        # the DataFrames are not made when the numpy engine is used
+        self.assertIsNone(numpy_ws._puzzle_df)
+
+        # the grid is made from the DataFrame of the pandas engine
+        self.assertTrue(np.array_equal(GridEngine.from_dataframe(pandas_ws.puzzle_df).grid, numpy_ws.grid.grid))
+
+        # both engines give the same results
+        self.assertEqual(numpy_ws.solution_coordinates, pandas_ws.solution_coordinates)
+        self.assertEqual(numpy_ws.get_left_over_letters(), pandas_ws.get_left_over_letters())
+
+
+if __name__ == '__main__':
+    unittest.main()
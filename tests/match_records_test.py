@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+
+import random
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+
+from word_search_puzzle.grid_engine import GridEngine
+from word_search_puzzle.match_records import MatchRecords
+from word_search_puzzle.word_search_solver import WordSearchPuzzle
+
+
+class MatchRecordsTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.word_search_puzzle = r"puzzles/test_word_search_puzzle.txt"
+        cls.word_search_set = r"puzzles/test_word_search_set.txt"
+
+    def test_from_lines(self):
+
+        # every part of every line, read forwards and backwards
+        grid = GridEngine.from_lines(['abc', 'def', 'ghi'])
+        list_of_strings, line_table = grid.get_all_lines()
+        hits, expected = [], set()
+        for line_number, string in enumerate(list_of_strings):
+            for start_pos in range(len(string)):
+                for length in range(1, len(string) - start_pos + 1):
+                    coordinates = grid.get_coordinates(line_table[line_number], start_pos, length)
+                    hits += [(0, line_number, start_pos, length, 0), (0, line_number, start_pos, length, 1)]
+                    expected.update((coordinates, coordinates[::-1]))
+
+        records = MatchRecords.from_lines(['word'], line_table, hits)
+        self.assertEqual(len(records), len(expected))
+        self.assertEqual(records, expected)
+        self.assertEqual(set(records), expected)
+        self.assertTrue(all(coordinates in records for coordinates in expected))
+        self.assertNotIn(((0, 0), (2, 2)), records)
+        self.assertNotIn(((0, 0), (0, 0)), records)
+        self.assertTrue((records.get_coverage_mask((3, 3)) == grid.get_coverage_mask(expected)).all())
+        self.assertEqual(MatchRecords.from_coordinates(['word'], [('word', c) for c in expected]), expected)
+        self.assertEqual(MatchRecords([]), set())
+
+        # a change keeps the coordinate tuples
+        coordinates = records.pop()
+        self.assertTrue(records.expanded)
+        self.assertNotIn(coordinates, records)
+        self.assertEqual(len(records), len(expected) - 1)
+        with self.assertRaises(AssertionError):
+            records.get_found_words()
+
+    def test_get_line_mask(self):
+
+        rng = random.Random(0)
+        grid = GridEngine.from_lines([''.join(rng.choice('ab') for _ in range(6)) for _ in range(5)])
+        list_of_strings, line_table = grid.get_all_lines()
+        hits = [(0, line_number, start_pos, length, 0) for line_number, string in enumerate(list_of_strings)
+                for start_pos in range(len(string)) for length in range(1, 3) if start_pos + length <= len(string)]
+        records = MatchRecords.from_lines(['word'], line_table, hits)
+
+        # a record is on a line through the cell when that cell is on the straight line of its letters
+        for cell in ((0, 0), (3, 2), (5, 4)):
+            mask = records.get_line_mask([cell])
+            for on_line, coordinates in zip(mask, records):
+                (x, y), (step_x, step_y) = coordinates[0], (1, 0)
+                if len(coordinates) > 1:
+                    step_x, step_y = coordinates[1][0] - x, coordinates[1][1] - y
+                on_the_line = any(cell in ((x + i * step_x, y + i * step_y), (x - i * step_x, y - i * step_y))
+                                  for i in range(6))
+                self.assertEqual(bool(on_line), on_the_line)
+
+    def test_solution(self):
+
+        with patch('builtins.print'):
+            pandas_ws = WordSearchPuzzle(self.word_search_puzzle, self.word_search_set)
+            numpy_ws = WordSearchPuzzle(self.word_search_puzzle, self.word_search_set, engine='numpy')
+            bent_ws = WordSearchPuzzle(self.word_search_puzzle, self.word_search_set, engine='numpy',
+                                       get_solution=False)
+            bent_ws.find_words_in_puzzle(method='bent-path')
+
+        # the words on straight lines are records, the paths of bent-path stay a set of tuples
+        self.assertIsInstance(numpy_ws.solution_coordinates, MatchRecords)
+        self.assertIsInstance(bent_ws.solution_coordinates, set)
+        self.assertEqual(numpy_ws.solution_coordinates, pandas_ws.solution_coordinates)
+        self.assertTrue(numpy_ws.solution_coordinates.get_found_words().isdisjoint(numpy_ws.words_not_found))
+
+        # the left over letters come from the records, without making the tuples
+        with patch.object(MatchRecords, '_iter_records', side_effect=AssertionError):
+            self.assertEqual(numpy_ws.get_left_over_letters(), pandas_ws.get_left_over_letters())
+
+        # a record has the id of the word, the start cell, the direction and the length
+        records = numpy_ws.solution_coordinates.records
+        self.assertEqual(records.dtype.names, ('word', 'row', 'column', 'direction', 'length'))
+        self.assertEqual(int(np.sum(records['length'])),
+                         sum(len(coordinates) for coordinates in pandas_ws.solution_coordinates))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+
+from word_search_puzzle import parallel
+from word_search_puzzle.grid_engine import GridEngine
+from word_search_puzzle.word_search_solver import WordSearchPuzzle
+
+
+class ParallelTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.word_search_puzzle = r"puzzles/test_word_search_puzzle.txt"
+        cls.word_search_set = r"puzzles/test_word_search_set.txt"
+
+        # a puzzle of few letters has many occurrences of the words, also across the tiles
+        letters = np.random.RandomState(0).choice(np.array([ord(letter) for letter in 'abc']), size=(23, 31))
+        cls.grid = GridEngine(letters)
+        cls.words = ['ab', 'abc', 'cab', 'aba', 'bcab', 'ccc']
+
+    def get_hits(self, grid: GridEngine, words: list) -> set:
+        """ the hits of the search over the whole grid """
+        list_of_strings, line_table = grid.get_all_lines()
+        hits = WordSearchPuzzle._search_lines_with_index(words, list_of_strings)
+        return set((word, grid.get_coordinates(line_table[line_number], start_pos, len(word)))
+                   for word, line_number, start_pos in hits)
+
+    def test_get_tiles(self):
+
+        self.assertEqual(parallel.get_tiles((3, 5), tile_size=2),
+                         [(0, 2, 0, 2), (0, 2, 2, 4), (0, 2, 4, 5), (2, 3, 0, 2), (2, 3, 2, 4), (2, 3, 4, 5)])
+        with self.assertRaises(AssertionError):
+            parallel.get_tiles((3, 5), tile_size=0)
+
+    def test_search_tiled(self):
+
+        expected = self.get_hits(self.grid, self.words)
+        for method in ('index', 'aho-corasick'):
+            for tile_size in (1, 4, 7, 100):
+                result = list(parallel.search_tiled(self.grid, self.words, method, tile_size=tile_size, max_workers=2))
+                # every occurrence is found by one tile only
+                self.assertEqual(len(result), len(expected))
+                self.assertEqual(set(result), expected)
+        with self.assertRaises(AssertionError):
+            list(parallel.search_tiled(self.grid, self.words, 'bent-path'))
+
+    def test_search_words(self):
+
+        expected = self.get_hits(self.grid, self.words)
+        for method in ('index', 'aho-corasick'):
+            for chunks in (1, 4, 100):
+                result = list(parallel.search_words(self.grid, self.words, method, max_workers=2, chunks=chunks))
+                self.assertEqual(len(result), len(expected))
+                self.assertEqual(set(result), expected)
+
+        # letters that don't fit in a byte are shared as well
+        grid = GridEngine.from_lines(['őbc', 'łcő', 'cőł'])
+        words = ['őb', 'łc', 'cő', 'ół']
+        self.assertEqual(set(parallel.search_words(grid, words, max_workers=2)), self.get_hits(grid, words))
+
+    def test_find_words_in_puzzle(self):
+
+        with patch('builtins.print'):
+            ws = WordSearchPuzzle(self.word_search_puzzle, self.word_search_set, get_solution=False, engine='numpy')
+            expected = ws.find_words_in_puzzle()
+            for partition in WordSearchPuzzle.PARTITIONS:
+                self.assertEqual(ws.find_words_in_puzzle(partition=partition, max_workers=2), expected)
+                self.assertEqual(ws.words_not_found, ['not_found'])
+
+            with self.assertRaises(AssertionError):
+                ws.find_words_in_puzzle(partition='not_a_partition')
+            for method in ('suffix-array', 'bent-path'):  # the other methods don't search the lines in parts
+                with self.assertRaises(AssertionError):
+                    ws.find_words_in_puzzle(partition='words', method=method)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+
+import os
+import json
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from word_search_puzzle.profiling import Profile, COUNTERS
+from word_search_puzzle.word_search_solver import WordSearchPuzzle
+
+
+class ProfileTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.word_search_puzzle = r"puzzles/test_word_search_puzzle.txt"
+        cls.word_search_set = r"puzzles/test_word_search_set.txt"
+
+    def test_phase(self):
+
+        calls = []
+        profile = Profile(hook=lambda name, record: calls.append((name, record['calls'])))
+        for _ in range(2):
+            with profile.phase('allocate'):
+                data = bytearray(1024 * 1024)
+        self.assertEqual(profile.phases['allocate']['calls'], 2)
+        self.assertGreaterEqual(profile.phases['allocate']['peak_bytes'], len(data))
+        self.assertEqual(calls, [('allocate', 1), ('allocate', 2)])
+
+        # a disabled profile measures nothing
+        profile = Profile(enabled=False)
+        with profile.phase('allocate'):
+            profile.count('candidate_hits')
+        self.assertEqual(profile.to_dict(), {'phases': {}, 'counters': dict.fromkeys(COUNTERS, 0)})
+
+    def test_find_words_in_puzzle(self):
+
+        for engine in WordSearchPuzzle.ENGINES:
+            profile = Profile()
+            with patch('builtins.print'):
+                ws = WordSearchPuzzle(self.word_search_puzzle, self.word_search_set, engine=engine, profile=profile)
+                ws.get_left_over_letters()
+
+            self.assertEqual(list(profile.phases), ['parse', 'word_set', 'grid', 'lines', 'search', 'left_over'])
+            self.assertEqual(profile.counters['verified_hits'], len(ws.solution_coordinates))
+            self.assertGreaterEqual(profile.counters['candidate_hits'], profile.counters['verified_hits'])
+            self.assertEqual(profile.counters['words_not_found'], 1)
+            # every line is scanned once per word
+            self.assertEqual(profile.counters['lines_scanned'],
+                             len(ws._get_grid().get_all_lines()[0]) * len([word for word in ws.word_set if word]))
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            output = os.path.join(temp_dir, 'profile.json')
+            profile.write(output)
+            with open(output) as open_file:
+                self.assertEqual(json.load(open_file), profile.to_dict())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+
+import os
+import random
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from word_search_puzzle import batch
+from word_search_puzzle.grid_engine import DIRECTIONS
+from word_search_puzzle.puzzle_generator import PuzzleGenerator, AXES, generate_batch
+from word_search_puzzle.word_search_solver import WordSearchPuzzle
+
+
+class PuzzleGeneratorTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.words = ['python', 'search', 'puzzle', 'grid', 'letter', 'word', 'hidden', 'message', 'random',
+                     'bitmask', 'overlap', 'solver']
+
+    def test_get_places(self):
+
+        generator = PuzzleGenerator(4, 5)
+        for axis in AXES:
+            mask, bits, shifts = generator.get_places(axis, 3)
+            self.assertEqual(mask, sum(1 << bit for bit in bits))
+
+            # every shift moves the bits onto the cells of a place in the grid
+            for shift in shifts:
+                coordinates = generator._get_coordinates(axis, 3, shift)
+                self.assertEqual([y * 5 + x for x, y in coordinates], [bit + shift for bit in bits])
+                self.assertTrue(all(0 <= x < 5 and 0 <= y < 4 for x, y in coordinates))
+        self.assertEqual(len(generator.get_places((1, 0), 3)[2]), 4 * 3)
+        self.assertEqual(generator.get_places((0, 1), 5)[2], [])
+
+    def test_generate(self):
+
+        generator = PuzzleGenerator(12, 12)
+        directions = set()
+        for seed in range(20):
+            grid, placements = generator.generate(self.words, message='Hello World', rng=random.Random(seed))
+            self.assertEqual(set(placements), set(self.words))
+            for word, coordinates in placements.items():
+                self.assertEqual(grid.get_letters(coordinates), word)
+                directions.add((coordinates[1][0] - coordinates[0][0], coordinates[1][1] - coordinates[0][1]))
+
+            # a word crosses the words placed before it, the longer words, on up to 2 cells
+            cells = set()
+            for word in sorted(placements, key=lambda word: (-len(word), word)):
+                self.assertLessEqual(len(cells.intersection(placements[word])), 2)
+                cells.update(placements[word])
+
+            # the left over letters are the message
+            with patch('builtins.print'):
+                ws = WordSearchPuzzle(grid, get_solution=False, engine='numpy')
+                ws.find_words_in_puzzle(set(self.words))
+            self.assertEqual(ws.words_not_found, [])
+            self.assertEqual(ws.get_left_over_letters(), 'helloworld')
+
+        # the words are placed in all 8 directions
+        self.assertEqual(directions, set(DIRECTIONS))
+
+        # the same seed gives the same puzzle
+        first = generator.generate(self.words, rng=random.Random(1))
+        second = generator.generate(self.words, rng=random.Random(1))
+        self.assertEqual(first[1], second[1])
+        self.assertTrue((first[0].grid == second[0].grid).all())
+
+        # the words do not cross without overlap
+        grid, placements = PuzzleGenerator(12, 12, max_overlap=0).generate(self.words, rng=random.Random(0))
+        cells = [cell for coordinates in placements.values() for cell in coordinates]
+        self.assertEqual(len(cells), len(set(cells)))
+
+        # should get an error when the words do not fit
+        with self.assertRaises(AssertionError):
+            generator.generate(['a' * 13])
+        with self.assertRaises(AssertionError):
+            PuzzleGenerator(3, 3, attempts=2).generate(['abc', 'def', 'ghi', 'jkl'])
+
+    def test_generate_batch(self):
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            first = os.path.join(temp_dir, 'first')
+            second = os.path.join(temp_dir, 'second')
+            os.mkdir(first)
+            os.mkdir(second)
+
+            options = {'seed': 3, 'word_count': 8, 'message': 'secret', 'height': 10, 'width': 10}
+            pairs = list(generate_batch(self.words, 4, first, max_workers=2, **options))
+            self.assertEqual(pairs, batch.find_puzzle_pairs(first))
+            list(generate_batch(self.words, 4, second, max_workers=1, **options))
+
+            for puzzle_file, set_file in pairs:
+                # the same seed gives the same files, with any amount of workers
+                for file_path in (puzzle_file, set_file):
+                    with open(file_path) as open_file, \
+                            open(os.path.join(second, os.path.basename(file_path))) as other_file:
+                        self.assertEqual(open_file.read(), other_file.read())
+
+                with patch('builtins.print'):
+                    ws = WordSearchPuzzle(puzzle_file, set_file)
+                self.assertEqual(len(ws.word_set), 8)
+                self.assertEqual(ws.words_not_found, [])
+                self.assertEqual(ws.get_left_over_letters(), 'secret')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+
+import os
+import json
+import asyncio
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from word_search_puzzle import server
+from word_search_puzzle.word_search_solver import WordSearchPuzzle
+
+
+class SolverServerTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.word_search_puzzle = r"puzzles/test_word_search_puzzle.txt"
+        cls.word_search_set = r"puzzles/test_word_search_set.txt"
+
+        with patch('builtins.print'):
+            cls.ws = WordSearchPuzzle(cls.word_search_puzzle, cls.word_search_set, engine='numpy')
+
+    def setUp(self):
+        self.server = server.SolverServer(max_concurrency=2)
+        self.name = self.server.register_puzzle(self.word_search_puzzle)
+
+    def test_parse_address(self):
+
+        self.assertEqual(server.parse_address('localhost:8000'), ('tcp', 'localhost', 8000))
+        self.assertEqual(server.parse_address(':8000'), ('tcp', '127.0.0.1', 8000))
+        self.assertEqual(server.parse_address('/tmp/solver.sock'), ('unix', os.path.realpath('/tmp/solver.sock')))
+
+    def test_solve(self):
+
+        words = sorted(word for word in self.ws.word_set if word)
+
+        async def solve() -> list:
+            self.server._semaphore = asyncio.Semaphore(self.server.max_concurrency)
+            # queries sent at the same time are searched in one scan
+            queries = [self.server.solve(self.name, words[number::3]) for number in range(3)]
+            return await asyncio.gather(*queries)
+
+        results = asyncio.run(solve())
+        self.assertEqual(self.server.puzzles[self.name].scans, 1)
+
+        found = {}
+        for result in results:
+            found.update(result)
+        self.assertEqual(set().union(*found.values()), self.ws.solution_coordinates)
+        self.assertEqual(sorted(set(words) - set(found)), self.ws.words_not_found)
+
+    def test_discover(self):
+
+        name = self.server.register_dictionary(self.word_search_set)
+
+        async def discover() -> dict:
+            self.server._semaphore = asyncio.Semaphore(self.server.max_concurrency)
+            return await self.server.discover(self.name, name, min_length=4)
+
+        found = asyncio.run(discover())
+        self.assertTrue(found)
+        self.assertTrue(all(len(word) >= 4 and word in self.ws.word_set for word in found))
+
+    def test_handle_client(self):
+
+        messages = [
+            {'op': 'lookup', 'puzzle': self.name, 'word': 'FOTO'},
+            {'op': 'solve', 'puzzle': self.name, 'words': ['foto', 'not_found']},
+            {'op': 'solve', 'puzzle': 'not_registered', 'words': ['foto']},
+            {'op': 'not_an_op'},
+            {'op': 'register', 'puzzle': self.word_search_puzzle},  # only registered at the start
+            {'op': 'unregister', 'puzzle': self.name},
+            {'op': 'list'},
+        ]
+
+        async def communicate(address: str) -> list:
+            listener = await self.server.start(address)
+            async with listener:
+                reader, writer = await asyncio.open_unix_connection(address)
+                for message in messages:
+                    writer.write(json.dumps(message).encode('utf-8') + b'\n')
+                writer.write_eof()
+                replies = [json.loads(line) async for line in reader]
+                writer.close()
+            return replies
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            replies = asyncio.run(communicate(os.path.join(temp_dir, 'solver.sock')))
+
+        # the replies come when they are done, not in the order of the queries
+        self.assertEqual(len(replies), len(messages))
+        self.assertEqual(len([reply for reply in replies if not reply['ok']]), 4)
+        self.assertIn({'ok': True, 'puzzles': [self.name], 'dictionaries': []}, replies)
+        solved = [reply for reply in replies if reply['ok'] and 'found' in reply]
+        self.assertEqual(len(solved), 2)
+        for reply in solved:
+            self.assertEqual(list(reply['found']), ['foto'])
+            coordinates = tuple(map(tuple, reply['found']['foto'][0]))
+            self.assertEqual(self.ws.get_word(coordinates), 'foto')
+        self.assertEqual(sorted(reply['words_not_found'] for reply in solved), [[], ['not_found']])
+
+    def test_start(self):
+
+        async def start(address: str):
+            listener = await self.server.start(address)
+            listener.close()
+            await listener.wait_closed()
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            # a socket left by a server that stopped is replaced
+            address = os.path.join(temp_dir, 'solver.sock')
+            asyncio.run(start(address))
+            asyncio.run(start(address))
+
+            # a mistyped address of a regular file is not removed
+            address = os.path.join(temp_dir, 'puzzle.txt')
+            with open(address, 'w') as open_file:
+                open_file.write('foo')
+            with self.assertRaises(AssertionError):
+                asyncio.run(start(address))
+            with open(address) as open_file:
+                self.assertEqual(open_file.read(), 'foo')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+
+import os
+import time
+import tempfile
+import unittest
+from unittest.mock import patch, call
+
+from word_search_puzzle.grid_engine import GridEngine
+from word_search_puzzle.solution_cache import SolutionCache
+from word_search_puzzle.word_search_solver import WordSearchPuzzle
+
+
+class SolutionCacheTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.word_search_puzzle = r"puzzles/test_word_search_puzzle.txt"
+        cls.word_search_set = r"puzzles/test_word_search_set.txt"
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.cache = SolutionCache(self.temp_dir.name)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_make_key(self):
+
+        grid = GridEngine.from_lines(['ab', 'cd']).grid
+        key = self.cache.make_key(grid, {'ab', 'cd'}, {'min_length': 0})
+
+        # the same puzzle with padding, the words in another order give the same key
+        padded_grid = GridEngine.from_lines(['ab ', 'cd ', '   ']).grid
+        self.assertEqual(key, self.cache.make_key(padded_grid, ['cd', 'ab', 'ab'], {'min_length': 0}))
+
+        # another letter, word or option gives another key
+        self.assertNotEqual(key, self.cache.make_key(GridEngine.from_lines(['ab', 'ce']).grid, {'ab', 'cd'}))
+        self.assertNotEqual(key, self.cache.make_key(grid, {'ab'}, {'min_length': 0}))
+        self.assertNotEqual(key, self.cache.make_key(grid, {'ab', 'cd'}, {'min_length': 1}))
+
+    def test_get_put(self):
+
+        self.assertIsNone(self.cache.get('key'))
+        self.cache.put('key', {'solution_coordinates': {((0, 0), (1, 0))}, 'left_over_letters': 'cd'})
+
+        result = self.cache.get('key')
+        self.assertEqual(result['solution_coordinates'], {((0, 0), (1, 0))})
+        self.assertEqual(result['left_over_letters'], 'cd')
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
+
+    def test_evict(self):
+
+        solution = {'solution_coordinates': {((x, 0), ) for x in range(50)}}
+        self.cache.put('first', solution)
+        self.cache.put('second', solution)
+        size = os.path.getsize(os.path.join(self.cache.cache_dir, 'first.json'))
+
+        # the first solution is used last
+        past = time.time() - 60
+        os.utime(os.path.join(self.cache.cache_dir, 'second.json'), (past, past))
+        self.assertIsNotNone(self.cache.get('first'))
+
+        # the least recently used solution is removed when the cache is too large
+        self.cache.max_size = 2 * size
+        self.cache.put('third', solution)
+        self.assertEqual(sorted(os.listdir(self.cache.cache_dir)), ['first.json', 'third.json'])
+
+    def test_find_words_in_puzzle(self):
+
+        with patch('builtins.print') as mocked_print:
+            ws = WordSearchPuzzle(self.word_search_puzzle, self.word_search_set, engine='numpy', cache=self.cache)
+            expected = ws.solution_coordinates
+            expected_letters = ws.get_left_over_letters()
+            self.assertEqual((self.cache.hits, self.cache.misses), (0, 1))
+
+            # a cache hit gives the same solution without making the DataFrames
+            ws = WordSearchPuzzle(self.word_search_puzzle, self.word_search_set, engine='numpy', cache=self.cache)
+            self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
+            self.assertEqual(ws.solution_coordinates, expected)
+            self.assertEqual(ws.get_left_over_letters(), expected_letters)
+            self.assertEqual(ws.words_not_found, ['not_found'])
+            self.assertIsNone(ws._puzzle_df)
+
+            self.assertEqual(mocked_print.mock_calls.count(call('not_found is not found')), 2)
+
+    def test_bent_path(self):
+
+        # a bent path and a straight line solve of the same grid and words are stored apart
+        grid = GridEngine.from_lines(['ab', 'dc'])
+        with patch('builtins.print'):
+            ws = WordSearchPuzzle(grid, engine='numpy', cache=self.cache)
+            self.assertEqual(ws.find_words_in_puzzle({'abc'}), set())
+            self.assertEqual(ws.find_words_in_puzzle({'abc'}, method='bent-path'), {((0, 0), (1, 0), (1, 1))})
+            self.assertEqual((self.cache.hits, self.cache.misses), (0, 2))
+
+            ws = WordSearchPuzzle(grid, engine='numpy', cache=self.cache)
+            self.assertEqual(ws.find_words_in_puzzle({'abc'}, method='bent-path'), {((0, 0), (1, 0), (1, 1))})
+            self.assertEqual(ws.find_words_in_puzzle({'abc'}), set())
+            self.assertEqual((self.cache.hits, self.cache.misses), (2, 2))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+
+import random
+import unittest
+from unittest.mock import patch
+
+from word_search_puzzle.suffix_array import SuffixArray
+from word_search_puzzle.word_search_solver import WordSearchPuzzle
+
+
+class SuffixArrayTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.word_search_puzzle = r"puzzles/test_word_search_puzzle.txt"
+        cls.word_search_set = r"puzzles/test_word_search_set.txt"
+
+    def test_locate(self):
+
+        index = SuffixArray(['abab', 'ba'])
+        self.assertEqual(index.count('ab'), 2)
+        self.assertEqual(index.locate('ba'), [(0, 1), (1, 0)])
+
+        # a word does not cross the end of a line
+        self.assertEqual(index.count('bb'), 0)
+        self.assertEqual(index.locate('b\nb'), [])
+        self.assertEqual(index.locate(''), [])
+        self.assertEqual(len(SuffixArray([])), 0)
+
+    def test_brute_force(self):
+
+        rng = random.Random(0)
+        for letters in ('ab', 'abcdefghijklmnopqrstuvwxyzőł0123456789'):
+            for _ in range(100):
+                lines = [''.join(rng.choice(letters) for _ in range(rng.randint(0, 30)))
+                         for _ in range(rng.randint(0, 5))]
+                index = SuffixArray(lines)
+
+                # the suffixes are sorted
+                text = index.text
+                self.assertEqual([text[start:] for start in index.suffix_array],
+                                 sorted(text[start:] for start in range(len(text))))
+
+                for word in ('a', 'b', 'ab', 'ba', 'aab', 'bbb', 'abab'):
+                    expected = [(line_number, start_pos) for line_number, line in enumerate(lines)
+                                for start_pos in range(len(line)) if line.startswith(word, start_pos)]
+                    self.assertEqual(index.locate(word), expected)
+                    self.assertEqual(index.count(word), len(expected))
+
+    def test_find_words_in_puzzle(self):
+
+        with patch('builtins.print'):
+            ws = WordSearchPuzzle(self.word_search_puzzle, self.word_search_set, get_solution=False, engine='numpy')
+            expected = ws.find_words_in_puzzle(method='index')
+            self.assertEqual(ws.find_words_in_puzzle(method='suffix-array'), expected)
+
+            # the index is made once and kept until the puzzle changes
+            index = ws.get_suffix_array()
+            self.assertIs(ws.get_suffix_array(), index)
+            self.assertEqual(ws.count_word('Horizontal'), 1)
+            self.assertEqual([ws.get_word(coordinates) for coordinates in ws.locate_word('horizontal')],
+                             ['horizontal'])
+
+            ws.update_cells({(0, 0): 'q'})
+            self.assertIsNot(ws.get_suffix_array(), index)
+            self.assertEqual(ws.solution_coordinates, ws.find_words_in_puzzle(method='suffix-array'))
+
+            with self.assertRaises(AssertionError):
+                ws.find_words_in_puzzle(method='suffix-array', partition='words')
+
+
+if __name__ == '__main__':
+    unittest.main()
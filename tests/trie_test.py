@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+
+import unittest
+from unittest.mock import patch
+
+from word_search_puzzle.trie import Trie
+from word_search_puzzle.word_search_solver import WordSearchPuzzle
+
+
+class TrieTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.word_search_puzzle = r"puzzles/test_word_search_puzzle.txt"
+        cls.word_search_set = r"puzzles/test_word_search_set.txt"
+
+    def test_trie(self):
+
+        trie = Trie(['bel', 'bier', 'bel', ''])
+
+        # duplicates and empty words are not added
+        self.assertEqual(len(trie), 2)
+
+        self.assertIn('bel', trie)
+        self.assertNotIn('be', trie)
+        self.assertNotIn('belt', trie)
+
+        self.assertTrue(trie.has_prefix('b'))
+        self.assertTrue(trie.has_prefix('bie'))
+        self.assertFalse(trie.has_prefix('bo'))
+
+    def test_search_lines(self):
+
+        trie = Trie(['he', 'hers', 'she'])
+        result = list(trie.search_lines(['ushers', 'xhe']))
+        self.assertEqual(result, [('she', 0, 1), ('he', 0, 2), ('hers', 0, 2), ('he', 1, 1)])
+
+        # words shorter than min_length are skipped
+        result = list(trie.search_lines(['ushers', 'xhe'], min_length=3))
+        self.assertEqual(result, [('she', 0, 1), ('hers', 0, 2)])
+
+    def test_discover_words(self):
+
+        ws = WordSearchPuzzle(self.word_search_puzzle, self.word_search_set, get_solution=False)
+
+        # should get an error when an invalid dictionary is given
+        with self.assertRaises(AssertionError):
+            ws.discover_words('dictionary')
+
+        # discovering the words of the set finds the same as searching them
+        with patch('builtins.print'):
+            expected = ws.find_words_in_puzzle()
+        result = ws.discover_words()
+        self.assertEqual(result, expected)
+        self.assertEqual(result, ws.solution_coordinates)
+
+        # a trie can be given, words shorter than min_length are not found
+        result = ws.discover_words(Trie(ws.word_set), min_length=6)
+        self.assertTrue(result)
+        self.assertTrue(all(len(coordinates) >= 6 for coordinates in result))
+
+
+if __name__ == '__main__':
+    unittest.main()
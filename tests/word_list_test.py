@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+
+import os
+import bz2
+import gzip
+import lzma
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from word_search_puzzle import word_list
+from word_search_puzzle.word_search_solver import WordSearchPuzzle
+
+
+class WordListTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.word_search_puzzle = r"puzzles/test_word_search_puzzle.txt"
+        cls.word_search_set = r"puzzles/test_word_search_set.txt"
+        cls.text = 'Foo bar,baz;\n qux , ;;quux\tFOO\n\ncorge ,grault;garply'
+        cls.words = ['foo', 'bar', 'baz', 'qux', 'quux', 'foo', 'corge', 'grault', 'garply']
+
+    def test_iter_words(self):
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            word_file = os.path.join(temp_dir, 'words.txt')
+            with open(word_file, 'w') as open_file:
+                open_file.write(self.text)
+
+            # the separators are mixed in any way, a chunk can end in the middle of a word
+            for chunk_size in (1, 2, 3, 7, 1 << 20):
+                self.assertEqual(list(word_list.iter_words(word_file, chunk_size)), self.words)
+
+            self.assertEqual(word_list.read_word_set(word_file, chunk_size=4), set(self.words))
+            self.assertEqual(word_list.read_word_set(word_file, max_length=4), {'foo', 'bar', 'baz', 'qux', 'quux'})
+
+            with self.assertRaises(AssertionError):
+                list(word_list.iter_words(os.path.join(temp_dir, 'not_a_file.txt')))
+            with self.assertRaises(AssertionError):
+                list(word_list.iter_words(word_file, chunk_size=0))
+
+    def test_compressed(self):
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            for name, module in (('words.gz', gzip), ('words.bz2', bz2), ('words.xz', lzma), ('words', gzip)):
+                word_file = os.path.join(temp_dir, name)
+                with module.open(word_file, 'wt') as open_file:
+                    open_file.write(self.text)
+                self.assertEqual(list(word_list.iter_words(word_file, chunk_size=5)), self.words)
+
+            # a legacy .lzma file is found by its first bytes too
+            word_file = os.path.join(temp_dir, 'words.lzma')
+            with lzma.open(word_file, 'wt', format=lzma.FORMAT_ALONE) as open_file:
+                open_file.write(self.text)
+            self.assertEqual(word_list.read_word_set(word_file), set(self.words))
+
+    def test_word_search_set(self):
+
+        # the same words as the lines split on every separator
+        with open(self.word_search_set) as open_file:
+            expected = {word.lower() for word in open_file.read().replace(',', ' ').replace(';', ' ').split()}
+        self.assertEqual(word_list.read_word_set(self.word_search_set), expected)
+
+        # a word longer than any line is not searched, but it is not found
+        with patch('builtins.print'):
+            ws = WordSearchPuzzle(self.word_search_puzzle, get_solution=False, engine='numpy')
+            result = ws.find_words_in_puzzle({'python', 'p' * 15})
+        self.assertEqual(ws.words_not_found, ['p' * 15])
+        self.assertEqual(len(result), 1)
+        self.assertNotIn('p' * 15, ws._search_words)
+
+
+if __name__ == '__main__':
+    unittest.main()
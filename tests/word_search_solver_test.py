@@ -1,11 +1,17 @@
 #!/usr/bin/env python3
 
+import os
+import sys
 import unittest
+import subprocess
+import tempfile
 from unittest.mock import patch, call
 
 import pandas as pd
 from pandas.util.testing import assert_frame_equal
 
+from word_search_puzzle import solution_cache
+from word_search_puzzle.match_records import MatchRecords
 from word_search_puzzle.word_search_solver import WordSearchPuzzle
 
 
@@ -370,11 +376,39 @@ class WordSearchPuzzleTest(unittest.TestCase):
         # and if 'not_found' is not found
         with unittest.mock.patch('builtins.print') as mocked_print:
             result = self.ws.find_words_in_puzzle()
-            self.assertTrue(isinstance(result, set))
+            self.assertTrue(isinstance(result, (set, MatchRecords)))
             self.assertGreater(len(result), 0)
             self.assertTrue(isinstance(result.pop(), tuple))
             self.assertIn(call('not_found is not found'), mocked_print.mock_calls)
 
+    def test_find_words_in_puzzle_set_methods(self):
+
+        # every method, and a solution from the cache, has the methods of a set
+        with tempfile.TemporaryDirectory() as temp_dir, patch('builtins.print'):
+            cache = solution_cache.SolutionCache(temp_dir)
+            results = []
+            for method in ('index', 'bent-path', 'aho-corasick'):  # the aho-corasick search is a cache hit
+                ws = WordSearchPuzzle(self.word_search_puzzle, self.word_search_set, get_solution=False,
+                                      engine='numpy', cache=cache)
+                results.append(ws.find_words_in_puzzle(method=method))
+            results.append(WordSearchPuzzle(self.word_search_puzzle, self.word_search_set, get_solution=False,
+                                            engine='numpy').find_words_in_puzzle(method='suffix-array'))
+        self.assertEqual(cache.hits, 1)
+
+        expected = set(results[0])
+        for result in results:
+            self.assertTrue(isinstance(result, (set, MatchRecords)))
+            self.assertEqual(result.union(), set(result))
+            self.assertEqual(result.intersection(expected), expected & set(result))
+            self.assertEqual(result.difference(expected), set(result) - expected)
+            self.assertTrue(result.issuperset(expected) and expected.issubset(result.copy()))
+
+            result = result.copy()
+            result.update({((0, 0), )})
+            result.difference_update(expected)
+            self.assertIn(((0, 0), ), result)
+            self.assertTrue(result.isdisjoint(expected))
+
     def test_get_left_over_coordinates(self):
 
         # set the solution_coordinates to None
@@ -394,5 +428,17 @@ class WordSearchPuzzleTest(unittest.TestCase):
         result = self.ws.get_left_over_letters()
         self.assertTrue(isinstance(result, str))
 
+    def test_numpy_engine_without_pandas(self):
+
+        # the numpy engine solves the puzzle without importing pandas, in a new interpreter
+        script = ('import sys\n'
+                  'from word_search_puzzle.word_search_solver import WordSearchPuzzle\n'
+                  'ws = WordSearchPuzzle(sys.argv[1], sys.argv[2], engine="numpy")\n'
+                  'print(ws.get_left_over_letters(), "pandas" in sys.modules, "tkinter" in sys.modules)\n')
+        root = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+        output = subprocess.check_output([sys.executable, '-c', script, os.path.realpath(self.word_search_puzzle),
+                                          os.path.realpath(self.word_search_set)], cwd=root, universal_newlines=True)
+        self.assertEqual(output.split()[-3:], [self.ws.get_left_over_letters(), 'False', 'False'])
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+
+from collections import deque
+
+
+class AhoCorasick:
+    """ Aho-Corasick automaton to search many words at once
+
+        the words are compiled into one trie with failure links
+        a text is then scanned once, letter by letter,
+        and every occurrence of every word is reported in that single pass
+
+        example:
+
+            automaton = AhoCorasick({'he', 'she', 'hers'})
+            list(automaton.iter_matches('ushers'))
+            -> [(1, 'she'), (2, 'he'), (2, 'hers')]
+    """
+
+    def __init__(self, words):
+        """
+        init
+
+        :param words:  An iterable of words to compile into the automaton
+        """
+        self.goto = [{}]     # state -> {letter: next state}
+        self.fail = [0]      # state -> longest proper suffix state
+        self.output = [()]   # state -> words ending in this state
+        for word in words:
+            self._add_word(str(word))
+        self._create_failure_links()
+
+    def __len__(self) -> int:
+        """ amount of states in the automaton """
+        return len(self.goto)  # -> int
+
+    def _add_word(self, word: str):
+        """ add a word to the trie """
+        if not word:
+            return
+        state = 0
+        for letter in word:
+            next_state = self.goto[state].get(letter)
+            if next_state is None:
+                next_state = len(self.goto)
+                self.goto[state][letter] = next_state
+                self.goto.append({})
+                self.fail.append(0)
+                self.output.append(())
+            state = next_state
+        if word not in self.output[state]:
+            self.output[state] = self.output[state] + (word, )
+
+    def _create_failure_links(self):
+        """ breadth first over the trie to set the failure links and merge the outputs """
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for letter, next_state in self.goto[state].items():
+                queue.append(next_state)
+
+                fail_state = self.fail[state]
+                while fail_state and letter not in self.goto[fail_state]:
+                    fail_state = self.fail[fail_state]
+                self.fail[next_state] = self.goto[fail_state].get(letter, 0)
+                self.output[next_state] = self.output[next_state] + self.output[self.fail[next_state]]
+
+    def iter_matches(self, text: str):
+        """
+        Scan the text once and yield every occurrence of every word
+
+        :param text:  The text to search in
+        :return generator:  (start position, word) for every match
+        """
+        goto, fail, output = self.goto, self.fail, self.output
+        state = 0
+        for position, letter in enumerate(text):
+            while state and letter not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(letter, 0)
+            for word in output[state]:
+                yield position - len(word) + 1, word
+
+    def search_lines(self, list_of_strings: list):
+        """
+        Scan every line once and yield every occurrence of every word
+
+        :param list_of_strings:  A list of lines to search in
+        :return generator:  (word, line number, start position) for every match
+        """
+        for line_number, string in enumerate(list_of_strings):
+            for start_pos, word in self.iter_matches(string):
+                yield word, line_number, start_pos
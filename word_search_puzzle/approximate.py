@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+
+
+class ShiftAnd:
+    """ Bit-parallel search of many words at once, with up to max_mismatches substituted letters
+
+        the words are put after each other in one bit vector, a Python int,
+        a bit per letter of every word
+        for every amount of mismatches j a state vector keeps which prefixes of the words
+        end at the current letter of the text with at most j mismatches
+        every letter of the text updates all the states with a few shifts, ands and ors
+
+        a word matches where the bit of its last letter is set in the state of max_mismatches
+
+        example:
+
+            automaton = ShiftAnd({'cat', 'dog'}, max_mismatches=1)
+            list(automaton.iter_matches('a cot'))
+            -> [(2, 'cat', 1)]
+    """
+
+    def __init__(self, words, max_mismatches: int = 0):
+        """
+        init
+
+        :param words:  An iterable of words to search for
+        :param max_mismatches:  The amount of letters that can differ, words not longer than this are left out
+        """
+        assert int(max_mismatches) >= 0, 'max_mismatches should not be negative, given: %s' % max_mismatches
+        self.max_mismatches = int(max_mismatches)
+        self.words = [str(word) for word in dict.fromkeys(words) if len(str(word)) > self.max_mismatches]
+
+        self.masks = {}  # letter -> the bits of the positions of the letter in the words
+        self.starts, self.ends = 0, 0  # the bits of the first and of the last letters of the words
+        self._words_by_end = {}  # bit of the last letter -> word
+        position = 0
+        for word in self.words:
+            self.starts |= 1 << position
+            for offset, letter in enumerate(word):
+                self.masks[letter] = self.masks.get(letter, 0) | 1 << (position + offset)
+            position += len(word)
+            self.ends |= 1 << (position - 1)
+            self._words_by_end[position - 1] = word
+        self.full = (1 << position) - 1
+
+    def __len__(self) -> int:
+        """ amount of words searched for """
+        return len(self.words)  # -> int
+
+    def iter_matches(self, text: str):
+        """
+        Scan the text once and yield every occurrence of every word with at most max_mismatches mismatches
+
+        :param text:  The text to search in
+        :return generator:  (start position, word, amount of mismatches) for every match
+        """
+        if not self.words:
+            return
+        masks, starts, ends, full = self.masks, self.starts, self.ends, self.full
+        levels = range(1, self.max_mismatches + 1)
+        states = [0] * (self.max_mismatches + 1)
+
+        for position, letter in enumerate(text):
+            mask = masks.get(letter, 0)
+            shifted = (states[0] << 1) | starts
+            states[0] = shifted & mask
+            for level in levels:
+                # the letter matches, or it is one more mismatch on a prefix of the level below
+                shifted, below = (states[level] << 1) | starts, shifted
+                states[level] = (shifted & mask) | (below & full)
+
+            accept = states[-1] & ends
+            while accept:
+                lowest = accept & -accept
+                accept ^= lowest
+                bit = lowest.bit_length() - 1
+                word = self._words_by_end[bit]
+                mismatches = next(level for level, state in enumerate(states) if state >> bit & 1)
+                yield position - len(word) + 1, word, mismatches
+
+    def search_lines(self, list_of_strings: list):
+        """
+        Scan every line once and yield every occurrence of every word
+
+        :param list_of_strings:  A list of lines to search in
+        :return generator:  (word, line number, start position, amount of mismatches) for every match
+        """
+        for line_number, string in enumerate(list_of_strings):
+            for start_pos, word, mismatches in self.iter_matches(string):
+                yield word, line_number, start_pos, mismatches
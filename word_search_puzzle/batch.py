@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+
+import io
+import os
+import sys
+import json
+import contextlib
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    from . import solution_cache, word_search_solver
+except ImportError:  # run as a script from within the word_search_puzzle directory
+    import solution_cache
+    import word_search_solver
+
+PUZZLE_SUFFIX = '_puzzle.txt'
+SET_SUFFIX = '_set.txt'
+
+_worker_options = {}  # options of the solver, set once per worker process by _init_worker
+_worker_cache = None  # the solution_cache.SolutionCache of the worker process when a cache_dir is given
+
+
+def find_puzzle_pairs(batch_path: str) -> list:
+    """
+    Find the puzzle and word set files to solve
+
+    a directory is searched for files named  <name>_puzzle.txt  with a  <name>_set.txt  next to it
+    like the files in the puzzles directory
+
+    a manifest is a text file with a puzzle file path and a word set file path on every line
+    separated by white space or a comma, relative paths are relative to the manifest
+
+    :param batch_path:  A directory or a manifest file
+    :return list:  A sorted list of (puzzle file path, word set file path) tuples
+    """
+    batch_path = os.path.realpath(str(batch_path))
+    assert os.path.exists(batch_path), 'given: %s' % batch_path
+
+    pairs = []
+    if os.path.isdir(batch_path):
+        for file_name in sorted(os.listdir(batch_path)):
+            if not file_name.endswith(PUZZLE_SUFFIX):
+                continue
+            set_file_name = file_name[:-len(PUZZLE_SUFFIX)] + SET_SUFFIX
+            if os.path.isfile(os.path.join(batch_path, set_file_name)):
+                pairs.append((os.path.join(batch_path, file_name), os.path.join(batch_path, set_file_name)))
+        return pairs  # -> list
+
+    manifest_dir = os.path.dirname(batch_path)
+    with open(batch_path, 'r') as open_file:
+        for line in open_file:
+            line = line.replace(',', ' ').split()
+            if not line or line[0].startswith('#'):  # skip empty lines and comments
+                continue
+            assert len(line) == 2, 'expected a puzzle and a word set file path, given: %s' % ' '.join(line)
+            pairs.append(tuple(os.path.normpath(os.path.join(manifest_dir, path)) for path in line))
+    return pairs  # -> list
+
+
+def _init_worker(options: dict):
+    """ keep the options of the solver in the worker, the solver modules are imported once per worker """
+    global _worker_cache
+    options = dict(options)
+    cache_dir, cache_size = options.pop('cache_dir', None), options.pop('cache_size', None)
+    if cache_dir is not None:  # the workers share the directory, a solution is written to it at once
+        _worker_cache = solution_cache.SolutionCache(cache_dir, max_size=cache_size or solution_cache.DEFAULT_MAX_SIZE)
+    _worker_options.update(options)
+
+
+def solve_pair(pair: tuple) -> dict:
+    """
+    Solve one puzzle with its word set
+
+    :param pair:  A (puzzle file path, word set file path) tuple
+    :return dict:  The result of the puzzle, ready to be written as JSON
+    """
+    puzzle_file, word_set_file = pair
+    result = {'puzzle': puzzle_file, 'set': word_set_file}
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):  # the words not found are in the result
+            ws = word_search_solver.WordSearchPuzzle(puzzle_file, word_set_file, get_solution=False,
+                                                     engine=_worker_options.get('engine', 'numpy'),
+                                                     cache=_worker_cache)
+            ws.find_words_in_puzzle(min_length=_worker_options.get('min_length', 0),
+                                    method=_worker_options.get('method', 'aho-corasick'),
+                                    mismatches=_worker_options.get('mismatches', 0),
+                                    directions=_worker_options.get('directions', 8))
+            result['left_over_letters'] = ws.get_left_over_letters()
+    except (AssertionError, OSError, UnicodeDecodeError) as e:
+        result['error'] = '%s: %s' % (type(e).__name__, e)
+    else:
+        result['solution_coordinates'] = sorted([list(map(list, coordinates))
+                                                 for coordinates in ws.solution_coordinates])
+        result['words_not_found'] = sorted(ws.words_not_found)
+    return result  # -> dict
+
+
+def solve_batch(pairs: list, max_workers: int = None, chunksize: int = 1, **options):
+    """
+    Solve many puzzles over a pool of worker processes
+    The workers are started once and reused for every puzzle
+
+    :param pairs:  A list of (puzzle file path, word set file path) tuples
+    :param max_workers:  The amount of worker processes, None uses the amount of cores
+    :param chunksize:  The amount of puzzles sent to a worker at once
+    :param options:  engine, method, min_length, mismatches and directions for WordSearchPuzzle,
+                     cache_dir and cache_size for a solution_cache.SolutionCache shared by the workers
+    :return generator:  The result of every puzzle, in the order of the pairs
+    """
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker, initargs=(options, )) as executor:
+        for result in executor.map(solve_pair, pairs, chunksize=max(int(chunksize), 1)):
+            yield result
+
+
+def write_results(results, output: str = None) -> int:
+    """
+    Write the results as they come in
+
+    if output is a directory a <name>.json file is written per puzzle
+    if output ends with .json the results are aggregated in a single JSON list
+    otherwise, or if output is None for stdout, a JSON object is written per line
+
+    :param results:  An iterable of results of solve_pair
+    :param output:  A directory, a file path or None
+    :return int:  The amount of puzzles that could not be solved
+    """
+    errors = 0
+    if output is not None and os.path.isdir(output):
+        for result in results:
+            errors += 'error' in result
+            file_name = os.path.basename(result['puzzle'])
+            file_name = file_name[:-len(PUZZLE_SUFFIX)] if file_name.endswith(PUZZLE_SUFFIX) else file_name
+            with open(os.path.join(output, file_name + '.json'), 'w') as open_file:
+                json.dump(result, open_file)
+        return errors  # -> int
+
+    open_file = sys.stdout if output is None else open(output, 'w')
+    try:
+        aggregate = output is not None and output.endswith('.json')
+        if aggregate:
+            open_file.write('[')
+        for number, result in enumerate(results):
+            errors += 'error' in result
+            if aggregate:
+                open_file.write(',\n' if number else '\n')
+            open_file.write(json.dumps(result) + ('' if aggregate else '\n'))
+        if aggregate:
+            open_file.write('\n]\n')
+    finally:
+        if open_file is not sys.stdout:
+            open_file.close()
+    return errors  # -> int
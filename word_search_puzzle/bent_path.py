@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+
+import sys
+
+try:
+    from . import grid_engine, trie
+except ImportError:  # run as a script from within the word_search_puzzle directory
+    import grid_engine
+    import trie
+
+
+class BentPathSearch:
+    """ Search words along paths that turn corners, like in boggle
+
+        a word is found on any path of neighbouring cells, in all 8 directions,
+        that doesn't use a cell twice
+
+        the words are walked along a prefix trie from every cell of the grid,
+        a walk stops as soon as no word starts with the letters walked so far
+
+        the letters of the grid and of the neighbours of every cell are kept as bitsets:
+            words with a letter that is not in the grid are left out before the search
+            a walk stops when none of the next letters of the trie is next to the cell
+        a (cell, trie node) from where no word can be found is remembered
+        and not walked again from another path
+
+        example:
+
+            grid = GridEngine.from_lines(['ca', 'xt'])
+            list(BentPathSearch(grid).search({'cat', 'tax'}))
+            -> [('cat', ((0, 0), (1, 0), (1, 1))), ('tax', ((1, 1), (1, 0), (0, 1)))]
+    """
+
+    def __init__(self, grid: grid_engine.GridEngine):
+        """
+        init
+
+        :param grid:  The grid of the puzzle
+        """
+        self.grid = grid
+        height, width = grid.shape
+        letters = grid.grid.ravel().astype('<u4').tobytes().decode('utf-32-le')
+        self.letters = list(letters)  # cell -> letter, the cells are numbered row by row
+
+        # letter -> bit, and the bitset of the letters of the grid
+        grid_letters = sorted(set(letters) - {chr(grid_engine.BLANK)})
+        self.letter_bits = {letter: 1 << bit for bit, letter in enumerate(grid_letters)}
+        self.grid_bits = sum(self.letter_bits.values())
+
+        # cell -> the neighbouring cells that are not empty, and the bitset of their letters
+        self.neighbours = [[] for _ in range(height * width)]
+        for step_x, step_y in grid_engine.DIRECTIONS:
+            for y in range(max(0, -step_y), min(height, height - step_y)):
+                for x in range(max(0, -step_x), min(width, width - step_x)):
+                    neighbour = (y + step_y) * width + x + step_x
+                    if letters[neighbour] in self.letter_bits:
+                        self.neighbours[y * width + x].append(neighbour)
+        self.neighbour_bits = [0] * (height * width)
+        for cell, neighbours in enumerate(self.neighbours):
+            for neighbour in neighbours:
+                self.neighbour_bits[cell] |= self.letter_bits[letters[neighbour]]
+        self.coordinates = [(cell % width, cell // width) for cell in range(height * width)]
+
+    def get_word_bits(self, word: str) -> int:
+        """ the bitset of the letters of a word, -1 if a letter is not in the grid """
+        bits = 0
+        for letter in word:
+            bit = self.letter_bits.get(letter)
+            if bit is None:
+                return -1  # -> int
+            bits |= bit
+        return bits  # -> int
+
+    def search(self, words, min_length: int = 0):
+        """
+        Find every path of every word
+
+        :param words:  An iterable of words to search for
+        :param min_length:  minimal length of the words to find
+        :return generator:  (word, coordinates) for every path of every word
+        """
+        words = [word for word in words if len(word) >= max(min_length, 1) and self.get_word_bits(word) >= 0]
+        if not words:
+            return
+        longest = max(len(word) for word in words)
+        words = trie.Trie(words)
+
+        # trie node -> the bitset of the letters that can come next
+        next_bits = {}
+        stack = [words.root]
+        while stack:
+            node = stack.pop()
+            next_bits[id(node)] = sum(self.letter_bits[letter] for letter in node if letter is not None)
+            stack.extend(child for letter, child in node.items() if letter is not None)
+
+        letters, neighbours, neighbour_bits, coordinates = \
+            self.letters, self.neighbours, self.neighbour_bits, self.coordinates
+        visited = [False] * len(letters)
+        path = []
+        dead_ends = set()  # (cell, id of trie node) from where no word can be found
+        found = []
+
+        def walk(cell: int, node: dict) -> tuple:
+            """ walk from the cell along the trie, return if a word was found and if a visited cell was in the way """
+            visited[cell] = True
+            path.append(coordinates[cell])
+            found_word, blocked = False, False
+
+            word = node.get(None)
+            if word is not None:
+                found.append((word, tuple(path)))
+                found_word = True
+
+            if next_bits[id(node)] & neighbour_bits[cell]:  # a next letter is next to the cell
+                for neighbour in neighbours[cell]:
+                    child = node.get(letters[neighbour])
+                    if child is None or (neighbour, id(child)) in dead_ends:
+                        continue
+                    if visited[neighbour]:
+                        blocked = True
+                        continue
+                    child_found, child_blocked = walk(neighbour, child)
+                    found_word |= child_found
+                    blocked |= child_blocked
+
+            visited[cell] = False
+            path.pop()
+            if not found_word and not blocked:  # the same from any path, don't walk it again
+                dead_ends.add((cell, id(node)))
+            return found_word, blocked  # -> tuple
+
+        recursion_limit = sys.getrecursionlimit()  # a walk is as deep as the longest word
+        sys.setrecursionlimit(max(recursion_limit, longest + 100))
+        try:
+            for cell, letter in enumerate(letters):
+                node = words.root.get(letter)
+                if node is not None and (cell, id(node)) not in dead_ends:
+                    walk(cell, node)
+                    for hit in found:
+                        yield hit
+                    found.clear()
+        finally:
+            sys.setrecursionlimit(recursion_limit)
@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+
+import os
+import mmap
+import struct
+
+import numpy as np
+
+MAGIC = b'WSD1'
+HEADER = struct.Struct('<4sIII')  # magic, amount of words, words per block, amount of blocks
+BLOCK_SIZE = 16
+
+
+def dump_compact_dictionary(compact_file_path: str, words, block_size: int = BLOCK_SIZE) -> str:
+    """
+    Create a compact dictionary file from words
+
+    the words are made lowercase, like the letters of the grid and the words of a trie.Trie,
+    sorted on their utf-8 bytes and front coded in blocks:
+    every word is stored as the length of the prefix shared with the word before it,
+    the length of the rest of the word and the rest of the word.
+    The first word of a block is stored whole so a block can be read on its own.
+
+        header | block offsets (uint64) | block | block | ...
+
+    :param compact_file_path:  A path of the file to create
+    :param words:  An iterable of words
+    :param block_size:  The amount of words in a block
+    :return str:  The real path of the created file
+    """
+    real_file_path = os.path.realpath(str(compact_file_path))
+    real_dir_path = os.path.dirname(real_file_path)
+    assert os.path.exists(real_dir_path), \
+        'give a path to a directory that exists, given: %s' % real_file_path
+    assert int(block_size) > 0, 'block_size should be positive, given: %s' % block_size
+
+    encoded_words = sorted({str(word).lower().encode('utf-8') for word in words if word})
+    assert all(len(word) < 256 for word in encoded_words), 'words can be 255 bytes at most'
+
+    blocks = []
+    for start in range(0, len(encoded_words), block_size):
+        block, previous = bytearray(), b''
+        for word in encoded_words[start:start + block_size]:
+            shared = 0
+            for letter, previous_letter in zip(word, previous):
+                if letter != previous_letter:
+                    break
+                shared += 1
+            block += bytes((shared, len(word) - shared)) + word[shared:]
+            previous = word
+        blocks.append(bytes(block))
+
+    offsets = np.zeros(len(blocks) + 1, dtype='<u8')
+    offsets[0] = HEADER.size + offsets.nbytes
+    offsets[1:] = offsets[0] + np.cumsum([len(block) for block in blocks], dtype='<u8')
+
+    with open(real_file_path, 'wb') as compact_in:
+        compact_in.write(HEADER.pack(MAGIC, len(encoded_words), block_size, len(blocks)))
+        compact_in.write(offsets.tobytes())
+        for block in blocks:
+            compact_in.write(block)
+
+    assert os.path.isfile(real_file_path), 'somehow the compact dictionary file is not made'
+    return real_file_path  # -> str
+
+
+def load_compact_dictionary(compact_file_path: str) -> 'CompactDictionary':
+    """ open a compact dictionary file """
+    return CompactDictionary(compact_file_path)  # -> CompactDictionary
+
+
+def is_compact_dictionary(file_path: str) -> bool:
+    """ check if the file starts like a compact dictionary file """
+    with open(os.path.realpath(str(file_path)), 'rb') as open_file:
+        return open_file.read(len(MAGIC)) == MAGIC  # -> bool
+
+
+class CompactDictionary:
+    """ Memory mapped dictionary made by dump_compact_dictionary
+
+        the file is opened with mmap, the words are not loaded into memory
+        every process that opens the same file shares the page cached bytes
+
+        membership and prefix queries do a binary search over the first words of the blocks
+        and read a single block
+
+        example:
+
+            dictionary = load_compact_dictionary('NL_dictionary.wsd')
+            'fiets' in dictionary
+            -> True
+            dictionary.has_prefix('fie')
+            -> True
+            list(dictionary.iter_prefix('fietsen'))
+            -> ['fietsen', 'fietsenmaker', ...]
+    """
+
+    def __init__(self, compact_file_path: str):
+        """
+        init
+
+        :param compact_file_path:  A path to a file made by dump_compact_dictionary
+        """
+        real_file_path = os.path.realpath(str(compact_file_path))
+        assert os.path.isfile(real_file_path), 'give a path that exists, given: %s' % real_file_path
+
+        with open(real_file_path, 'rb') as compact_out:
+            self._mmap = mmap.mmap(compact_out.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, self._size, self.block_size, block_count = HEADER.unpack_from(self._mmap, 0)
+        assert magic == MAGIC, 'not a compact dictionary file, given: %s' % real_file_path
+        self._offsets = np.frombuffer(self._mmap, dtype='<u8', count=block_count + 1, offset=HEADER.size)
+        self.file_path = real_file_path
+
+    def __len__(self) -> int:
+        """ amount of words in the dictionary """
+        return self._size  # -> int
+
+    def __iter__(self):
+        """ iterate over all the words, in sorted order """
+        for block in range(len(self._offsets) - 1):
+            for word in self._iter_block(block):
+                yield word.decode('utf-8')
+
+    def __contains__(self, word: str) -> bool:
+        """ check if the word is in the dictionary """
+        key = str(word).encode('utf-8')
+        return next(self._iter_from(key), None) == key  # -> bool
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        """ close the memory map """
+        self._offsets = None
+        self._mmap.close()
+
+    def _first_word(self, block: int) -> bytes:
+        """ the first word of a block, stored whole """
+        start = int(self._offsets[block])
+        length = self._mmap[start + 1]
+        return self._mmap[start + 2:start + 2 + length]  # -> bytes
+
+    def _iter_block(self, block: int):
+        """ decode the words of a block """
+        data = self._mmap
+        position, end = int(self._offsets[block]), int(self._offsets[block + 1])
+        word = b''
+        while position < end:
+            shared, length = data[position], data[position + 1]
+            word = word[:shared] + data[position + 2:position + 2 + length]
+            position += 2 + length
+            yield word
+
+    def _iter_from(self, key: bytes):
+        """ iterate over the words that are equal to or come after the key, in sorted order """
+        block_count = len(self._offsets) - 1
+        low, high = 0, block_count
+        while low < high:  # the first block that starts after the key
+            middle = (low + high) // 2
+            if self._first_word(middle) <= key:
+                low = middle + 1
+            else:
+                high = middle
+
+        for block in range(max(low - 1, 0), block_count):
+            for word in self._iter_block(block):
+                if word >= key:
+                    yield word
+
+    def has_prefix(self, prefix: str) -> bool:
+        """
+        Check if a word in the dictionary starts with the prefix
+
+        :param prefix:  The start of a word
+        :return bool:  True if a word starts with the prefix
+        """
+        key = str(prefix).encode('utf-8')
+        word = next(self._iter_from(key), None)
+        return word is not None and word.startswith(key)  # -> bool
+
+    def iter_prefix(self, prefix: str):
+        """
+        Iterate over the words that start with the prefix
+
+        :param prefix:  The start of the words
+        :return generator:  The words in sorted order
+        """
+        key = str(prefix).encode('utf-8')
+        for word in self._iter_from(key):
+            if not word.startswith(key):
+                break
+            yield word.decode('utf-8')
+
+    def search_lines(self, list_of_strings: list, min_length: int = 0):
+        """
+        Walk the dictionary from every letter of every line like trie.Trie.search_lines
+        A walk stops as soon as no word starts with the letters walked so far
+
+        :param list_of_strings:  A list of lines to search in
+        :param min_length:  minimal length of the words to yield
+        :return generator:  (word, line number, start position) for every word on the lines
+        """
+        lookups = {}  # prefix -> (prefix is a word, a word starts with the prefix)
+
+        def lookup(prefix: str) -> tuple:
+            found = lookups.get(prefix)
+            if found is None:
+                key = prefix.encode('utf-8')
+                word = next(self._iter_from(key), None)
+                found = (word == key, word is not None and word.startswith(key))
+                lookups[prefix] = found
+            return found
+
+        for line_number, string in enumerate(list_of_strings):
+            length = len(string)
+            for start_pos in range(length):
+                for end_pos in range(start_pos + 1, length + 1):
+                    is_word, is_prefix = lookup(string[start_pos:end_pos])
+                    if not is_prefix:  # no word starts with these letters
+                        break
+                    if is_word and end_pos - start_pos >= min_length:
+                        yield string[start_pos:end_pos], line_number, start_pos
+
+
+if __name__ == '__main__':
+    import pickle
+    import argparse
+
+    try:
+        from . import word_list
+    except ImportError:  # run as a script from within the word_search_puzzle directory
+        import word_list
+
+    parser = argparse.ArgumentParser(description='Convert a pickled set or a word file to a compact dictionary')
+    parser.add_argument('source', type=str, help='A pickled set of words (.pkl) or a file of words')
+    parser.add_argument('destination', type=str, help='The compact dictionary file to create')
+    parser.add_argument('--block-size', type=int, default=BLOCK_SIZE, help='The amount of words in a block')
+    args = parser.parse_args()
+
+    if args.source.endswith('.pkl'):
+        with open(args.source, 'rb') as pickle_out:
+            source_words = pickle.load(pickle_out)
+    else:
+        source_words = word_list.read_word_set(args.source)
+
+    file_path = dump_compact_dictionary(args.destination, source_words, block_size=args.block_size)
+    with load_compact_dictionary(file_path) as compact_dictionary:
+        print('%s words written to %s' % (len(compact_dictionary), file_path))
@@ -0,0 +1,336 @@
+#!/usr/bin/env python3
+
+import os
+import locale
+from itertools import chain
+
+import numpy as np
+
+BLANK = 32  # chr(32), the value of an empty cell
+NEWLINE = 10  # chr(10), the end of a row
+
+# code points of the white space letters, these become BLANK in the grid
+WHITESPACE = np.array([code for code in range(0x3001) if chr(code).isspace()], dtype='<u4')
+
+# the 8 reading directions as (column step, row step), the rows and columns first and then the diagonals,
+# the reverse of a direction is 2 places further in its group of 4, match_records.AXES depends on this order
+# and match_records keeps a direction as its index in this tuple
+DIRECTIONS = ((1, 0), (0, 1), (-1, 0), (0, -1), (1, 1), (-1, 1), (-1, -1), (1, -1))
+
+# the 4 directions that are not the reverse of another, the other 4 directions read the same lines backwards
+FORWARD_DIRECTIONS = ((1, 0), (0, 1), (1, 1), (-1, 1))
+
+# a line of the puzzle, the cell of the first letter, the step to the next letter and the amount of letters
+LINE_DTYPE = np.dtype([('x', np.int64), ('y', np.int64), ('step_x', np.int64), ('step_y', np.int64),
+                       ('length', np.int64)])
+
+
+class GridEngine:
+    """ NumPy grid engine of a word search puzzle
+
+        the letters of the puzzle are stored as code points in one contiguous array
+        uint8 is used when every letter fits in a byte, otherwise uint32
+
+        every direction is read through strided views of that array
+        so no copies of the puzzle are made to get the rows, columns and diagonals
+
+        every line is described in a line table by its first cell, step and length
+        the (x, y) coordinates of a letter on a line are calculated from that
+
+        the lines are made once and kept, set_cells only changes the lines that pass through the changed cells,
+        call invalidate after changing the grid array directly
+    """
+
+    def __init__(self, grid: np.ndarray):
+        """
+        init
+
+        :param grid:  A 2d array of code points, empty cells contain BLANK
+        """
+        grid = np.asarray(grid)
+        assert grid.ndim == 2, 'a 2d array is needed, given: %s dimensions' % grid.ndim
+
+        dtype = np.uint8 if grid.size == 0 or int(grid.max()) < 256 else np.uint32
+        self.grid = np.ascontiguousarray(grid, dtype=dtype)
+        self._lines = {}  # directions -> list_of_strings and line_table of get_all_lines
+
+    @classmethod
+    def from_text(cls, text: str) -> 'GridEngine':
+        """
+        Create a GridEngine out of the text of a puzzle
+        The letters are made lowercase, white space becomes BLANK and short lines are filled with BLANK.
+        This is done on the whole text at once, not letter by letter,
+        only a letter that is more than one letter in lowercase, like 'İ', keeps the first one so a cell stays a cell.
+
+        :param text:  The text of the puzzle, a row per line
+        :return GridEngine:  The grid of the text
+        """
+        text = text.replace('\r\n', '\n').replace('\r', '\n')
+        lowered = text.lower()
+        if len(lowered) != len(text):  # a letter became more letters and would shift the cells after it
+            lowered = ''.join(letter.lower()[:1] for letter in text)
+        text = lowered
+        codes = np.frombuffer(text.encode('utf-32-le'), dtype='<u4')
+
+        is_newline = codes == NEWLINE
+        newlines = np.flatnonzero(is_newline)
+        height = len(newlines) + int(bool(len(codes)) and not is_newline[-1])  # the last line may lack a newline
+        line_starts = np.concatenate(([0], newlines + 1))[:height]
+        line_lengths = np.concatenate((newlines, [len(codes)]))[:height] - line_starts
+        width = int(line_lengths.max()) if height else 0
+
+        if height and (line_lengths == width).all():  # every line is as long, only the newlines are removed
+            grid = codes[~is_newline].reshape(height, width)
+        else:  # put every letter on its row and column
+            rows = np.cumsum(is_newline) - is_newline
+            columns = np.arange(len(codes)) - line_starts[rows]
+            grid = np.full((height, width), BLANK, dtype='<u4')
+            grid[rows[~is_newline], columns[~is_newline]] = codes[~is_newline]
+
+        grid = np.where(np.isin(grid, WHITESPACE), BLANK, grid)
+        return cls(grid)  # -> GridEngine
+
+    @classmethod
+    def from_lines(cls, lines: list) -> 'GridEngine':
+        """
+        Create a GridEngine out of the lines of a puzzle
+
+        :param lines:  A list of strings, each string is a row of the puzzle
+        :return GridEngine:  The grid of the given lines
+        """
+        return cls.from_text(''.join(line + '\n' for line in lines))  # -> GridEngine
+
+    @classmethod
+    def from_file(cls, word_search_puzzle: str) -> 'GridEngine':
+        """
+        Create a GridEngine out of a puzzle file
+        The file is read once, in one go
+
+        :param word_search_puzzle:  A text file containing the puzzle
+        :return GridEngine:  The grid of the puzzle file
+        """
+        word_search_puzzle = os.path.realpath(str(word_search_puzzle))
+        assert os.path.isfile(word_search_puzzle), 'given: %s' % word_search_puzzle
+
+        with open(word_search_puzzle, 'rb') as open_file:
+            data = open_file.read()
+        return cls.from_text(data.decode(locale.getpreferredencoding(False)))  # -> GridEngine
+
+    @classmethod
+    def from_dataframe(cls, dataframe) -> 'GridEngine':
+        """
+        Create a GridEngine out of a puzzle DataFrame
+
+        :param dataframe:  A DataFrame of single letter strings like WordSearchPuzzle.puzzle_df
+        :return GridEngine:  The grid of the DataFrame
+        """
+        height, width = dataframe.shape
+        text = ''.join(dataframe.values.ravel().tolist())
+        assert len(text) == height * width, 'every cell should contain a single letter'
+        grid = np.frombuffer(text.encode('utf-32-le'), dtype='<u4').reshape(height, width)
+        return cls(grid)  # -> GridEngine
+
+    @property
+    def shape(self) -> tuple:
+        """ height and width of the grid """
+        return self.grid.shape  # -> tuple
+
+    def _to_string(self, letters: np.ndarray) -> str:
+        """ convert an array of code points to a string """
+        if self.grid.dtype == np.uint8:
+            return letters.tobytes().decode('latin-1')
+        return letters.astype('<u4').tobytes().decode('utf-32-le')  # -> str
+
+    def get_direction_views(self, array: np.ndarray, direction: tuple) -> list:
+        """
+        Get the lines of the array read in the given direction
+        Every line is a view on the array, nothing is copied
+
+        :param array:  The grid or an array of the same shape
+        :param direction:  A (column step, row step) tuple out of DIRECTIONS
+        :return list:  A list of 1d views
+        """
+        assert direction in DIRECTIONS, 'given: %s' % str(direction)
+        column_step, row_step = direction
+
+        if row_step == 0:  # rows, left to right or right to left
+            return list(array[:, ::column_step])
+        if column_step == 0:  # columns, top to bottom or bottom to top
+            return list(array[::row_step].T)
+
+        # diagonals, turn the array so the direction becomes top left to bottom right
+        turned = array[::row_step, ::column_step]
+        height, width = turned.shape
+        return [np.diagonal(turned, offset=offset) for offset in range(-(height - 1), width)]  # -> list
+
+    def get_direction_table(self, direction: tuple) -> np.ndarray:
+        """
+        Get the line table of the lines read in the given direction
+        The lines are in the same order as the views of get_direction_views
+
+        :param direction:  A (column step, row step) tuple out of DIRECTIONS
+        :return numpy.ndarray:  An array of LINE_DTYPE, one row per line
+        """
+        assert direction in DIRECTIONS, 'given: %s' % str(direction)
+        column_step, row_step = direction
+        height, width = self.grid.shape
+
+        if row_step == 0:  # a line per row
+            table = np.zeros(height, dtype=LINE_DTYPE)
+            table['x'] = 0 if column_step > 0 else width - 1
+            table['y'] = np.arange(height)
+            table['length'] = width
+        elif column_step == 0:  # a line per column
+            table = np.zeros(width, dtype=LINE_DTYPE)
+            table['x'] = np.arange(width)
+            table['y'] = 0 if row_step > 0 else height - 1
+            table['length'] = height
+        else:  # a line per diagonal, the first cell is on the top or left side of the turned grid
+            offsets = np.arange(-(height - 1), width)
+            table = np.zeros(len(offsets), dtype=LINE_DTYPE)
+            turned_y, turned_x = np.maximum(0, -offsets), np.maximum(0, offsets)
+            table['x'] = turned_x if column_step > 0 else width - 1 - turned_x
+            table['y'] = turned_y if row_step > 0 else height - 1 - turned_y
+            table['length'] = np.minimum(height - turned_y, width - turned_x)
+
+        table['step_x'], table['step_y'] = column_step, row_step
+        return table  # -> np.ndarray
+
+    def get_all_lines(self, directions: tuple = DIRECTIONS) -> tuple:
+        """
+        Get the lines of all 8 directions, or of the given directions
+        The lines are made on the first call and shared by the next calls, they should not be changed
+        set_cells changes the letters of the cells in the lines of the list, the list stays the same
+
+        :param directions:  The directions of the lines, like DIRECTIONS or FORWARD_DIRECTIONS
+        :return tuple:  A list of strings and the line table that describes them, a row per string
+        """
+        directions = tuple(directions)
+        if directions not in self._lines:
+            assert all(direction in DIRECTIONS for direction in directions), 'given: %s' % str(directions)
+            list_of_strings = []
+            for direction in directions:
+                letter_views = self.get_direction_views(self.grid, direction)
+                list_of_strings.extend(self._to_string(view) for view in letter_views)
+            line_table = np.concatenate([self.get_direction_table(direction) for direction in directions])
+            self._lines[directions] = (list_of_strings, line_table)
+        return self._lines[directions]  # -> tuple
+
+    def invalidate(self):
+        """ forget the lines made by get_all_lines, they are made again on the next call """
+        self._lines = {}
+
+    def get_cell_lines(self, x: int, y: int, directions: tuple = DIRECTIONS) -> list:
+        """
+        Get the lines that pass through a cell, one per direction
+
+        :param x:  The column of the cell
+        :param y:  The row of the cell
+        :param directions:  The directions of the lines, numbered like get_all_lines numbers them
+        :return list:  A list of (line number, position of the cell on the line) in the order of the directions
+        """
+        height, width = self.grid.shape
+        cell_lines = []
+        first_line = 0  # the line number of the first line of the direction
+        for column_step, row_step in directions:
+            # the cell in the grid turned like in get_direction_views
+            turned_x = x if column_step >= 0 else width - 1 - x
+            turned_y = y if row_step >= 0 else height - 1 - y
+            if row_step == 0:  # a line per row
+                cell_lines.append((first_line + y, turned_x))
+                first_line += height
+            elif column_step == 0:  # a line per column
+                cell_lines.append((first_line + x, turned_y))
+                first_line += width
+            else:  # a line per diagonal, numbered by the offset of the diagonal
+                cell_lines.append((first_line + turned_x - turned_y + height - 1, min(turned_x, turned_y)))
+                first_line += height + width - 1
+        return cell_lines  # -> list
+
+    def set_cells(self, cells: dict) -> list:
+        """
+        Change letters of the grid
+        The letters are made lowercase and white space becomes BLANK like in from_text
+        Only the lines that pass through the changed cells are changed, the other lines are kept
+
+        :param cells:  A dict of (x, y) coordinates -> letter
+        :return list:  The sorted line numbers of the lines that pass through the changed cells
+        """
+        height, width = self.grid.shape
+        changed_lines = set()
+        for (x, y), letter in cells.items():
+            assert 0 <= x < width and 0 <= y < height, 'coordinates out of the grid, given: %s' % str((x, y))
+            letter = str(letter).lower()
+            assert len(letter) <= 1, 'a single letter is needed, given: %s' % letter
+            code = BLANK if not letter or letter.isspace() else ord(letter)
+            if code > 255 and self.grid.dtype == np.uint8:
+                self.grid = self.grid.astype(np.uint32)
+            self.grid[y, x] = code
+
+            changed_lines.update(line_number for line_number, _ in self.get_cell_lines(x, y))
+            for directions, (list_of_strings, _) in self._lines.items():  # put the letter in the lines
+                for line_number, position in self.get_cell_lines(x, y, directions):
+                    string = list_of_strings[line_number]
+                    list_of_strings[line_number] = string[:position] + chr(code) + string[position + 1:]
+        return sorted(changed_lines)  # -> list
+
+    @staticmethod
+    def get_coordinates(line: np.void, start_pos: int, length: int) -> tuple:
+        """
+        Calculate the coordinates of letters on a line
+
+        :param line:  A row of a line table
+        :param start_pos:  The position of the first letter on the line
+        :param length:  The amount of letters
+        :return tuple:  A tuple of (x, y) coordinates
+        """
+        x, y, step_x, step_y, _ = line.item()
+        x, y = x + start_pos * step_x, y + start_pos * step_y
+        return tuple((x + i * step_x, y + i * step_y) for i in range(length))  # -> tuple
+
+    def get_letters(self, coordinates) -> str:
+        """
+        Get the letters on the given coordinates
+
+        :param coordinates:  An iterable of (x, y) coordinates
+        :return str:  The letters on the coordinates
+        """
+        coordinates = np.array(list(coordinates), dtype=np.intp).reshape(-1, 2)
+        return self._to_string(self.grid[coordinates[:, 1], coordinates[:, 0]])  # -> str
+
+    def get_coverage_mask(self, solution_coordinates) -> np.ndarray:
+        """
+        Mark the cells used by the solution
+        All the coordinates are scattered into the mask at once
+
+        :param solution_coordinates:  An iterable of tuples of (x, y) coordinates, like a solution
+        :return numpy.ndarray:  A boolean array of the shape of the grid, True on the cells of the solution
+        """
+        mask = np.zeros(self.grid.shape, dtype=bool)
+        coordinates = np.fromiter(chain.from_iterable(chain.from_iterable(solution_coordinates)), dtype=np.intp)
+        coordinates = coordinates.reshape(-1, 2)
+        mask[coordinates[:, 1], coordinates[:, 0]] = True
+        return mask  # -> np.ndarray
+
+    def get_left_over_letters(self, mask: np.ndarray) -> str:
+        """
+        Get the letters that are not covered, row by row, in one masked gather
+        Empty cells are left out
+
+        :param mask:  A mask of get_coverage_mask
+        :return str:  The letters of the cells that are False in the mask
+        """
+        assert mask.shape == self.grid.shape, 'the mask should have the shape %s, given: %s' \
+                                              % (self.grid.shape, mask.shape)
+        return self._to_string(self.grid[~mask & (self.grid != BLANK)])  # -> str
+
+    def to_dataframe(self):
+        """
+        Create a DataFrame of the grid like WordSearchPuzzle._create_puzzle_dataframe does
+
+        :return pandas.DataFrame:  A DataFrame of single letter strings in the shape of the grid
+        """
+        import pandas as pd
+
+        letters = self.grid.astype('<u4').view('<U1').astype(object)  # every code point becomes a str
+        return pd.DataFrame(letters)  # -> pd.DataFrame
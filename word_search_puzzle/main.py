@@ -3,7 +3,7 @@
 import os
 import sys
 import argparse
-import word_search_solver
+from importlib.util import find_spec
 
 if __name__ == '__main__':
 
@@ -22,14 +22,52 @@ if __name__ == '__main__':
       -w [word to search for [word to search for ...]], --word [word to search for [word to search for ...]]
                             A word to search for
       --show [show the solution in a tkinter window]
+      --engine {pandas,numpy}
+                            The backing store of the puzzle, pandas is only imported for the pandas engine
+      --method {index,aho-corasick,suffix-array,bent-path}
+                            How the words are searched in the puzzle
+      --directions {8,4}    The amount of directions searched, 4 searches half the lines for every word
+                            and its reverse and finds a palindrome once,
+                            4 can not be combined with --partition or --method bent-path
+      --mismatches [amount of wrong letters]
+                            Search the words that are not found again allowing this many wrong letters,
+                            for puzzles with typing errors
+      -d [dictionary file path], --discover [dictionary file path]
+                            Find every word of a dictionary in the puzzle,
+                            a word file, a pickled set or a compact dictionary
+      --min-length [minimal word length]
+                            Minimal length of the words to search for
+      -b [directory or manifest file path], --batch [directory or manifest file path]
+                            Solve every <name>_puzzle.txt with its <name>_set.txt in a directory,
+                            or every puzzle and set file pair listed in a manifest file
+      -j [amount of worker processes], --jobs [amount of worker processes]
+                            The amount of worker processes of --batch or --partition, the amount of cores by default
+      --partition {tiles,words}
+                            Split the search over worker processes,
+                            tiles: search tiles of the grid in parallel, for very large puzzles,
+                            words: search chunks of the words in parallel, for very large word sets
+      -o [output path], --output [output path]
+                            Where --batch writes the results, a directory for a JSON file per puzzle,
+                            a .json file for one JSON list or any other file for JSON lines, stdout by default
+      --cache [cache directory]
+                            Store the solutions and reuse them for the same puzzle and words,
+                            in ~/.cache/word_search_puzzle when no directory is given
+      --cache-size [cache size in bytes]
+                            The maximum size of the cache, the least recently used solutions are removed,
+                            64 MiB by default
+      --serve [address]     Keep running and solve the queries of clients, a JSON object per line,
+                            the address is host:port for TCP or the path of a Unix socket,
+                            the puzzle of -p and the dictionary of -d are registered at the start
+      --max-concurrency [amount of scans]
+                            The amount of scans of --serve running at the same time
+      --profile [profile file path]
+                            Measure the time and memory of every phase of the solve and count the hits,
+                            a table is written to stderr or JSON to the file when a file is given
 
     """
 
-    try:  # Module pandas and numpy are required
-        import pandas as pd
-        import numpy as np
-    except ImportError:
-        sys.stdout.write("Modules 'pandas' and 'nummpy' are required\n")
+    if find_spec('numpy') is None:  # Module numpy is required, pandas only for the pandas engine and --show
+        sys.stdout.write("Module 'numpy' is required\n")
         sys.exit(1)
 
     def str_to_bool(value: str) -> bool:
@@ -37,7 +75,7 @@ if __name__ == '__main__':
 
     parser = argparse.ArgumentParser(description='Script to solve word search puzzles\n'
                                                  'running this code returns the left over letters of the puzzle')
-    parser.add_argument('-p', '--puzzle', required=True, type=str,
+    parser.add_argument('-p', '--puzzle', required=False, type=str,
                         help='The representation of the word search puzzle',
                         dest='puzzle_file',
                         metavar='word search puzzle file path',
@@ -54,8 +92,165 @@ if __name__ == '__main__':
                         nargs='*')
     parser.add_argument('--show', type=str_to_bool, nargs='?', const=True, default=False,
                         metavar='show the solution in a tkinter window',)
+    parser.add_argument('--engine', required=False, type=str, default='numpy',
+                        help='The backing store of the puzzle, pandas is only imported for the pandas engine',
+                        choices=('pandas', 'numpy'))  # WordSearchPuzzle.ENGINES, the solver is imported after parsing
+    parser.add_argument('--method', required=False, type=str, default='index',
+                        help='How the words are searched in the puzzle',
+                        choices=('index', 'aho-corasick', 'suffix-array', 'bent-path'))  # WordSearchPuzzle.METHODS
+    parser.add_argument('--directions', required=False, type=int, default=8,
+                        help='The amount of directions searched, 4 searches half the lines for every word '
+                             'and its reverse and finds a palindrome once, '
+                             '4 can not be combined with --partition or --method bent-path',
+                        choices=(8, 4))
+    parser.add_argument('--mismatches', required=False, type=int, default=0,
+                        help='Search the words that are not found again allowing this many wrong letters, '
+                             'for puzzles with typing errors',
+                        dest='mismatches',
+                        metavar='amount of wrong letters')
+    parser.add_argument('-d', '--discover', required=False, type=str,
+                        help='Find every word of a dictionary in the puzzle, '
+                             'a word file, a pickled set or a compact dictionary',
+                        dest='dictionary_file',
+                        metavar='dictionary file path',
+                        nargs='?')
+    parser.add_argument('--min-length', required=False, type=int, default=0,
+                        help='Minimal length of the words to search for',
+                        dest='min_length',
+                        metavar='minimal word length')
+    parser.add_argument('-b', '--batch', required=False, type=str,
+                        help='Solve every <name>_puzzle.txt with its <name>_set.txt in a directory, '
+                             'or every puzzle and set file pair listed in a manifest file',
+                        dest='batch_path',
+                        metavar='directory or manifest file path',
+                        nargs='?')
+    parser.add_argument('-j', '--jobs', required=False, type=int, default=None,
+                        help='The amount of worker processes of --batch or --partition, '
+                             'the amount of cores by default',
+                        dest='jobs',
+                        metavar='amount of worker processes')
+    parser.add_argument('-o', '--output', required=False, type=str, default=None,
+                        help='Where --batch writes the results, a directory for a JSON file per puzzle, '
+                             'a .json file for one JSON list or any other file for JSON lines, stdout by default',
+                        dest='output',
+                        metavar='output path')
+    parser.add_argument('--cache', required=False, type=str, default=None,
+                        const='',  # solution_cache.DEFAULT_CACHE_DIR
+                        help='Store the solutions and reuse them for the same puzzle and words, '
+                             'in ~/.cache/word_search_puzzle when no directory is given',
+                        dest='cache_dir',
+                        metavar='cache directory',
+                        nargs='?')
+    parser.add_argument('--cache-size', required=False, type=int, default=None,
+                        help='The maximum size of the cache, the least recently used solutions are removed, '
+                             '64 MiB by default',
+                        dest='cache_size',
+                        metavar='cache size in bytes')
+    parser.add_argument('--partition', required=False, type=str, default=None,
+                        help='Split the search over worker processes, '
+                             'tiles: search tiles of the grid in parallel, for very large puzzles, '
+                             'words: search chunks of the words in parallel, for very large word sets',
+                        choices=('tiles', 'words'))  # WordSearchPuzzle.PARTITIONS
+    parser.add_argument('--serve', required=False, type=str, default=None,
+                        help='Keep running and solve the queries of clients, a JSON object per line, '
+                             'the address is host:port for TCP or the path of a Unix socket, '
+                             'the puzzle of -p and the dictionary of -d are registered at the start',
+                        dest='serve_address',
+                        metavar='address')
+    parser.add_argument('--max-concurrency', required=False, type=int, default=4,
+                        help='The amount of scans of --serve running at the same time',
+                        dest='max_concurrency',
+                        metavar='amount of scans')
+    parser.add_argument('--profile', required=False, type=str, default=None, const='',
+                        help='Measure the time and memory of every phase of the solve and count the hits, '
+                             'a table is written to stderr or JSON to the file when a file is given',
+                        dest='profile_file',
+                        metavar='profile file path',
+                        nargs='?')
     args = parser.parse_args()
 
+    # imported after parsing and not at the top, --help and wrong arguments don't load NumPy and the solver
+    import word_search_solver
+    import solution_cache
+
+    args.cache_dir = solution_cache.DEFAULT_CACHE_DIR if args.cache_dir == '' else args.cache_dir
+    args.cache_size = solution_cache.DEFAULT_MAX_SIZE if args.cache_size is None else args.cache_size
+
+    # the DataFrames of the pandas engine and the window of --show need pandas
+    if (args.engine == 'pandas' or bool(args.show)) and find_spec('pandas') is None:
+        sys.stdout.write("Module 'pandas' is required for --engine pandas and --show\n")
+        sys.exit(1)
+
+    # keep the puzzles parsed and solve the queries of the clients until stopped
+    if args.serve_address is not None:
+        import asyncio
+        import server
+
+        solver_server = server.SolverServer(max_concurrency=args.max_concurrency)
+        try:
+            if args.puzzle_file is not None:
+                sys.stderr.write("registered puzzle: %s\n" % solver_server.register_puzzle(args.puzzle_file))
+            if args.dictionary_file is not None:
+                sys.stderr.write("registered dictionary: %s\n"
+                                 % solver_server.register_dictionary(args.dictionary_file))
+        except (AssertionError, OSError) as e:
+            sys.stdout.write('%s\n' % e)
+            sys.exit(1)
+
+        sys.stderr.write("serving on %s\n" % args.serve_address)
+        try:
+            asyncio.run(solver_server.serve(args.serve_address))
+        except KeyboardInterrupt:
+            pass
+        except (AssertionError, OSError) as e:  # an address that is in use or a file that is not a socket
+            sys.stdout.write('%s\n' % e)
+            sys.exit(1)
+        sys.exit(0)
+
+    # a partition searches parts of the lines, which only the methods of parallel.METHODS do
+    if args.partition is not None:
+        import parallel
+
+        if args.method not in parallel.METHODS:
+            message = '--partition can only be combined with --method %s\n' % ' or '.join(parallel.METHODS)
+            sys.stdout.write(message)
+            sys.exit(1)
+
+    # only the whole lines are searched in 4 directions, the tiles of a partition and bent paths need all 8
+    if args.directions == 4 and (args.partition is not None or args.method == 'bent-path'):
+        message = '--directions 4 can not be combined with --partition or --method bent-path\n'
+        sys.stdout.write(message)
+        sys.exit(1)
+
+    # solve all the puzzles of the batch, every worker process solves many puzzles
+    if args.batch_path is not None:
+        import batch
+
+        if not os.path.exists(os.path.abspath(args.batch_path)):
+            message = 'Batch directory or manifest file path given doesn\'t exist\n'
+            sys.stdout.write(message)
+            sys.exit(1)
+
+        # the worker processes of the batch are the only ones, a puzzle is not partitioned again
+        if args.partition is not None:
+            message = '--partition can not be combined with --batch, the puzzles are solved in parallel already\n'
+            sys.stdout.write(message)
+            sys.exit(1)
+
+        pairs = batch.find_puzzle_pairs(args.batch_path)
+        results = batch.solve_batch(pairs, max_workers=args.jobs, chunksize=max(len(pairs) // 64, 1),
+                                    engine=args.engine, method=args.method, min_length=args.min_length,
+                                    mismatches=args.mismatches, directions=args.directions,
+                                    cache_dir=args.cache_dir, cache_size=args.cache_size)
+        errors = batch.write_results(results, args.output)
+        sys.exit(1 if errors else 0)
+
+    # a puzzle is required when not solving a batch
+    if args.puzzle_file is None:
+        message = 'expected [-p [word search puzzle file path]] or [-b [directory or manifest file path]]\n'
+        sys.stdout.write(message)
+        sys.exit(1)
+
     # check the file path of the word search puzzle file
     abs_puzzle_path = os.path.abspath(args.puzzle_file)
     if not os.path.exists(abs_puzzle_path):
@@ -71,31 +266,91 @@ if __name__ == '__main__':
             sys.stdout.write(message)
             sys.exit(1)
 
+    # check the dictionary file path if it's given
+    if args.dictionary_file is not None:
+        abs_dictionary_path = os.path.abspath(args.dictionary_file)
+        if not os.path.exists(abs_dictionary_path):
+            message = 'Dictionary file path given doesn\'t exist\n'
+            sys.stdout.write(message)
+            sys.exit(1)
+
     # assure one of the options is given
-    if all(word is None for word in (args.word_set_file, args.words)):
+    if all(word is None for word in (args.word_set_file, args.words, args.dictionary_file)):
         message = ('expected [-s [word search set file path]]\n'
-                   'or [-w [word to search for [word to search for ...]]]\n')
+                   'or [-w [word to search for [word to search for ...]]]\n'
+                   'or [-d [dictionary file path]]\n')
         sys.stdout.write(message)
         sys.exit(1)
 
-    # call the class with the arguments
+    # the cache of the solutions if --cache is given
+    cache = None
+    if args.cache_dir is not None:
+        cache = solution_cache.SolutionCache(args.cache_dir, max_size=args.cache_size)
+
+    # the measurements of the phases if --profile is given, written when the puzzle is solved
+    profile = None
+    if args.profile_file is not None:
+        import profiling
+        profile = profiling.Profile()
+
+    # call the class with the arguments, the puzzle is solved below
     ws = word_search_solver.WordSearchPuzzle(word_search_puzzle=args.puzzle_file,
-                                             word_search_set_file=args.word_set_file)
+                                             word_search_set_file=args.word_set_file,
+                                             get_solution=False,
+                                             engine=args.engine,
+                                             cache=cache,
+                                             profile=profile)
+
+    # if a dictionary is given, show every word of the dictionary in the puzzle with its coordinates
+    if args.dictionary_file is not None:
+        import compact_dictionary
+
+        if compact_dictionary.is_compact_dictionary(abs_dictionary_path):  # memory mapped, not loaded
+            dictionary = compact_dictionary.load_compact_dictionary(abs_dictionary_path)
+        elif abs_dictionary_path.endswith('.pkl'):  # a pickled set, like the one of NL_dictionary/pickler.py
+            import pickle
+            with open(abs_dictionary_path, 'rb') as pickle_out:
+                dictionary = pickle.load(pickle_out)
+        else:
+            # read in chunks, the words longer than any line of the puzzle are left out
+            dictionary = ws._create_word_set(abs_dictionary_path, max_length=max(ws._get_grid().shape))
+
+        coordinates_set = ws.discover_words(dictionary, min_length=args.min_length)
+        found = sorted((ws.get_word(coordinates), coordinates) for coordinates in coordinates_set)
+        for word, coordinates in found:
+            sys.stdout.write("%s - coordinates: %s\n" % (str(word), str(coordinates)))
+
+        if profile is not None:
+            profile.write(args.profile_file or None)
+
+        if bool(args.show) and coordinates_set:
+            ws.visualize_solution()
+        sys.exit(0)
 
     # assure one of both is chosen, if word_Set_file is available, set arg.words to None
     args.words = args.words if args.word_set_file is None else None
 
     # get the solution coordinates
-    coordinates_set = ws.find_words_in_puzzle(args.words)
+    coordinates_set = ws.find_words_in_puzzle(args.words, min_length=args.min_length, method=args.method,
+                                              partition=args.partition, max_workers=args.jobs,
+                                              mismatches=args.mismatches, directions=args.directions)
 
     # if the word_set_file is given, show the left over letters
     if args.word_set_file is not None:
         sys.stdout.write(str(ws.get_left_over_letters()) + "\n")
 
+    # report the use of the cache, on stderr to keep the output the same
+    if cache is not None:
+        sys.stderr.write("cache hits: %s, cache misses: %s\n" % (cache.hits, cache.misses))
+
+    # write the measurements of the phases, the table on stderr to keep the output the same
+    if profile is not None:
+        profile.write(args.profile_file or None)
+
     # if some word(s) is given show the word with the respectful coordinates
     if args.words is not None and coordinates_set:
         for coordinates in coordinates_set:
-            word = ws.find_word_with_coordinates(ws.puzzle_df, coordinates)
+            word = ws.get_word(coordinates)
             sys.stdout.write("%s - coordinates: %s\n" % (str(word), str(coordinates)))
 
     # if --show is given and there are words found, show them in a tkinter window
@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+
+from collections.abc import MutableSet
+
+import numpy as np
+
+try:
+    from . import grid_engine
+except ImportError:  # run as a script from within the word_search_puzzle directory
+    import grid_engine
+
+# a word found on a straight line, the coordinates of its letters are calculated from these
+RECORD_DTYPE = np.dtype([('word', np.int32), ('row', np.int32), ('column', np.int32), ('direction', np.int8),
+                         ('length', np.int32)])
+
+STEPS = np.array(grid_engine.DIRECTIONS, dtype=np.int64)  # direction -> (column step, row step)
+
+# (row step + 1, column step + 1) -> direction, the index of the step in grid_engine.DIRECTIONS
+DIRECTION_INDEX = np.full((3, 3), -1, dtype=np.int8)
+DIRECTION_INDEX[STEPS[:, 1] + 1, STEPS[:, 0] + 1] = np.arange(len(STEPS))
+
+# direction -> the axis of its line, 0 row, 1 column, 2 diagonal and 3 anti-diagonal, the reverse is on the same line
+# a direction and its reverse are 2 places apart in grid_engine.DIRECTIONS, so the axes repeat per 2 directions
+AXES = np.array([0, 1, 0, 1, 2, 3, 2, 3], dtype=np.int8)
+
+KEY_BITS = 20  # the rows, columns and lengths fit in this many bits of the sort key of a record
+
+
+def _get_keys(records: np.ndarray) -> np.ndarray:
+    """ the sort key of every record, its row, column, direction and length packed in one int64 """
+    assert not len(records) or max(int(records[field].max()) for field in ('row', 'column', 'length')) \
+        < 1 << KEY_BITS, 'the rows, columns and lengths should be below %s' % (1 << KEY_BITS)
+    keys = records['row'].astype(np.int64) << 2 * KEY_BITS + 3
+    keys |= records['column'].astype(np.int64) << KEY_BITS + 3
+    keys |= records['direction'].astype(np.int64) << KEY_BITS
+    keys |= records['length'].astype(np.int64)
+    return keys  # -> np.ndarray
+
+
+class MatchRecords(MutableSet):
+    """ Compact set of the coordinates of words found on straight lines
+
+        a found word is one record of (word id, start row, start column, direction, length)
+        in a NumPy structured array, instead of a tuple of (x, y) tuples with a Python object per letter
+        the direction is the index in grid_engine.DIRECTIONS and the word id the index in words
+
+        it is a set of tuples of (x, y) coordinates to its users,
+        the tuples are only made while iterating, or kept once the set is changed with add, discard or pop
+
+        the records are sorted and every coordinates is kept once, a word of one letter has direction 0
+
+        example:
+
+            records = MatchRecords(['foo'], np.array([(0, 0, 0, 0, 3)], dtype=RECORD_DTYPE))
+            records == {((0, 0), (1, 0), (2, 0))}
+            -> True
+    """
+
+    def __init__(self, words: list, records: np.ndarray = None):
+        """
+        init
+
+        :param words:  A list of the words the word ids point to
+        :param records:  optional - A structured array of RECORD_DTYPE
+        """
+        records = np.zeros(0, dtype=RECORD_DTYPE) if records is None else np.asarray(records, dtype=RECORD_DTYPE)
+        records = records.copy()
+        records['direction'][records['length'] == 1] = 0  # one cell reads the same in every direction
+
+        # sort on the coordinates and keep the first record of the same coordinates
+        keys = _get_keys(records)
+        order = np.argsort(keys, kind='stable')
+        keys = keys[order]
+        first = np.concatenate(([True], keys[1:] != keys[:-1]))[:len(keys)]
+
+        self.words = words
+        self.records = records[order][first]
+        self._keys = keys[first]  # the sorted keys of the records, to look up coordinates and to merge
+        self._expanded = None  # the set of coordinate tuples once the set is changed
+
+    @classmethod
+    def _from_iterable(cls, iterable) -> set:
+        """ the result of set operations like  records | other  is a set """
+        return set(iterable)  # -> set
+
+    @classmethod
+    def _from_sorted(cls, words: list, records: np.ndarray, keys: np.ndarray) -> 'MatchRecords':
+        """ records that are sorted and kept once already """
+        match_records = cls.__new__(cls)
+        match_records.words, match_records.records, match_records._keys = words, records, keys
+        match_records._expanded = None
+        return match_records  # -> MatchRecords
+
+    @classmethod
+    def from_lines(cls, words: list, line_table: np.ndarray, hits) -> 'MatchRecords':
+        """
+        Create the records of words found on the lines of GridEngine.get_all_lines
+
+        :param words:  A list of the words the word ids point to
+        :param line_table:  The line table of the lines searched
+        :param hits:  An array-like of rows of (word id, line number, start position, length, 1 if read backwards)
+        :return MatchRecords:  The records of the hits
+        """
+        hits = np.asarray(hits, dtype=np.int64).reshape(-1, 5)
+        word_ids, line_numbers, start_pos, lengths, backwards = hits.T
+        lines = line_table[line_numbers]
+
+        start_pos = start_pos + backwards * (lengths - 1)  # a word read backwards starts at its last letter
+        sign = 1 - 2 * backwards
+        records = np.empty(len(hits), dtype=RECORD_DTYPE)
+        records['word'] = word_ids
+        records['row'] = lines['y'] + start_pos * lines['step_y']
+        records['column'] = lines['x'] + start_pos * lines['step_x']
+        records['direction'] = DIRECTION_INDEX[lines['step_y'] * sign + 1, lines['step_x'] * sign + 1]
+        records['length'] = lengths
+        return cls(words, records)  # -> MatchRecords
+
+    @classmethod
+    def from_coordinates(cls, words: list, hits) -> 'MatchRecords':
+        """
+        Create the records of words found on straight lines
+
+        :param words:  A list of the words the word ids point to
+        :param hits:  An iterable of (word, coordinates) like the worker processes of parallel give
+        :return MatchRecords:  The records of the hits
+        """
+        word_ids = {word: word_id for word_id, word in enumerate(words)}
+        records = []
+        for word, coordinates in hits:
+            (x, y), length = coordinates[0], len(coordinates)
+            step_x, step_y = (coordinates[1][0] - x, coordinates[1][1] - y) if length > 1 else (1, 0)
+            records.append((word_ids[word], y, x, DIRECTION_INDEX[step_y + 1, step_x + 1], length))
+        return cls(words, np.array(records, dtype=RECORD_DTYPE))  # -> MatchRecords
+
+    @property
+    def expanded(self) -> bool:
+        """ True once the set is changed and kept as coordinate tuples, the records are then out of date """
+        return self._expanded is not None  # -> bool
+
+    def _expand(self) -> set:
+        """ the set of coordinate tuples, made on the first change """
+        if self._expanded is None:
+            self._expanded = set(self._iter_records())
+        return self._expanded  # -> set
+
+    def _iter_records(self):
+        """ the coordinate tuples of the records """
+        steps = grid_engine.DIRECTIONS
+        for _, row, column, direction, length in self.records.tolist():
+            step_x, step_y = steps[direction]
+            yield tuple((column + i * step_x, row + i * step_y) for i in range(length))
+
+    def __iter__(self):
+        return iter(self._expanded) if self._expanded is not None else self._iter_records()
+
+    def __len__(self) -> int:
+        return len(self._expanded) if self._expanded is not None else len(self.records)  # -> int
+
+    def __contains__(self, coordinates) -> bool:
+        if self._expanded is not None:
+            return coordinates in self._expanded  # -> bool
+        try:
+            coordinates = tuple(tuple(map(int, coordinate)) for coordinate in coordinates)
+            (x, y), length = coordinates[0], len(coordinates)
+            step_x, step_y = (coordinates[1][0] - x, coordinates[1][1] - y) if length > 1 else (1, 0)
+            direction = int(DIRECTION_INDEX[step_y + 1, step_x + 1]) if max(abs(step_x), abs(step_y)) <= 1 else -1
+        except (TypeError, ValueError, IndexError):
+            return False  # -> bool
+        if direction < 0 or coordinates != tuple((x + i * step_x, y + i * step_y) for i in range(length)):
+            return False  # -> bool
+        if not all(0 <= value < 1 << KEY_BITS for value in (x, y, length)):
+            return False  # -> bool
+
+        # the key of the coordinates is looked up in the sorted keys of the records
+        direction = 0 if length == 1 else direction
+        key = y << 2 * KEY_BITS + 3 | x << KEY_BITS + 3 | direction << KEY_BITS | length
+        index = int(np.searchsorted(self._keys, key))
+        return index < len(self._keys) and int(self._keys[index]) == key  # -> bool
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, MatchRecords) and not self.expanded and not other.expanded:  # without the tuples
+            return np.array_equal(self._keys, other._keys)  # -> bool
+        return super().__eq__(other)  # -> bool
+
+    __hash__ = None  # a set that can change
+
+    def add(self, coordinates: tuple):
+        self._expand().add(coordinates)
+
+    def discard(self, coordinates: tuple):
+        self._expand().discard(coordinates)
+
+    # the methods of set that are not in MutableSet, so the records can be used where a set was returned before
+    def copy(self) -> 'MatchRecords':
+        if self._expanded is not None:
+            match_records = self._from_sorted(self.words, self.records, self._keys)
+            match_records._expanded = set(self._expanded)
+            return match_records  # -> MatchRecords
+        return self._from_sorted(self.words, self.records.copy(), self._keys.copy())  # -> MatchRecords
+
+    def union(self, *others) -> set:
+        return set(self).union(*others)  # -> set
+
+    def intersection(self, *others) -> set:
+        return set(self).intersection(*others)  # -> set
+
+    def difference(self, *others) -> set:
+        return set(self).difference(*others)  # -> set
+
+    def symmetric_difference(self, other) -> set:
+        return set(self).symmetric_difference(other)  # -> set
+
+    def issubset(self, other) -> bool:
+        return set(self).issubset(other)  # -> bool
+
+    def issuperset(self, other) -> bool:
+        return all(coordinates in self for coordinates in other)  # -> bool
+
+    def update(self, *others):
+        self._expand().update(*others)
+
+    def intersection_update(self, *others):
+        self._expand().intersection_update(*others)
+
+    def difference_update(self, *others):
+        self._expand().difference_update(*others)
+
+    def symmetric_difference_update(self, other):
+        self._expand().symmetric_difference_update(other)
+
+    def __repr__(self) -> str:
+        return '%s(%s records of %s words)' % (type(self).__name__, len(self), len(self.words))  # -> str
+
+    def get_found_words(self) -> set:
+        """
+        Get the words of the records
+
+        :return set:  The words that have at least one record
+        """
+        assert not self.expanded, 'the records are changed with add or discard'
+        word_ids = np.flatnonzero(np.bincount(self.records['word'], minlength=len(self.words)))
+        return {self.words[word_id] for word_id in word_ids.tolist()}  # -> set
+
+    def get_coverage_mask(self, shape: tuple) -> np.ndarray:
+        """
+        Mark the cells of the records, like GridEngine.get_coverage_mask without making the coordinate tuples
+
+        :param shape:  The shape of the grid, (height, width)
+        :return numpy.ndarray:  A boolean array of the shape, True on the cells of the records
+        """
+        mask = np.zeros(shape, dtype=bool)
+        if self._expanded is not None:
+            for coordinates in self._expanded:
+                for x, y in coordinates:
+                    mask[y, x] = True
+            return mask  # -> np.ndarray
+
+        # every letter of every record, its record and its position in the record
+        lengths = self.records['length'].astype(np.intp)
+        index = np.repeat(np.arange(len(lengths)), lengths)
+        offsets = np.arange(len(index)) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+        steps = STEPS[self.records['direction']][index]
+        mask[self.records['row'][index] + offsets * steps[:, 1],
+             self.records['column'][index] + offsets * steps[:, 0]] = True
+        return mask  # -> np.ndarray
+
+    def get_line_mask(self, cells) -> np.ndarray:
+        """
+        Find the records on the lines through the cells, read in their direction or the reverse
+
+        :param cells:  An iterable of (x, y) coordinates
+        :return numpy.ndarray:  A boolean array, True for the records on a line through one of the cells
+        """
+        assert not self.expanded, 'the records are changed with add or discard'
+        # a line is the row, the column, column - row for a diagonal and column + row for an anti-diagonal
+        axes = AXES[self.records['direction']]
+        rows, columns = self.records['row'].astype(np.int64), self.records['column'].astype(np.int64)
+        values = np.where(axes == 0, rows, np.where(axes == 1, columns, columns + np.where(axes == 2, -rows, rows)))
+        lines = axes.astype(np.int64) << KEY_BITS + 2 | values + (1 << KEY_BITS)
+
+        cell_lines = [axis << KEY_BITS + 2 | value + (1 << KEY_BITS)
+                      for x, y in cells for axis, value in enumerate((y, x, x - y, x + y))]
+        return np.isin(lines, cell_lines)  # -> np.ndarray
+
+    def merge(self, other: 'MatchRecords', remove: np.ndarray = None) -> 'MatchRecords':
+        """
+        Combine the records of two searches of the same words
+
+        :param other:  The records to add, with the same words
+        :param remove:  optional - A boolean array, True for the records of this one to leave out
+        :return MatchRecords:  New records
+        """
+        assert not self.expanded and not other.expanded, 'the records are changed with add or discard'
+        assert other.words is self.words or other.words == self.words, 'the records should be of the same words'
+        records, keys = (self.records, self._keys) if remove is None else (self.records[~remove], self._keys[~remove])
+
+        # the new records are put in their place in the sorted records, without sorting all of them again
+        positions = np.searchsorted(keys, other._keys)
+        new = np.ones(len(positions), dtype=bool)
+        if len(keys):
+            new = keys[np.minimum(positions, len(keys) - 1)] != other._keys
+        positions = positions[new]
+        return self._from_sorted(self.words, np.insert(records, positions, other.records[new]),
+                                 np.insert(keys, positions, other._keys[new]))  # -> MatchRecords
@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import shared_memory
+
+import numpy as np
+
+try:
+    from . import aho_corasick, grid_engine, word_search_solver
+except ImportError:  # run as a script from within the word_search_puzzle directory
+    import aho_corasick
+    import grid_engine
+    import word_search_solver
+
+TILE_SIZE = 512  # width and height of a tile without its halo
+METHODS = ('index', 'aho-corasick')  # the methods of WordSearchPuzzle.METHODS that search the lines in parts
+
+_attached = {}  # name -> (SharedMemory, array) of the shared memory a worker process attached to
+_worker_lines = {}  # name -> list_of_strings decoded once per worker process from shared memory
+_worker_search = {}  # the words and the method of the search, set once per worker process by _init_worker
+
+
+class SharedArray:
+    """ A numpy array in shared memory
+
+        the array is copied into the shared memory once,
+        worker processes attach to it by the spec instead of getting a pickled copy
+
+        example:
+
+            with SharedArray(grid.grid) as shared_grid:
+                executor.submit(function, shared_grid.spec)
+    """
+
+    def __init__(self, array: np.ndarray):
+        """
+        init
+
+        :param array:  The array to share, like the grid of a grid_engine.GridEngine
+        """
+        self._shared_memory = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+        shared_array = np.ndarray(array.shape, dtype=array.dtype, buffer=self._shared_memory.buf)
+        shared_array[:] = array
+        self.spec = (self._shared_memory.name, array.shape, array.dtype)
+
+    def close(self):
+        """ free the shared memory, the worker processes should be done with it """
+        self._shared_memory.close()
+        self._shared_memory.unlink()
+
+    def __enter__(self) -> 'SharedArray':
+        return self  # -> SharedArray
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def _attach(*specs) -> list:
+    """
+    Attach to the shared memory of SharedArrays once per worker process and get the arrays in it
+    The shared memory of earlier searches is let go of
+
+    :param specs:  The specs of SharedArrays
+    :return list:  The arrays, in the order of the specs
+    """
+    names = [name for name, _, _ in specs]
+    for name in [name for name in _attached if name not in names]:
+        _worker_lines.pop(name, None)
+        _attached.pop(name)[0].close()
+
+    for name, shape, dtype in specs:
+        if name not in _attached:
+            shared = shared_memory.SharedMemory(name=name)
+            _attached[name] = (shared, np.ndarray(shape, dtype=dtype, buffer=shared.buf))
+    return [_attached[name][1] for name in names]  # -> list
+
+
+def _init_worker(words: list, method: str):
+    """ keep the words in the worker, the Aho-Corasick automaton is made once per worker """
+    _worker_search['words'] = words
+    _worker_search['method'] = method
+    if method == 'aho-corasick':
+        _worker_search['automaton'] = aho_corasick.AhoCorasick(words)
+
+
+def _search_lines(list_of_strings: list):
+    """ search the words of the worker in the lines with the method of the worker """
+    if _worker_search['method'] == 'aho-corasick':
+        return _worker_search['automaton'].search_lines(list_of_strings)
+    return word_search_solver.WordSearchPuzzle._search_lines_with_index(_worker_search['words'], list_of_strings)
+
+
+def get_tiles(shape: tuple, tile_size: int = TILE_SIZE) -> list:
+    """
+    Split a grid in tiles
+
+    :param shape:  The height and width of the grid
+    :param tile_size:  The width and height of a tile, the tiles on the bottom and right side can be smaller
+    :return list:  A list of (first row, end row, first column, end column) tuples
+    """
+    assert int(tile_size) > 0, 'tile_size should be positive, given: %s' % tile_size
+    height, width = shape
+    return [(y, min(y + tile_size, height), x, min(x + tile_size, width))
+            for y in range(0, height, tile_size) for x in range(0, width, tile_size)]  # -> list
+
+
+def _search_tile(spec: tuple, tile: tuple, halo: int) -> list:
+    """
+    Search the words that start in a tile
+    The tile is searched together with a halo of cells around it, so words that leave the tile are found whole.
+    Only the words starting in the tile itself are kept, a word starting in the halo belongs to another tile.
+
+    :param spec:  The spec of a SharedArray of the grid
+    :param tile:  A tuple of get_tiles
+    :param halo:  The amount of cells around the tile to search in, the length of the longest word - 1
+    :return list:  (word, coordinates) for every occurrence of every word starting in the tile
+    """
+    array, = _attach(spec)
+    first_row, end_row, first_column, end_column = tile
+    top, left = max(first_row - halo, 0), max(first_column - halo, 0)
+    region = grid_engine.GridEngine(array[top:end_row + halo, left:end_column + halo])
+    list_of_strings, line_table = region.get_all_lines()
+
+    found = []
+    for word, line_number, start_pos in _search_lines(list_of_strings):
+        coordinates = region.get_coordinates(line_table[line_number], start_pos, len(word))
+        x, y = coordinates[0][0] + left, coordinates[0][1] + top
+        if first_row <= y < end_row and first_column <= x < end_column:
+            found.append((word, tuple((x + left, y + top) for x, y in coordinates)))
+    return found  # -> list
+
+
+def search_tiled(grid: grid_engine.GridEngine, words: list, method: str = 'aho-corasick',
+                 tile_size: int = TILE_SIZE, max_workers: int = None):
+    """
+    Search the words in the tiles of the grid over a pool of worker processes
+    Every occurrence is found once, by the tile it starts in, so the merged hits are the same
+    as the hits of a search over the whole grid
+
+    :param grid:  The grid of the puzzle
+    :param words:  A list of words to search for
+    :param method:  How the tiles are searched, one of METHODS
+    :param tile_size:  The width and height of a tile
+    :param max_workers:  The amount of worker processes, None uses the amount of cores
+    :return generator:  (word, coordinates) for every occurrence of every word, in the order the tiles are done
+    """
+    assert method in METHODS, 'method should be one of %s, given: %s' % (METHODS, method)
+    words = [word for word in words if word]
+    if not words:
+        return
+    halo = max(len(word) for word in words) - 1
+
+    with SharedArray(grid.grid) as shared_grid, \
+            ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker,
+                                initargs=(words, method)) as executor:
+        futures = [executor.submit(_search_tile, shared_grid.spec, tile, halo)
+                   for tile in get_tiles(grid.shape, tile_size)]
+        for future in as_completed(futures):
+            for hit in future.result():
+                yield hit
+
+
+def encode_lines(grid: grid_engine.GridEngine) -> tuple:
+    """
+    Encode the lines of all 8 directions of the grid in one array
+
+    :param grid:  The grid of the puzzle
+    :return tuple:  An array of the code points of all the lines after each other and the line table
+    """
+    list_of_strings, line_table = grid.get_all_lines()
+    if grid.grid.dtype == np.uint8:
+        codes = np.frombuffer(''.join(list_of_strings).encode('latin-1'), dtype=np.uint8)
+    else:
+        codes = np.frombuffer(''.join(list_of_strings).encode('utf-32-le'), dtype='<u4')
+    return codes, line_table  # -> tuple
+
+
+def _get_lines(codes_spec: tuple, table_spec: tuple) -> tuple:
+    """
+    Get the lines of the shared memory of encode_lines
+    The strings are decoded once per worker process, a str can not be made on top of shared memory
+
+    :return tuple:  The list of strings and the line table
+    """
+    codes, line_table = _attach(codes_spec, table_spec)
+    name = codes_spec[0]
+    if name not in _worker_lines:
+        if codes.dtype == np.uint8:
+            text = codes.tobytes().decode('latin-1')
+        else:
+            text = codes.tobytes().decode('utf-32-le')
+        ends = np.cumsum(line_table['length']).tolist()
+        _worker_lines[name] = [text[start:end] for start, end in zip([0] + ends[:-1], ends)]
+    return _worker_lines[name], line_table  # -> tuple
+
+
+def _search_words(codes_spec: tuple, table_spec: tuple, words: list, method: str) -> list:
+    """
+    Search a chunk of the words in the lines in shared memory
+
+    :param codes_spec:  The spec of a SharedArray of the code points of encode_lines
+    :param table_spec:  The spec of a SharedArray of the line table of encode_lines
+    :param words:  A list of words to search for
+    :param method:  How the lines are searched, one of WordSearchPuzzle.METHODS
+    :return list:  (word, coordinates) for every occurrence of every word
+    """
+    list_of_strings, line_table = _get_lines(codes_spec, table_spec)
+    if method == 'aho-corasick':
+        hits = aho_corasick.AhoCorasick(words).search_lines(list_of_strings)
+    else:
+        hits = word_search_solver.WordSearchPuzzle._search_lines_with_index(words, list_of_strings)
+    return [(word, grid_engine.GridEngine.get_coordinates(line_table[line_number], start_pos, len(word)))
+            for word, line_number, start_pos in hits]  # -> list
+
+
+def search_words(grid: grid_engine.GridEngine, words: list, method: str = 'index',
+                 max_workers: int = None, chunks: int = None):
+    """
+    Search chunks of the words over a pool of worker processes
+    The lines of the grid are put in shared memory once, every worker attaches to them
+
+    :param grid:  The grid of the puzzle
+    :param words:  A list of words to search for
+    :param method:  How the chunks are searched, one of METHODS
+    :param max_workers:  The amount of worker processes, None uses the amount of cores
+    :param chunks:  The amount of chunks the words are split in, 4 per worker by default
+    :return generator:  (word, coordinates) for every occurrence of every word, in the order the chunks are done
+    """
+    assert method in METHODS, 'method should be one of %s, given: %s' % (METHODS, method)
+    words = [word for word in words if word]
+    if not words:
+        return
+    max_workers = max_workers or os.cpu_count() or 1
+    chunks = min(int(chunks or 4 * max_workers), len(words))
+    assert chunks > 0, 'chunks should be positive, given: %s' % chunks
+
+    codes, line_table = encode_lines(grid)
+    with SharedArray(codes) as shared_codes, SharedArray(line_table) as shared_table, \
+            ProcessPoolExecutor(max_workers=max_workers) as executor:
+        # every chunk gets words of all lengths, so the chunks take about as long
+        futures = [executor.submit(_search_words, shared_codes.spec, shared_table.spec, words[number::chunks], method)
+                   for number in range(chunks)]
+        for future in as_completed(futures):
+            for hit in future.result():
+                yield hit
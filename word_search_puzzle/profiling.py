@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+
+import sys
+import json
+import time
+import contextlib
+
+COUNTERS = ('lines_scanned', 'candidate_hits', 'verified_hits', 'words_not_found')
+
+
+class Profile:
+    """ Wall time and allocation per phase of a solve, and counters of the search
+
+        a phase is measured with the phase context manager,
+        the time and the peak of the memory allocated in it are added to phases
+        the counters are raised with count
+
+        when a hook is given it is called with the name and the record of every phase that ends
+
+        example:
+
+            profile = Profile()
+            ws = WordSearchPuzzle(puzzle_file, word_set_file, profile=profile)
+            profile.phases['search']
+            -> {'calls': 1, 'seconds': 0.0012, 'peak_bytes': 20480}
+            profile.counters['candidate_hits']
+            -> 35
+    """
+
+    def __init__(self, trace_memory: bool = True, hook=None, enabled: bool = True):
+        """
+        init
+
+        :param trace_memory:  Measure the peak of the allocated memory per phase with tracemalloc
+        :param hook:  optional - A callable called with (phase name, phase record) when a phase ends
+        :param enabled:  If False nothing is measured, the phases and counters stay empty
+        """
+        assert hook is None or callable(hook), 'hook should be callable, given: %s' % hook
+        self.trace_memory = bool(trace_memory)
+        self.hook = hook
+        self.enabled = bool(enabled)
+        self.phases = {}  # phase name -> {'calls': int, 'seconds': float, 'peak_bytes': int}
+        self.counters = dict.fromkeys(COUNTERS, 0)
+
+    @contextlib.contextmanager
+    def phase(self, name: str):
+        """
+        Measure the wall time and the peak of the memory allocated in the with block
+        Phases are not nested, the peak of the outer phase would be reset by the inner phase
+
+        :param name:  The name of the phase, the measurements of a phase with the same name are added
+        """
+        if not self.enabled:
+            yield
+            return
+
+        started_tracing = False
+        start_memory = 0
+        if self.trace_memory:
+            import tracemalloc  # only when the memory is measured, a disabled profile is used on every solve
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                started_tracing = True
+            elif hasattr(tracemalloc, 'reset_peak'):  # traced by someone else, measure from here
+                tracemalloc.reset_peak()
+                start_memory = tracemalloc.get_traced_memory()[0]
+
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - start
+            peak_bytes = 0
+            if self.trace_memory:
+                peak_bytes = max(tracemalloc.get_traced_memory()[1] - start_memory, 0)
+                if started_tracing:
+                    tracemalloc.stop()
+
+            record = self.phases.setdefault(name, {'calls': 0, 'seconds': 0.0, 'peak_bytes': 0})
+            record['calls'] += 1
+            record['seconds'] += seconds
+            record['peak_bytes'] = max(record['peak_bytes'], peak_bytes)
+            if self.hook is not None:
+                self.hook(name, dict(record))
+
+    def count(self, name: str, amount: int = 1):
+        """ raise a counter """
+        if self.enabled:
+            self.counters[name] = self.counters.get(name, 0) + int(amount)
+
+    def reset(self):
+        """ forget all the measurements """
+        self.phases.clear()
+        self.counters = dict.fromkeys(COUNTERS, 0)
+
+    def to_dict(self) -> dict:
+        """ the measurements as a JSON serialisable dict """
+        return {'phases': {name: dict(record) for name, record in self.phases.items()},
+                'counters': dict(self.counters)}  # -> dict
+
+    def report(self) -> str:
+        """
+        The measurements as a table
+
+        :return str:  A line per phase and per counter
+        """
+        lines = ['%-20s %6s %12s %14s' % ('phase', 'calls', 'seconds', 'peak bytes')]
+        for name, record in self.phases.items():
+            lines.append('%-20s %6d %12.6f %14d' % (name, record['calls'], record['seconds'], record['peak_bytes']))
+        lines.append('%-20s %6s %12.6f' % ('total', '', sum(record['seconds'] for record in self.phases.values())))
+        lines.append('')
+        lines.extend('%-20s %6d' % (name, value) for name, value in self.counters.items())
+        return '\n'.join(lines) + '\n'  # -> str
+
+    def write(self, output: str = None):
+        """
+        Write the measurements
+
+        :param output:  A file path, the measurements are written as JSON to it
+                        If None is given the report is written to stderr
+        """
+        if output is None:
+            sys.stderr.write(self.report())
+            return
+        with open(output, 'w') as open_file:
+            json.dump(self.to_dict(), open_file, indent=2)
+
+
+DISABLED = Profile(trace_memory=False, enabled=False)  # used when no profile is given, measures nothing
@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+
+import io
+import os
+import random
+import string
+import contextlib
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+try:
+    from . import grid_engine, word_search_solver
+    from .batch import PUZZLE_SUFFIX, SET_SUFFIX
+except ImportError:  # run as a script from within the word_search_puzzle directory
+    import grid_engine
+    import word_search_solver
+    from batch import PUZZLE_SUFFIX, SET_SUFFIX
+
+# the directions a word is placed along, the other 4 directions are these with the word reversed
+AXES = grid_engine.FORWARD_DIRECTIONS
+
+
+def _count_bits(bits: int) -> int:
+    """ the amount of set bits of an int """
+    return bin(bits).count('1')  # -> int
+
+
+class PuzzleGenerator:
+    """ Generate word search puzzles that the solver can solve
+
+        the words are placed in all 8 directions, longest first, on random free places
+        a word can cross the words placed before it on up to max_overlap cells with the same letter
+
+        the cells are numbered row by row and kept as bits of a Python int:
+            one bitset of the occupied cells and one bitset per letter
+        for every axis and word length the bitmask of a word at the first possible place is made once,
+        the bitmask of a word on another place is that mask shifted by the number of the first cell
+        so if a place is free, or which letters are crossed, is a few ands on the bitsets
+
+        the cells that are left are filled with random letters of the alphabet
+        or with the letters of a hidden message, in the order get_left_over_letters reads them,
+        the cells after the message stay empty
+
+        every puzzle is solved with the WordSearchPuzzle solver before it is returned,
+        a puzzle where a word is not found or where the left over letters are not the message is made again
+
+        example:
+
+            generator = PuzzleGenerator(10, 10)
+            grid, placements = generator.generate({'foo', 'bar'}, message='hidden', rng=random.Random(0))
+    """
+
+    def __init__(self, height: int, width: int, max_overlap: int = 2, alphabet: str = string.ascii_lowercase,
+                 attempts: int = 20):
+        """
+        init
+
+        :param height:  The amount of rows of the puzzles
+        :param width:  The amount of columns of the puzzles
+        :param max_overlap:  The amount of cells a word can share with the words placed before it, 0 for none
+        :param alphabet:  The letters the cells without a word are filled with when there is no message
+        :param attempts:  The amount of times a puzzle is made again before giving up
+        """
+        assert int(height) > 0 and int(width) > 0, 'the size should be positive, given: %s x %s' % (height, width)
+        assert int(max_overlap) >= 0, 'max_overlap should not be negative, given: %s' % max_overlap
+        assert alphabet, 'an alphabet is needed to fill the puzzle'
+        self.height, self.width = int(height), int(width)
+        self.max_overlap = int(max_overlap)
+        self.alphabet = str(alphabet).lower()
+        self.attempts = max(int(attempts), 1)
+        self._places = {}  # (axis, length) -> the result of get_places
+
+    def get_places(self, axis: tuple, length: int) -> tuple:
+        """
+        Get the bitmask of a word along the axis and the shifts that move it to every place it fits
+        The masks are made once per axis and length
+
+        :param axis:  A (column step, row step) tuple out of AXES
+        :param length:  The length of the word
+        :return tuple:  The bitmask of the cells of the first place, the bits of the letters in the order of the word
+                        and a list of shifts, the first cell of every place
+        """
+        key = (axis, length)
+        if key not in self._places:
+            assert axis in AXES, 'given: %s' % str(axis)
+            step_x, step_y = axis
+            height, width = self.height, self.width
+            first_x = length - 1 if step_x < 0 else 0  # a word to the lower left starts on the right
+
+            bits = [i * step_y * width + first_x + i * step_x for i in range(length)]
+            mask = sum(1 << bit for bit in bits)
+
+            # the places where the word fits in the grid, by the number of the first cell of the mask
+            last_x = width - (length if step_x else 1)
+            last_y = height - (length if step_y else 1)
+            shifts = [y * width + x for y in range(last_y + 1) for x in range(last_x + 1)]
+            self._places[key] = (mask, bits, shifts)
+        return self._places[key]  # -> tuple
+
+    def _get_coordinates(self, axis: tuple, length: int, shift: int) -> tuple:
+        """ the (x, y) coordinates of a word along the axis at the place of the shift """
+        step_x, step_y = axis
+        x, y = shift % self.width + (length - 1 if step_x < 0 else 0), shift // self.width
+        return tuple((x + i * step_x, y + i * step_y) for i in range(length))  # -> tuple
+
+    def _find_place(self, word: str, occupied: int, letters: dict, rng: random.Random) -> tuple:
+        """
+        Find a random place for the word in a random direction
+
+        :param word:  The word to place
+        :param occupied:  The bitset of the occupied cells
+        :param letters:  letter -> bitset of the cells with that letter
+        :param rng:  The random.Random used for the place and direction
+        :return tuple:  The direction, the shift and letter -> bitmask of the letter in the word at the first place,
+                        None if the word does not fit anywhere
+        """
+        length = len(word)
+        directions = list(grid_engine.DIRECTIONS)
+        rng.shuffle(directions)
+        for direction in directions:
+            reverse = direction not in AXES  # read the other way along the axis
+            axis = (-direction[0], -direction[1]) if reverse else direction
+            mask, bits, shifts = self.get_places(axis, length)
+            if not shifts:
+                continue
+
+            patterns = {}
+            for bit, letter in zip(bits, word[::-1] if reverse else word):
+                patterns[letter] = patterns.get(letter, 0) | 1 << bit
+
+            first = rng.randrange(len(shifts))  # try every place once, from a random place on
+            for shift in shifts[first:] + shifts[:first]:
+                crossed = occupied & (mask << shift)
+                if crossed:
+                    overlap = _count_bits(crossed)
+                    if overlap > self.max_overlap or overlap == length:  # a word is not hidden in another
+                        continue
+                    same = 0  # the crossed cells with the same letter as the word
+                    for letter, pattern in patterns.items():
+                        same |= letters.get(letter, 0) & (pattern << shift)
+                    if crossed & ~same:
+                        continue
+                return direction, shift, patterns  # -> tuple
+        return None  # -> None
+
+    def place_words(self, words, rng: random.Random) -> dict:
+        """
+        Place the words on random places in random directions, the longest words first
+
+        :param words:  An iterable of words
+        :param rng:  The random.Random used for the places and directions
+        :return dict:  word -> coordinates of the letters, None if a word did not fit
+        """
+        occupied = 0
+        letters = {}  # letter -> bitset of the cells with that letter
+        placements = {}
+        for word in sorted(words, key=lambda word: (-len(word), word)):
+            place = self._find_place(word, occupied, letters, rng)
+            if place is None:
+                return None  # -> None
+
+            direction, shift, patterns = place
+            for letter, pattern in patterns.items():
+                letters[letter] = letters.get(letter, 0) | pattern << shift
+                occupied |= pattern << shift
+            if direction in AXES:
+                placements[word] = self._get_coordinates(direction, len(word), shift)
+            else:  # the word is read back along the axis
+                placements[word] = self._get_coordinates((-direction[0], -direction[1]), len(word), shift)[::-1]
+        return placements  # -> dict
+
+    def _make_grid(self, placements: dict, message: str, rng: random.Random) -> grid_engine.GridEngine:
+        """ put the words in a grid and fill the other cells, None if the message does not fit """
+        grid = np.full((self.height, self.width), grid_engine.BLANK, dtype='<u4')
+        for word, coordinates in placements.items():
+            coordinates = np.array(coordinates, dtype=np.intp)
+            grid[coordinates[:, 1], coordinates[:, 0]] = np.frombuffer(word.encode('utf-32-le'), dtype='<u4')
+
+        free = np.flatnonzero(grid.ravel() == grid_engine.BLANK)  # row by row, like get_left_over_letters
+        if message is None:
+            filler = ''.join(rng.choice(self.alphabet) for _ in range(len(free)))
+        elif len(message) <= len(free):
+            filler = message
+        else:
+            return None  # -> None
+        grid.ravel()[free[:len(filler)]] = np.frombuffer(filler.encode('utf-32-le'), dtype='<u4')
+        return grid_engine.GridEngine(grid)  # -> grid_engine.GridEngine
+
+    def verify(self, grid: grid_engine.GridEngine, words, message: str = None) -> bool:
+        """
+        Solve the puzzle and check that every word is found and that the left over letters are the message
+
+        :param grid:  The grid of the puzzle
+        :param words:  An iterable of the words in the puzzle
+        :param message:  optional - The hidden message, without white space
+        :return bool:  True if the solver solves the puzzle like it was made
+        """
+        with contextlib.redirect_stdout(io.StringIO()):  # the words not found are printed
+            ws = word_search_solver.WordSearchPuzzle(grid, get_solution=False, engine='numpy')
+            ws.find_words_in_puzzle(set(words), method='aho-corasick')
+        if ws.words_not_found:
+            return False  # -> bool
+        return message is None or ws.get_left_over_letters() == message  # -> bool
+
+    def generate(self, words, message: str = None, rng: random.Random = None) -> tuple:
+        """
+        Generate a puzzle of the words
+
+        :param words:  An iterable of words, they are made lowercase
+        :param message:  optional - A message hidden in the left over letters, white space is left out
+        :param rng:  optional - The random.Random of the puzzle, for puzzles that can be made again
+        :return tuple:  The grid_engine.GridEngine of the puzzle and a dict of word -> coordinates
+        """
+        words = {str(word).strip().lower() for word in words} - {''}
+        assert all(len(word) <= max(self.height, self.width) for word in words), \
+            'a word is longer than the puzzle is wide or high'
+        message = ''.join(str(message).lower().split()) if message is not None else None
+        rng = rng if rng is not None else random.Random()
+
+        for _ in range(self.attempts):
+            placements = self.place_words(words, rng)
+            if placements is None:
+                continue
+            grid = self._make_grid(placements, message, rng)
+            if grid is not None and self.verify(grid, words, message):
+                return grid, placements  # -> tuple
+        raise AssertionError('the words do not fit in a %s x %s puzzle in %s attempts'
+                             % (self.height, self.width, self.attempts))
+
+
+def write_puzzle(grid: grid_engine.GridEngine, words, puzzle_file: str, set_file: str):
+    """
+    Write a puzzle and its words in the files the solver reads
+
+    :param grid:  The grid of the puzzle
+    :param words:  An iterable of the words of the puzzle
+    :param puzzle_file:  The path of the puzzle file, a row per line
+    :param set_file:  The path of the word set file, a word per line
+    """
+    rows = (grid._to_string(row) for row in grid.grid)
+    with open(puzzle_file, 'w', encoding='utf-8') as open_file:
+        open_file.write(''.join(row + '\n' for row in rows))
+    with open(set_file, 'w', encoding='utf-8') as open_file:
+        open_file.write(''.join(word + '\n' for word in sorted(words)))
+
+
+def _generate_files(job: tuple) -> tuple:
+    """ generate and write one puzzle of a batch, in a worker process """
+    number, seed, words, word_count, message, output_dir, options = job
+    rng = random.Random('%s:%s' % (seed, number))  # the same puzzle for the same seed and number
+    if word_count is not None:
+        words = rng.sample(words, min(int(word_count), len(words)))
+
+    grid, placements = PuzzleGenerator(**options).generate(words, message, rng)
+    name = os.path.join(output_dir, 'generated_%06d' % number)
+    write_puzzle(grid, placements, name + PUZZLE_SUFFIX, name + SET_SUFFIX)
+    return name + PUZZLE_SUFFIX, name + SET_SUFFIX  # -> tuple
+
+
+def generate_batch(words, count: int, output_dir: str, seed: int = 0, word_count: int = None,
+                   message: str = None, max_workers: int = None, chunksize: int = 1, **options):
+    """
+    Generate many puzzles over a pool of worker processes
+    The files are named like batch.find_puzzle_pairs expects them, the same seed gives the same puzzles
+
+    :param words:  An iterable of words to make the puzzles of
+    :param count:  The amount of puzzles
+    :param output_dir:  The directory the puzzle and word set files are written to
+    :param seed:  The seed of the batch, every puzzle has its own random.Random made of the seed and its number
+    :param word_count:  optional - The amount of words of every puzzle, drawn from the words
+    :param message:  optional - A message hidden in the left over letters of every puzzle
+    :param max_workers:  The amount of worker processes, None uses the amount of cores
+    :param chunksize:  The amount of puzzles sent to a worker at once
+    :param options:  height, width, max_overlap, alphabet and attempts of PuzzleGenerator
+    :return generator:  (puzzle file path, word set file path) of every puzzle, in the order of the numbers
+    """
+    output_dir = os.path.realpath(str(output_dir))
+    assert os.path.isdir(output_dir), 'given: %s' % output_dir
+    words = sorted({str(word).strip().lower() for word in words} - {''})
+
+    jobs = ((number, seed, words, word_count, message, output_dir, options) for number in range(int(count)))
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        for pair in executor.map(_generate_files, jobs, chunksize=max(int(chunksize), 1)):
+            yield pair
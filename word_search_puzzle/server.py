@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+
+import os
+import re
+import json
+import stat
+import pickle
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    from . import aho_corasick, compact_dictionary, grid_engine, trie, word_list
+except ImportError:  # run as a script from within the word_search_puzzle directory
+    import aho_corasick
+    import compact_dictionary
+    import grid_engine
+    import trie
+    import word_list
+
+MAX_CONCURRENCY = 4  # scans running at the same time
+BATCH_DELAY = 0.002  # seconds a scan waits for more queries of the same puzzle
+MAX_LINE_SIZE = 64 * 1024 * 1024  # bytes of a request
+
+
+def parse_address(address: str) -> tuple:
+    """
+    Parse the address of the server
+
+    :param address:  host:port for TCP, anything else is the path of a Unix socket
+    :return tuple:  ('tcp', host, port) or ('unix', path)
+    """
+    match = re.match(r'^\[?([^\[\]/]*?)\]?:(\d+)$', str(address))
+    if match is not None:
+        return 'tcp', match.group(1) or '127.0.0.1', int(match.group(2))  # -> tuple
+    return 'unix', os.path.realpath(str(address))  # -> tuple
+
+
+class _PuzzleEntry:
+    """ a registered puzzle, its lines are made once and the queries waiting for a scan """
+
+    def __init__(self, puzzle_file: str):
+        self.puzzle_file = puzzle_file
+        self.grid = grid_engine.GridEngine.from_file(puzzle_file)
+        self.grid.get_all_lines()  # warm
+        self.pending = []  # (words, future) of the queries waiting for the next scan
+        self.batch_task = None  # the task running the scans while there are queries
+        self.scans = 0  # amount of scans, less than the amount of queries when queries are batched
+
+
+class SolverServer:
+    """ Long-lived solver of registered puzzles
+
+        puzzles and dictionaries are registered once at the start and kept parsed,
+        clients only query them and never name a file the server opens
+        clients send a JSON object per line and get a JSON object per line back
+
+            {"op": "solve", "puzzle": "apple_word_search_puzzle", "words": ["apple", "ipad"]}
+            -> {"ok": true, "found": {"apple": [[[0, 1], [1, 1], ...]], ...}, "words_not_found": []}
+
+            {"op": "lookup", "puzzle": "apple_word_search_puzzle", "word": "apple"}
+            -> {"ok": true, "found": {"apple": [[[0, 1], [1, 1], ...]]}, "words_not_found": []}
+
+            {"op": "discover", "puzzle": "apple_word_search_puzzle", "dictionary": "dictionary", "min_length": 4}
+            {"op": "list"}
+
+        queries of the same puzzle that arrive while a scan is waiting or running
+        are searched together in the next single scan of the lines
+        at most max_concurrency scans run at the same time
+
+        example:
+
+            server = SolverServer()
+            server.register_puzzle('puzzles/apple_word_search_puzzle.txt')
+            server.register_dictionary('NL_dictionary/dictionary.wsd')
+            asyncio.run(server.serve('/tmp/word_search.sock'))
+    """
+
+    def __init__(self, max_concurrency: int = MAX_CONCURRENCY, batch_delay: float = BATCH_DELAY):
+        """
+        init
+
+        :param max_concurrency:  The amount of scans running at the same time
+        :param batch_delay:  The seconds a scan waits for more queries of the same puzzle
+        """
+        assert int(max_concurrency) > 0, 'max_concurrency should be positive, given: %s' % max_concurrency
+        self.max_concurrency = int(max_concurrency)
+        self.batch_delay = float(batch_delay)
+        self.puzzles = {}  # name -> _PuzzleEntry
+        self.dictionaries = {}  # name -> trie.Trie or compact_dictionary.CompactDictionary
+        self._executor = ThreadPoolExecutor(max_workers=self.max_concurrency)
+        self._semaphore = None  # made in the event loop of serve
+
+    @staticmethod
+    def _get_name(file_path: str) -> str:
+        """ the name of a registered file, the file name without extension """
+        return os.path.splitext(os.path.basename(file_path))[0]  # -> str
+
+    def register_puzzle(self, puzzle_file: str, name: str = None) -> str:
+        """
+        Parse a puzzle and keep it
+
+        :param puzzle_file:  A path to the word search puzzle file
+        :param name:  optional - The name of the puzzle in the queries, the file name by default
+        :return str:  The name of the puzzle
+        """
+        puzzle_file = os.path.realpath(str(puzzle_file))
+        assert os.path.isfile(puzzle_file), 'given: %s' % puzzle_file
+        name = str(name) if name else self._get_name(puzzle_file)
+        self.puzzles[name] = _PuzzleEntry(puzzle_file)
+        return name  # -> str
+
+    def register_dictionary(self, dictionary_file: str, name: str = None) -> str:
+        """
+        Load a dictionary and keep it
+
+        :param dictionary_file:  A compact dictionary, a pickled set or a word file
+        :param name:  optional - The name of the dictionary in the queries, the file name by default
+        :return str:  The name of the dictionary
+        """
+        dictionary_file = os.path.realpath(str(dictionary_file))
+        assert os.path.isfile(dictionary_file), 'given: %s' % dictionary_file
+        name = str(name) if name else self._get_name(dictionary_file)
+
+        if compact_dictionary.is_compact_dictionary(dictionary_file):  # memory mapped, not loaded
+            dictionary = compact_dictionary.load_compact_dictionary(dictionary_file)
+        elif dictionary_file.endswith('.pkl'):  # a pickled set, like the one of NL_dictionary/pickler.py
+            with open(dictionary_file, 'rb') as pickle_out:
+                dictionary = trie.Trie(str(word).lower() for word in pickle.load(pickle_out))
+        else:  # a word file, read in chunks
+            dictionary = trie.Trie(word_list.iter_words(dictionary_file))
+
+        old_dictionary = self.dictionaries.get(name)
+        if isinstance(old_dictionary, compact_dictionary.CompactDictionary):
+            old_dictionary.close()
+        self.dictionaries[name] = dictionary
+        return name  # -> str
+
+    def _get_puzzle(self, message: dict) -> _PuzzleEntry:
+        """ the registered puzzle of a query """
+        name = message.get('puzzle')
+        assert name in self.puzzles, 'puzzle is not registered, given: %s' % name
+        return self.puzzles[name]  # -> _PuzzleEntry
+
+    @staticmethod
+    def _scan(grid: grid_engine.GridEngine, words: set) -> dict:
+        """
+        Search all the words in one pass over the lines
+
+        :return dict:  word -> set of the coordinates of every occurrence
+        """
+        list_of_strings, line_table = grid.get_all_lines()
+        found = {}
+        for word, line_number, start_pos in aho_corasick.AhoCorasick(words).search_lines(list_of_strings):
+            found.setdefault(word, set()).add(grid.get_coordinates(line_table[line_number], start_pos, len(word)))
+        return found  # -> dict
+
+    async def _run_batches(self, entry: _PuzzleEntry):
+        """ scan the lines for the waiting queries of a puzzle until there are none """
+        loop = asyncio.get_running_loop()
+        while entry.pending:
+            await asyncio.sleep(self.batch_delay)  # let the queries sent at the same time join
+            async with self._semaphore:
+                pending, entry.pending = entry.pending, []
+                words = set().union(*(words for words, _ in pending))
+                entry.scans += 1
+                try:
+                    found = await loop.run_in_executor(self._executor, self._scan, entry.grid, words)
+                except Exception as e:  # every query of the scan gets the error
+                    for _, future in pending:
+                        if not future.done():
+                            future.set_exception(e)
+                    continue
+            for words, future in pending:
+                if not future.done():
+                    future.set_result({word: found[word] for word in words if word in found})
+        entry.batch_task = None
+
+    async def solve(self, puzzle: str, words) -> dict:
+        """
+        Search words in a registered puzzle, together with the other queries of the puzzle
+
+        :param puzzle:  The name of a registered puzzle
+        :param words:  An iterable of words to search for
+        :return dict:  word -> set of the coordinates of every occurrence, the words not found are left out
+        """
+        entry = self._get_puzzle({'puzzle': puzzle})
+        words = set(str(word) for word in words if word)
+        future = asyncio.get_running_loop().create_future()
+        entry.pending.append((words, future))
+        if entry.batch_task is None:
+            entry.batch_task = asyncio.ensure_future(self._run_batches(entry))
+        return await future  # -> dict
+
+    async def discover(self, puzzle: str, dictionary: str, min_length: int = 0) -> dict:
+        """
+        Find every word of a registered dictionary in a registered puzzle
+
+        :return dict:  word -> set of the coordinates of every occurrence
+        """
+        entry = self._get_puzzle({'puzzle': puzzle})
+        assert dictionary in self.dictionaries, 'dictionary is not registered, given: %s' % dictionary
+        grid, words = entry.grid, self.dictionaries[dictionary]
+
+        def discover_words() -> dict:
+            list_of_strings, line_table = grid.get_all_lines()
+            found = {}
+            for word, line_number, start_pos in words.search_lines(list_of_strings, int(min_length)):
+                found.setdefault(word, set()).add(grid.get_coordinates(line_table[line_number], start_pos,
+                                                                       len(word)))
+            return found  # -> dict
+
+        async with self._semaphore:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, discover_words)  # -> dict
+
+    @staticmethod
+    def _found_to_json(found: dict, words=()) -> dict:
+        """ the reply of a search, the coordinates as sorted lists """
+        return {'ok': True,
+                'found': {word: sorted([list(map(list, coordinates)) for coordinates in found[word]])
+                          for word in sorted(found)},
+                'words_not_found': sorted(set(words) - set(found))}  # -> dict
+
+    async def handle_message(self, message: dict) -> dict:
+        """
+        Answer a query
+
+        :param message:  A dict with an 'op' and the arguments of the op
+        :return dict:  The reply, with 'ok' False and an 'error' if the query failed
+        """
+        try:
+            assert isinstance(message, dict), 'a JSON object is needed, given: %s' % message
+            op = message.get('op')
+            if op == 'list':
+                return {'ok': True, 'puzzles': sorted(self.puzzles), 'dictionaries': sorted(self.dictionaries)}
+            if op in ('solve', 'lookup'):
+                words = message.get('words') if op == 'solve' else [message.get('word')]
+                assert isinstance(words, list) and all(isinstance(word, str) for word in words), \
+                    'a list of words is needed, given: %s' % words
+                words = [word.lower() for word in words if word]  # like the letters of the grid
+                found = await self.solve(message.get('puzzle'), words)
+                return self._found_to_json(found, words)
+            if op == 'discover':
+                found = await self.discover(message.get('puzzle'), message.get('dictionary'),
+                                            message.get('min_length', 0))
+                return self._found_to_json(found)
+            raise AssertionError('op should be one of list, solve, lookup or discover, given: %s' % op)
+        except (AssertionError, OSError, ValueError, TypeError, UnicodeDecodeError) as e:
+            return {'ok': False, 'error': '%s: %s' % (type(e).__name__, e)}
+
+    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """ answer the queries of a client, a JSON object per line; the queries of a client run concurrently """
+        write_lock = asyncio.Lock()
+
+        async def answer(line: bytes):
+            try:
+                reply = await self.handle_message(json.loads(line))
+            except ValueError as e:  # not JSON
+                reply = {'ok': False, 'error': '%s: %s' % (type(e).__name__, e)}
+            async with write_lock:
+                writer.write(json.dumps(reply).encode('utf-8') + b'\n')
+                await writer.drain()
+
+        tasks = set()
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                if line.strip():
+                    task = asyncio.ensure_future(answer(line))
+                    tasks.add(task)
+                    task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.gather(*tasks)
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+            pass
+        finally:
+            writer.close()
+
+    async def start(self, address: str) -> asyncio.AbstractServer:
+        """
+        Start listening
+
+        :param address:  host:port for TCP, anything else is the path of a Unix socket
+        :return asyncio.AbstractServer:  The started server
+        """
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        parsed = parse_address(address)
+        if parsed[0] == 'tcp':
+            return await asyncio.start_server(self._handle_client, parsed[1], parsed[2], limit=MAX_LINE_SIZE)
+        if os.path.exists(parsed[1]):  # a socket left by a server that stopped, any other file is kept
+            assert stat.S_ISSOCK(os.stat(parsed[1]).st_mode), 'the address exists and is not a socket: %s' % parsed[1]
+            os.remove(parsed[1])
+        return await asyncio.start_unix_server(self._handle_client, parsed[1], limit=MAX_LINE_SIZE)
+
+    async def serve(self, address: str):
+        """ listen on the address until stopped """
+        server = await self.start(address)
+        async with server:
+            await server.serve_forever()
+
+
+def request(address: str, message: dict) -> dict:
+    """
+    Send one query to a running server and wait for the reply
+
+    :param address:  The address the server listens on
+    :param message:  The query
+    :return dict:  The reply
+    """
+    async def send() -> dict:
+        parsed = parse_address(address)
+        if parsed[0] == 'tcp':
+            reader, writer = await asyncio.open_connection(parsed[1], parsed[2], limit=MAX_LINE_SIZE)
+        else:
+            reader, writer = await asyncio.open_unix_connection(parsed[1], limit=MAX_LINE_SIZE)
+        try:
+            writer.write(json.dumps(message).encode('utf-8') + b'\n')
+            await writer.drain()
+            return json.loads(await reader.readline())  # -> dict
+        finally:
+            writer.close()
+
+    return asyncio.run(send())  # -> dict
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+
+import os
+import json
+import hashlib
+
+import numpy as np
+
+try:
+    from .grid_engine import BLANK
+except ImportError:  # run as a script from within the word_search_puzzle directory
+    from grid_engine import BLANK
+
+CACHE_VERSION = 1  # part of every key, raise it when the stored solutions change
+DEFAULT_CACHE_DIR = os.path.join(os.environ.get('XDG_CACHE_HOME', os.path.expanduser('~/.cache')),
+                                 'word_search_puzzle')
+DEFAULT_MAX_SIZE = 64 * 1024 * 1024  # bytes
+
+
+class SolutionCache:
+    """ On disk cache of solved puzzles
+
+        a solution is stored as a JSON file named after the hash of
+        the normalised grid, the word set and the options of the solver
+
+        when the files together are larger than max_size
+        the least recently used solutions are removed
+
+        example:
+
+            cache = SolutionCache()
+            key = cache.make_key(grid, word_set, {'min_length': 0})
+            cache.get(key)
+            -> None
+            cache.put(key, {'solution_coordinates': ..., 'left_over_letters': 'test'})
+    """
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR, max_size: int = DEFAULT_MAX_SIZE):
+        """
+        init
+
+        :param cache_dir:  A directory to store the solutions in, made if it doesn't exist
+        :param max_size:  The maximum size in bytes of all the stored solutions together
+        """
+        assert int(max_size) > 0, 'max_size should be positive, given: %s' % max_size
+        self.cache_dir = os.path.realpath(str(cache_dir))
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self.max_size = int(max_size)
+        self.hits, self.misses = 0, 0
+
+    @staticmethod
+    def make_key(grid: np.ndarray, word_set, options: dict = None) -> str:
+        """
+        Hash a puzzle, its words and the options of the solver
+
+        :param grid:  The grid array of a grid_engine.GridEngine
+        :param word_set:  An iterable of the words to search for
+        :param options:  A dict of the options that change the solution, like min_length
+        :return str:  The key of the solution
+        """
+        grid = np.asarray(grid, dtype='<u4')
+        # blank rows and columns at the bottom and the right are padding, they don't change the solution
+        filled = grid != BLANK
+        height = int(np.flatnonzero(filled.any(axis=1))[-1]) + 1 if filled.any() else 0
+        width = int(np.flatnonzero(filled.any(axis=0))[-1]) + 1 if filled.any() else 0
+        grid = np.ascontiguousarray(grid[:height, :width])
+
+        digest = hashlib.sha256()
+        digest.update(('%s %s %s\n' % (CACHE_VERSION, height, width)).encode('utf-8'))
+        digest.update(grid.tobytes())
+        digest.update('\n'.join(sorted(set(word_set))).encode('utf-8'))
+        digest.update(json.dumps(options or {}, sort_keys=True).encode('utf-8'))
+        return digest.hexdigest()  # -> str
+
+    def _get_path(self, key: str) -> str:
+        """ the file of a solution """
+        return os.path.join(self.cache_dir, '%s.json' % key)  # -> str
+
+    def get(self, key: str) -> dict:
+        """
+        Get a stored solution and mark it as recently used
+
+        :param key:  A key of make_key
+        :return dict:  The stored solution, None if there is none
+        """
+        path = self._get_path(key)
+        try:
+            with open(path, 'r') as open_file:
+                solution = json.load(open_file)
+            os.utime(path)  # the modification time is the time of last use
+        except (OSError, ValueError):  # not stored, removed in between or damaged
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        solution['solution_coordinates'] = set(tuple(tuple(coordinate) for coordinate in coordinates)
+                                               for coordinates in solution['solution_coordinates'])
+        return solution  # -> dict
+
+    def put(self, key: str, solution: dict):
+        """
+        Store a solution, the least recently used solutions are removed if the cache gets too large
+
+        :param key:  A key of make_key
+        :param solution:  A dict with the solution_coordinates and other JSON serialisable values
+        """
+        solution = dict(solution)
+        solution['solution_coordinates'] = sorted([list(map(list, coordinates))
+                                                   for coordinates in solution['solution_coordinates']])
+
+        path = self._get_path(key)
+        temp_path = '%s.%s.tmp' % (path, os.getpid())
+        with open(temp_path, 'w') as open_file:
+            json.dump(solution, open_file)
+        os.replace(temp_path, path)  # other processes never read a half written file
+        self.evict()
+
+    def evict(self):
+        """ remove the least recently used solutions until the cache is not larger than max_size """
+        entries = []
+        for file_name in os.listdir(self.cache_dir):
+            if not file_name.endswith('.json'):
+                continue
+            try:
+                stat = os.stat(os.path.join(self.cache_dir, file_name))
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, file_name))
+
+        total_size = sum(size for _, size, _ in entries)
+        for _, size, file_name in sorted(entries):
+            if total_size <= self.max_size:
+                break
+            try:
+                os.remove(os.path.join(self.cache_dir, file_name))
+            except OSError:
+                pass
+            total_size -= size
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+
+import numpy as np
+
+SEPARATOR = '\n'  # between the lines in the text of the index, a grid has no newlines so no word crosses it
+
+
+class SuffixArray:
+    """ Suffix array over the lines of a puzzle, for many separate lookups of single words
+
+        the lines are joined into one text with SEPARATOR between them
+        and every suffix of that text is sorted once, with prefix doubling in NumPy:
+            the suffixes are ranked by their first k letters, as many as fit in an int64 together,
+            then by their first 2k, 4k, ... letters by sorting on the rank of a suffix
+            together with the rank of the suffix k letters further, until every suffix has its own rank
+
+        the suffixes that start with a word are next to each other in the suffix array,
+        they are found with a binary search on the word, so a lookup costs
+        the length of the word times log(the length of the text) plus the amount of occurrences,
+        and not a scan of all the lines
+
+        example:
+
+            index = SuffixArray(['abab', 'ba'])
+            index.count('ab')
+            -> 2
+            index.locate('ba')
+            -> [(0, 1), (1, 0)]
+    """
+
+    def __init__(self, list_of_strings: list):
+        """
+        init
+
+        :param list_of_strings:  A list of lines, like the ones of GridEngine.get_all_lines
+        """
+        self.text = SEPARATOR.join(list_of_strings)
+        lengths = np.array([len(string) + 1 for string in list_of_strings], dtype=np.int64)
+        self.line_starts = np.concatenate(([0], np.cumsum(lengths)[:-1])) if len(lengths) else lengths
+        self.suffix_array = self._create_suffix_array(self.text)
+
+    def __len__(self) -> int:
+        """ amount of suffixes in the index """
+        return len(self.suffix_array)  # -> int
+
+    @staticmethod
+    def _create_suffix_array(text: str) -> np.ndarray:
+        """
+        Sort the suffixes of the text by prefix doubling
+
+        :param text:  The text to index
+        :return numpy.ndarray:  The start positions of the suffixes of the text, in sorted order
+        """
+        size = len(text)
+        if size == 0:
+            return np.zeros(0, dtype=np.int64)  # -> np.ndarray
+
+        codes = np.frombuffer(text.encode('utf-32-le'), dtype='<u4')
+        _, letters = np.unique(codes, return_inverse=True)
+        letters = letters.astype(np.int64).ravel() + 1  # 0 is past the end of the text
+
+        # the rank of every suffix by its first letters, as many as fit in an int64
+        bits = (int(letters.max()) + 1).bit_length()
+        step = max(62 // bits, 1)
+        key = np.zeros(size, dtype=np.int64)
+        for offset in range(step):
+            key <<= bits
+            key[:max(size - offset, 0)] |= letters[offset:]
+        _, rank = np.unique(key, return_inverse=True)
+        rank = rank.astype(np.int64).ravel()
+        while rank.max() < size - 1:
+            # the rank of the suffix step letters further, -1 past the end of the text sorts before every letter
+            next_rank = np.full(size, -1, dtype=np.int64)
+            next_rank[:size - step] = rank[step:]
+            key = rank * (size + 1) + next_rank + 1
+            suffix_array = np.argsort(key)
+
+            # suffixes with the same key keep the same rank
+            sorted_key = key[suffix_array]
+            new_rank = np.empty(size, dtype=np.int64)
+            new_rank[suffix_array] = np.concatenate(([0], np.cumsum(sorted_key[1:] != sorted_key[:-1])))
+            rank = new_rank
+            step *= 2
+        suffix_array = np.empty(size, dtype=np.int64)
+        suffix_array[rank] = np.arange(size)
+        return suffix_array  # -> np.ndarray
+
+    def _get_range(self, word: str) -> tuple:
+        """ the first and past the last index in the suffix array of the suffixes that start with the word """
+        text, suffix_array, length = self.text, self.suffix_array, len(word)
+
+        low, high = 0, len(suffix_array)
+        while low < high:  # the first suffix that is not smaller than the word
+            middle = (low + high) // 2
+            start = int(suffix_array[middle])
+            if text[start:start + length] < word:
+                low = middle + 1
+            else:
+                high = middle
+        first = low
+
+        high = len(suffix_array)
+        while low < high:  # the first suffix that does not start with the word
+            middle = (low + high) // 2
+            start = int(suffix_array[middle])
+            if text[start:start + length] == word:
+                low = middle + 1
+            else:
+                high = middle
+        return first, low  # -> tuple
+
+    def count(self, word: str) -> int:
+        """
+        Count the occurrences of a word
+
+        :param word:  The word to count
+        :return int:  The amount of times the word is on the lines
+        """
+        if not word or SEPARATOR in word:
+            return 0  # -> int
+        first, end = self._get_range(word)
+        return end - first  # -> int
+
+    def locate(self, word: str) -> list:
+        """
+        Find every occurrence of a word
+
+        :param word:  The word to find
+        :return list:  A sorted list of (line number, start position) of every occurrence
+        """
+        if not word or SEPARATOR in word:
+            return []  # -> list
+        first, end = self._get_range(word)
+        positions = np.sort(self.suffix_array[first:end])
+        line_numbers = np.searchsorted(self.line_starts, positions, side='right') - 1
+        return list(zip(line_numbers.tolist(), (positions - self.line_starts[line_numbers]).tolist()))  # -> list
+
+    def search_lines(self, words):
+        """
+        Look up every word in the index
+
+        :param words:  An iterable of words to search for
+        :return generator:  (word, line number, start position) for every occurrence of every word
+        """
+        for word in words:
+            for line_number, start_pos in self.locate(word):
+                yield word, line_number, start_pos
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+
+
+class Trie:
+    """ Prefix tree of words
+
+        every node is a dict of letter -> child node
+        a node where a word ends holds that word under the key None
+
+        example:
+
+            trie = Trie({'bel', 'bier'})
+            trie.root
+            -> {'b': {'e': {'l': {None: 'bel'}}, 'i': {'e': {'r': {None: 'bier'}}}}}
+    """
+
+    def __init__(self, words=()):
+        """
+        init
+
+        :param words:  An iterable of words to add to the trie
+        """
+        self.root = {}
+        self._size = 0
+        for word in words:
+            self.add(word)
+
+    def __len__(self) -> int:
+        """ amount of words in the trie """
+        return self._size  # -> int
+
+    def __contains__(self, word: str) -> bool:
+        """ check if the word is in the trie """
+        node = self._get_node(str(word))
+        return node is not None and None in node  # -> bool
+
+    def _get_node(self, prefix: str) -> dict:
+        """ get the node of the prefix, None if no word starts with the prefix """
+        node = self.root
+        for letter in prefix:
+            node = node.get(letter)
+            if node is None:
+                break
+        return node  # -> dict
+
+    def add(self, word: str):
+        """
+        Add a word to the trie
+
+        :param word:  The word to add, empty words are skipped
+        """
+        word = str(word)
+        if not word:
+            return
+        node = self.root
+        for letter in word:
+            node = node.setdefault(letter, {})
+        if None not in node:
+            node[None] = word
+            self._size += 1
+
+    def has_prefix(self, prefix: str) -> bool:
+        """
+        Check if a word in the trie starts with the prefix
+
+        :param prefix:  The start of a word
+        :return bool:  True if a word starts with the prefix
+        """
+        return self._get_node(str(prefix)) is not None  # -> bool
+
+    def search_lines(self, list_of_strings: list, min_length: int = 0):
+        """
+        Walk the trie from every letter of every line
+        A walk stops as soon as no word starts with the letters walked so far
+
+        :param list_of_strings:  A list of lines to search in
+        :param min_length:  minimal length of the words to yield
+        :return generator:  (word, line number, start position) for every word on the lines
+        """
+        root = self.root
+        for line_number, string in enumerate(list_of_strings):
+            length = len(string)
+            for start_pos in range(length):
+                node = root
+                for position in range(start_pos, length):
+                    node = node.get(string[position])
+                    if node is None:  # no word starts with these letters
+                        break
+                    word = node.get(None)
+                    if word is not None and len(word) >= min_length:
+                        yield word, line_number, start_pos
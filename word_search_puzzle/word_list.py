@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+
+import io
+import os
+import re
+import bz2
+import gzip
+import lzma
+import locale
+
+SEPARATORS = re.compile(r'[\s,;]+')  # white space, comma's and semicolons, mixed in any way
+CHUNK_SIZE = 1 << 20  # letters read at once
+
+# the first bytes of a compressed file -> the module that opens it
+COMPRESSIONS = ((b'\x1f\x8b', gzip), (b'BZh', bz2), (b'\xfd7zXZ\x00', lzma), (b']\x00\x00', lzma))
+
+
+def open_word_file(word_file: str) -> io.TextIOBase:
+    """
+    Open a file of words as text, a gzip, bz2 or xz/lzma compressed file is decompressed while it is read
+
+    :param word_file:  A file of words, compressed or not
+    :return io.TextIOBase:  The open text file
+    """
+    word_file = os.path.realpath(str(word_file))
+    assert os.path.isfile(word_file), 'given: %s' % word_file
+
+    encoding = locale.getpreferredencoding(False)  # the same as GridEngine.from_file
+    with open(word_file, 'rb') as open_file:
+        magic = open_file.read(6)
+    for prefix, module in COMPRESSIONS:
+        if magic.startswith(prefix):
+            return module.open(word_file, 'rt', encoding=encoding)  # -> io.TextIOBase
+    return open(word_file, 'r', encoding=encoding)  # -> io.TextIOBase
+
+
+def iter_words(word_file: str, chunk_size: int = CHUNK_SIZE):
+    """
+    Read the words of a file in chunks, without holding the whole text in memory
+    The words are separated by any mix of SEPARATORS and made lowercase, like the letters of the grid
+
+    :param word_file:  A file of words, compressed or not
+    :param chunk_size:  The amount of letters read at once
+    :return generator:  Every word in the file, in order, duplicates included
+    """
+    assert int(chunk_size) > 0, 'chunk_size should be positive, given: %s' % chunk_size
+    with open_word_file(word_file) as open_file:
+        rest = ''
+        for chunk in iter(lambda: open_file.read(int(chunk_size)), ''):
+            words = SEPARATORS.split(rest + chunk.lower())
+            rest = words.pop()  # the last word can go on in the next chunk
+            yield from filter(None, words)
+        if rest:
+            yield rest
+
+
+def read_word_set(word_file: str, max_length: int = None, chunk_size: int = CHUNK_SIZE) -> set:
+    """
+    Read the words of a file once each
+
+    :param word_file:  A file of words, compressed or not
+    :param max_length:  optional - Longer words are left out, like the words longer than any line of a grid
+    :param chunk_size:  The amount of letters read at once
+    :return set:  The words of the file
+    """
+    words = iter_words(word_file, chunk_size)
+    if max_length is not None:
+        words = (word for word in words if len(word) <= max_length)
+    return set(words)  # -> set
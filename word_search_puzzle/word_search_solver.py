@@ -1,12 +1,29 @@
 #!/usr/bin/env python3
 
 import os
+import importlib
+from array import array
 
 import numpy as np
-import pandas as pd
 
-# print up to  `given`  rows
-pd.options.display.max_rows = 10000
+try:
+    from . import grid_engine, match_records, profiling
+except ImportError:  # run as a script from within the word_search_puzzle directory
+    import grid_engine
+    import match_records
+    import profiling
+
+
+def _import_module(name: str):
+    """ the modules of a method are imported on first use of the method, so a start up only loads what it needs """
+    return importlib.import_module('.' + name, __package__) if __package__ else importlib.import_module(name)
+
+
+def _import_pandas():
+    """ pandas is imported on first use of a DataFrame, so the 'numpy' engine runs without it """
+    import pandas as pd
+    pd.options.display.max_rows = 10000  # print up to  `given`  rows
+    return pd  # -> module
 
 
 class WordSearchPuzzle:
@@ -39,6 +56,10 @@ class WordSearchPuzzle:
              ((0, 1), (1, 1)  (2, 1)),
              ((0, 1), (1, 1)  (1, 2))}
 
+        the words found on straight lines are kept as match_records.MatchRecords,
+        one record of (word id, start row, start column, direction, length) per word in a NumPy array,
+        the coordinate tuples are made when the set is iterated
+
         or a string of unused letters can be returned
         example:
 
@@ -46,26 +67,206 @@ class WordSearchPuzzle:
 
         to show the solution visualize_solution can be called
         this requires tkinter to work
+
+        the words are searched line by line with str.find by default
+        with method='aho-corasick' all the words are searched in one pass over the lines
+        with method='suffix-array' the lines are indexed once and every word is looked up in the index,
+        for many separate searches in the same puzzle
+        with method='bent-path' the words can turn corners, like in boggle
+        with directions=4 only the rows, columns and diagonals read forwards are searched,
+        for every word and its reverse, so a palindrome is found once
+
+        with mismatches the words that are not found are searched again allowing that many wrong letters,
+        for puzzles with typing errors, the best matches are in approximate_matches
+
+        discover_words finds every word of a whole dictionary that is in the puzzle
+
+        with a solution_cache.SolutionCache the solutions are stored on disk
+        and a puzzle solved before with the same words is not searched again
+
+        the puzzle is stored in a pandas DataFrame by default
+        with engine='numpy' it is stored in a grid_engine.GridEngine instead
+        the DataFrames are then only created when they are asked for
+
+        with partition='tiles' the grid is split in tiles that are searched in parallel worker processes
+        with partition='words' the words are split in chunks that are searched in parallel worker processes
+
+        with a profiling.Profile the time and memory of every phase of a solve are measured
+        and the lines, hits and words not found are counted
+
+        update_cells changes letters of a solved puzzle and only searches the lines through the changed cells again
     """
 
-    def __init__(self, word_search_puzzle: str, word_search_set_file: str = None, get_solution: bool = True):
+    ENGINES = ('pandas', 'numpy')
+    METHODS = ('index', 'aho-corasick', 'suffix-array', 'bent-path')
+    PARTITIONS = ('tiles', 'words')
+
+    def __init__(self, word_search_puzzle: str, word_search_set_file: str = None, get_solution: bool = True,
+                 engine: str = 'pandas', cache: 'solution_cache.SolutionCache' = None,
+                 profile: profiling.Profile = None):
         """
         init
 
-        :param word_search_puzzle:  required - A path to the word search puzzle file
+        :param word_search_puzzle:  required - A path to the word search puzzle file, or a grid_engine.GridEngine
         :param word_search_set_file:  optional - A path to the file containing words to search for
         :param get_solution:  If word_search_set_file is given and this set to True find_words_in_puzzle is called
+        :param engine:  The backing store of the puzzle, one of ENGINES
+        :param cache:  optional - A solution_cache.SolutionCache to look up and store solutions
+        :param profile:  optional - A profiling.Profile to measure the phases of the solve in
         """
-        self.puzzle_df = self._create_puzzle_dataframe(word_search_puzzle)
-        self.position_df = self._create_position_dataframe(self.puzzle_df)
-
-        self.solution_coordinates = None  # set made in find_words_in_puzzle used in visualize_solution
+        assert engine in self.ENGINES, 'engine should be one of %s, given: %s' % (self.ENGINES, engine)
+        self.engine = engine
+        self.cache = cache
+        self.profile = profile if profile is not None else profiling.DISABLED
+        self._cache_key = None  # key of the current solution in the cache
+        self._left_over = None  # (solution_coordinates, left over letters) of the last solution
+
+        self.grid = None  # grid_engine.GridEngine used when engine is 'numpy'
+        self._puzzle_df, self._position_df = None, None
+        self._dataframe_grid = None  # grid_engine.GridEngine made from puzzle_df when engine is 'pandas'
+        self._suffix_array = {}  # line directions -> suffix_array.SuffixArray of the lines, see get_suffix_array
+        with self.profile.phase('parse'):
+            is_grid = isinstance(word_search_puzzle, grid_engine.GridEngine)  # a puzzle that is not in a file
+            if engine == 'numpy':
+                self.grid = word_search_puzzle if is_grid else grid_engine.GridEngine.from_file(word_search_puzzle)
+            else:
+                self.puzzle_df = word_search_puzzle.to_dataframe() if is_grid else \
+                    self._create_puzzle_dataframe(word_search_puzzle)
+                self.position_df = self._create_position_dataframe(self.puzzle_df)
+
+        self.solution_coordinates = None  # set or MatchRecords made in find_words_in_puzzle
+        self.words_not_found = []  # list of the words find_words_in_puzzle could not find
+        self.approximate_matches = {}  # word -> [(coordinates, coordinates of the wrong letters), ...]
+
+        # kept by find_words_in_puzzle for update_cells
+        self._search_options = None  # the arguments of the last search
+        self._line_records = None  # match_records.MatchRecords of the search along the lines
+        self._search_words = {}  # the words searched on the lines, see _get_search_words
+        self._automaton = None  # aho_corasick.AhoCorasick of the words when that method is used
 
         if word_search_set_file is not None:
-            self.word_set = self._create_word_set(word_search_set_file)
+            with self.profile.phase('word_set'):
+                self.word_set = self._create_word_set(word_search_set_file)
             if get_solution:
                 self.find_words_in_puzzle()
 
+    @property
+    def puzzle_df(self) -> 'pd.DataFrame':
+        """ DataFrame of the puzzle, created from the grid on first use if the engine is 'numpy' """
+        if self._puzzle_df is None and self.grid is not None:
+            self._puzzle_df = self.grid.to_dataframe()
+        return self._puzzle_df  # -> pd.DataFrame
+
+    @puzzle_df.setter
+    def puzzle_df(self, dataframe: 'pd.DataFrame'):
+        self._puzzle_df = dataframe
+        self._dataframe_grid = None
+        self._suffix_array = {}
+
+    @property
+    def position_df(self) -> 'pd.DataFrame':
+        """ DataFrame of the coordinates, created on first use if the engine is 'numpy' """
+        if self._position_df is None and self.puzzle_df is not None:
+            self._position_df = self._create_position_dataframe(self.puzzle_df)
+        return self._position_df  # -> pd.DataFrame
+
+    @position_df.setter
+    def position_df(self, dataframe: 'pd.DataFrame'):
+        self._position_df = dataframe
+
+    def _get_grid(self) -> grid_engine.GridEngine:
+        """
+        Get the grid to search in
+        If the engine is 'pandas' it is made from puzzle_df once and kept until invalidate is called
+
+        :return grid_engine.GridEngine:  The grid of the puzzle
+        """
+        if self.grid is not None:
+            return self.grid  # -> grid_engine.GridEngine
+        if self._dataframe_grid is None:
+            self._dataframe_grid = grid_engine.GridEngine.from_dataframe(self.puzzle_df)
+        return self._dataframe_grid  # -> grid_engine.GridEngine
+
+    def invalidate(self):
+        """
+        Forget the lines of the puzzle that are kept between searches
+        Call this after changing puzzle_df or grid directly, set_cells does this by itself
+        """
+        self._dataframe_grid = None
+        self._suffix_array = {}
+        self._line_records = None
+        if self.grid is not None:
+            self.grid.invalidate()
+
+    def _change_cells(self, cells: dict):
+        """ change the letters of the grid and of puzzle_df """
+        self._suffix_array = {}
+        if self.grid is not None:
+            self.grid.set_cells(cells)
+            self._puzzle_df = None  # made again from the grid when asked for
+        else:
+            grid = self._get_grid()
+            grid.set_cells(cells)
+            for x, y in cells:  # DataFrame[column][row]
+                self._puzzle_df.iat[y, x] = chr(grid.grid[y, x])
+
+    def set_cells(self, cells: dict):
+        """
+        Change letters of the puzzle
+        Only the lines of the puzzle that pass through the changed cells are made again, the solution is cleared
+        Use update_cells to change letters and keep the solution up to date
+
+        :param cells:  A dict of (x, y) coordinates -> letter
+        """
+        self._change_cells(cells)
+        self._line_records = None
+        self._set_solution(None, [])
+
+    def update_cells(self, cells: dict) -> set:
+        """
+        Change letters of the puzzle and solve it again
+        After a search along straight lines without partition or mismatches
+        only the lines that pass through the changed cells are searched again,
+        the words found on the other lines are kept
+        Otherwise the last search is done again on the whole puzzle
+
+        :param cells:  A dict of (x, y) coordinates -> letter
+        :return set:  The solution of the changed puzzle, the same as find_words_in_puzzle gives
+        """
+        assert self._search_options is not None, 'find_words_in_puzzle should be called before update_cells'
+        self._change_cells(cells)
+        if self._line_records is None or self._line_records.expanded:
+            self._set_solution(None, [])
+            return self.find_words_in_puzzle(**self._search_options)  # -> set
+
+        words, search_words, automaton = self._search_options['word_set'], self._search_words, self._automaton
+        line_directions = self._get_line_directions(self._search_options['directions'])
+        with self.profile.phase('lines'):
+            grid = self._get_grid()
+            list_of_strings, line_table = grid.get_all_lines(line_directions)
+            changed_lines = sorted({line_number for x, y in cells
+                                    for line_number, _ in grid.get_cell_lines(x, y, line_directions)})
+            lines = [list_of_strings[line_number] for line_number in changed_lines]
+
+        with self.profile.phase('search'):
+            if automaton is not None:
+                hits = automaton.search_lines(lines)
+                self.profile.count('lines_scanned', len(lines))
+            else:
+                hits = self._search_lines_with_index(list(search_words), lines)
+                self.profile.count('lines_scanned', len(lines) * len(search_words))
+            records = self._get_match_records(line_table, hits, changed_lines)
+
+            # take out the records on the changed lines and put in the new ones
+            solution = self._line_records.merge(records, remove=self._line_records.get_line_mask(cells))
+            found_words = solution.get_found_words()
+            words_not_found = [word for word in words if word not in found_words]
+
+        self.profile.count('words_not_found', len(words_not_found))
+        self._line_records = solution
+        self._set_solution(solution, words_not_found)
+        return solution  # -> set
+
     def _get_puzzle_size(self, word_search_puzzle: str) -> tuple:
         """
         Get the size of the puzzle
@@ -85,84 +286,63 @@ class WordSearchPuzzle:
 
             return int(width), int(height)
 
-    def _create_empty_dataframe(self, word_search_puzzle: str) -> pd.DataFrame:
+    def _create_empty_dataframe(self, word_search_puzzle: str) -> 'pd.DataFrame':
         """
         Create an DataFrame containing only spaces
 
         :param puzzle_file:  A text file containing the puzzle
         :return pandas.DataFrame:  An empty DataFrame containing only spaces in the size of the puzzle
         """
+        pd = _import_pandas()
         word_search_puzzle = os.path.realpath(str(word_search_puzzle))
         assert os.path.isfile(word_search_puzzle), 'given: %s' % word_search_puzzle
 
         width, height = self._get_puzzle_size(word_search_puzzle)  # -> tuple
-        max_size = max(width, height)
-        dataframe = pd.DataFrame([[chr(32) for x in np.arange(max_size)] for y in np.arange(max_size)])
+        dataframe = pd.DataFrame([[chr(32) for x in np.arange(width)] for y in np.arange(height)])
         return dataframe  # -> pd.Dataframe
 
-    def _create_puzzle_dataframe(self, word_search_puzzle: str) -> pd.DataFrame:
+    def _create_puzzle_dataframe(self, word_search_puzzle: str) -> 'pd.DataFrame':
         """
         Create a DataFrame containing the letters and spaces of the puzzle file
 
         :param puzzle_file:  A text file containing the puzzle
         :return pandas.DataFrame:  A DataFrame containing the puzzle
         """
-        word_search_puzzle = os.path.realpath(str(word_search_puzzle))
-        assert os.path.isfile(word_search_puzzle), 'given: %s' % word_search_puzzle
-
-        puzzle_df = self._create_empty_dataframe(word_search_puzzle)
-
-        # add the letters onto the DataFrame
-        with open(word_search_puzzle, 'r') as open_file:
-            for y, line in enumerate(open_file):
-                line = str(line).replace('\n', '')
-                for x, letter in enumerate(line):
-                    puzzle_df[x][y] = letter.strip().lower()
-
-        puzzle_df.replace(r'^\s*$', ' ', regex=True, inplace=True)
+        # the file is read once and parsed in one go by the grid engine
+        puzzle_df = grid_engine.GridEngine.from_file(word_search_puzzle).to_dataframe()
         return puzzle_df  # -> pd.Dataframe
 
-    def _create_word_set(self, word_search_set_file: str) -> set:
+    def _create_word_set(self, word_search_set_file: str, max_length: int = None) -> set:
         """
         Create a set out of the file of words given.
         The file of words should be seperated by new-lines, spaces, comma's or semicolons.
+        The file is read in chunks, it can be compressed with gzip, bz2 or xz, the words are made lowercase
 
         :param word_list_file:  A file containing the set of words to seek in the puzzle
+        :param max_length:  optional - Longer words are left out, like the words longer than any line of the puzzle
         :return set:  A set of words from the file
         """
         word_search_set_file = os.path.realpath(str(word_search_set_file))
         assert os.path.exists(word_search_set_file), 'given: %s' % word_search_set_file
 
-        word_set = set()
-        with open(word_search_set_file, 'r') as open_file:
-            for line in open_file:
-                line = line.replace('\n', '').strip()
-                if not line:  # if the length of the line is 0 go to the next word
-                    continue
-                line = line if ' ' not in line else line.split(' ')
-                line = line if ',' not in line else line.split(',')
-                line = line if ';' not in line else line.split(';')
-                if isinstance(line, list):
-                    line_list = [word.strip() for word in line]
-                    word_set.update(set(line_list))
-                    continue
-                word_set.add(line.strip())
+        word_set = _import_module('word_list').read_word_set(word_search_set_file, max_length=max_length)
         return word_set  # -> set
 
-    def _create_position_dataframe(self, dataframe: pd.DataFrame) -> pd.DataFrame:
+    def _create_position_dataframe(self, dataframe: 'pd.DataFrame') -> 'pd.DataFrame':
         """
         Create a DataFrame containing the coordinates in tuples of the frame
 
         :param dataframe: A DataFrame of the puzzle
         :return pandas.DataFrame: A DataFrame containing the coordinate of the frame
         """
+        pd = _import_pandas()
         assert isinstance(dataframe, pd.DataFrame)
         height, width = dataframe.shape[:2]
-        position_df = pd.DataFrame(  # create the frame including the empty characters
-            [[(row, column) for row in np.arange(height)] for column in np.arange(width)])
+        position_df = pd.DataFrame(  # create the frame including the empty characters, position_df[x][y] -> (x, y)
+            [[(column, row) for column in np.arange(width)] for row in np.arange(height)])
         return position_df  # -> pd.Dataframe
 
-    def get_turned_dataframe(self, dataframe: pd.DataFrame, times: int = 1) -> pd.DataFrame:
+    def get_turned_dataframe(self, dataframe: 'pd.DataFrame', times: int = 1) -> 'pd.DataFrame':
         """
         Get a turned DataFrame from the given DataFrame
         The rotation is in 90degrees clockwise per turn.
@@ -171,6 +351,7 @@ class WordSearchPuzzle:
         :param times:  How many times the puzzle needs to be turned
         :return pandas.DataFrame:  A turned DataFrame of the puzzle
         """
+        pd = _import_pandas()
         assert isinstance(dataframe, pd.DataFrame)
         assert isinstance(times, int)
 
@@ -180,7 +361,7 @@ class WordSearchPuzzle:
 
         return turned_frame  # -> pd.DataFrame
 
-    def get_diagonal_dataframe(self, dataframe: pd.DataFrame) -> pd.DataFrame:
+    def get_diagonal_dataframe(self, dataframe: 'pd.DataFrame') -> 'pd.DataFrame':
         """
         Get a DataFrame that is diagonal with respect to the given DataFrame
         The given DataFrame is `read` from the bottom left to the top right
@@ -189,6 +370,7 @@ class WordSearchPuzzle:
         :param dataframe:  A DataFrame of the puzzle
         :return pandas.DataFrame:  The diagonally projected DataFrame
         """
+        pd = _import_pandas()
         assert isinstance(dataframe, pd.DataFrame)
 
         rows = []
@@ -202,15 +384,15 @@ class WordSearchPuzzle:
 
         return dataframe  # -> pd.DataFrame
 
-    def get_all_possibilities(self, dataframe: pd.DataFrame) -> pd.DataFrame:
+    def get_all_possibilities(self, dataframe: 'pd.DataFrame') -> 'pd.DataFrame':
         """
         This creates all angles of the DataFrame and concatenate those to one DataFrame
 
         :param dataframe:  A DataFrame of the puzzle
         :return pandas.DataFrame:  A concatenated DataFrame of all the angles of the given DataFrame
         """
+        pd = _import_pandas()
         assert isinstance(dataframe, pd.DataFrame)
-        assert dataframe.shape[0] == dataframe.shape[1]
 
         deg0    = self.get_turned_dataframe(dataframe, times=0)
         deg90   = self.get_turned_dataframe(dataframe, times=1)
@@ -223,10 +405,11 @@ class WordSearchPuzzle:
         obj_tuple = (deg0, deg90, deg180, deg270, diag0, diag90, diag180, diag270)
         dataframe = pd.concat(obj_tuple, ignore_index=True)
         dataframe.reset_index(drop=True, inplace=True)  # really necessary!
+        dataframe.fillna(value=' ', inplace=True)  # the turned frames of a rectangle are not as wide
 
         return dataframe  # -> pd.DataFrame
 
-    def find_word_with_coordinates(self, dataframe: pd.DataFrame, coordinates: pd.Series) -> str:
+    def find_word_with_coordinates(self, dataframe: 'pd.DataFrame', coordinates: 'pd.Series') -> str:
         """
         This wil find the word in the given DataFrame with the given coordinates
 
@@ -234,6 +417,7 @@ class WordSearchPuzzle:
         :param coordinates:  A pandas.Series of a tuple containing (x, y) coordinates
         :return str:  The word found in the puzzle by the given coordinates
         """
+        pd = _import_pandas()
         if isinstance(coordinates, tuple):
             coordinates = pd.Series(coordinates)
         assert isinstance(dataframe, pd.DataFrame)
@@ -253,16 +437,149 @@ class WordSearchPuzzle:
         finally:
             return word  # -> str
 
-    def find_words_in_puzzle(self, word_set: set = None, min_length: int = 0) -> set:
+    @staticmethod
+    def _get_line_directions(directions: int) -> tuple:
+        """ the directions of the lines that are searched for the amount of directions of find_words_in_puzzle """
+        return grid_engine.DIRECTIONS if directions == 8 else grid_engine.FORWARD_DIRECTIONS  # -> tuple
+
+    @staticmethod
+    def _get_search_words(words: list, backwards: bool = False) -> dict:
+        """
+        Get the words to search on the lines
+
+        :param words:  A list of words to search for
+        :param backwards:  If True the reverse of every word is searched too, for lines of 4 directions
+        :return dict:  word on the line -> ((word, True if it is read backwards), ...)
+        """
+        search_words = {}
+        for word in words:
+            targets = search_words.setdefault(word, [])
+            if (word, False) not in targets:
+                targets.append((word, False))
+            if backwards and word[::-1] != word:  # a palindrome is only read forwards
+                targets = search_words.setdefault(word[::-1], [])
+                if (word, True) not in targets:
+                    targets.append((word, True))
+        return {search_word: tuple(targets) for search_word, targets in search_words.items()}  # -> dict
+
+    @staticmethod
+    def _search_lines_with_index(words: list, list_of_strings: list):
+        """
+        Search every word in every line with str.find
+
+        :param words:  A list of words to search for
+        :param list_of_strings:  A list of lines to search in
+        :return generator:  (word, line number, start position) for every occurrence of a word
+        """
+        for word in words:
+            for line_number, string in enumerate(list_of_strings):
+                # find the word in the string and return the 1st letter, -1 if the word is not found
+                start_pos = string.find(word)
+                while start_pos >= 0:
+                    yield word, line_number, start_pos
+                    start_pos = string.find(word, start_pos + 1)
+
+    def _get_match_records(self, line_table: np.ndarray, hits, line_numbers: list = None) \
+            -> match_records.MatchRecords:
+        """
+        Turn the hits of a search along the lines into records of the words of the last search
+
+        :param line_table:  The line table of the lines of the search
+        :param hits:  (word on the line, line number, start position) like _search_lines_with_index gives
+        :param line_numbers:  optional - The line numbers in the line table of the lines searched,
+                              if not all the lines are searched
+        :return match_records.MatchRecords:  The records of the words, read backwards if the search word is reversed
+        """
+        words = self._search_options['word_set']
+        word_ids = {word: word_id for word_id, word in enumerate(words)}
+        rows = array('q')  # 5 integers per hit, without a Python object per hit
+        for search_word, line_number, start_pos in hits:
+            line_number = line_number if line_numbers is None else line_numbers[line_number]
+            for word, backwards in self._search_words[search_word]:
+                rows.extend((word_ids[word], line_number, start_pos, len(search_word), backwards))
+        self.profile.count('candidate_hits', len(rows) // 5)
+        return match_records.MatchRecords.from_lines(words, line_table, rows)  # -> match_records.MatchRecords
+
+    def get_suffix_array(self, directions: tuple = grid_engine.DIRECTIONS) -> 'suffix_array.SuffixArray':
+        """
+        Get the index of the lines of the puzzle
+        It is made on the first call and kept until the puzzle changes
+
+        :param directions:  The directions of the lines, like grid_engine.DIRECTIONS
+        :return suffix_array.SuffixArray:  The index of the lines of get_all_lines
+        """
+        directions = tuple(directions)
+        if directions not in self._suffix_array:
+            lines = self._get_grid().get_all_lines(directions)[0]
+            self._suffix_array[directions] = _import_module('suffix_array').SuffixArray(lines)
+        return self._suffix_array[directions]  # -> suffix_array.SuffixArray
+
+    def count_word(self, word: str) -> int:
+        """
+        Count the occurrences of a word in the puzzle with the index of get_suffix_array
+
+        :param word:  The word to count
+        :return int:  The amount of times the word is in the puzzle, in all 8 directions
+        """
+        return self.get_suffix_array().count(str(word).lower())  # -> int
+
+    def locate_word(self, word: str) -> list:
+        """
+        Find every occurrence of a word in the puzzle with the index of get_suffix_array
+
+        :param word:  The word to find
+        :return list:  A list of tuples of (x, y) coordinates, one per occurrence
+        """
+        word = str(word).lower()
+        line_table = self._get_grid().get_all_lines()[1]
+        return [grid_engine.GridEngine.get_coordinates(line_table[line_number], start_pos, len(word))
+                for line_number, start_pos in self.get_suffix_array().locate(word)]  # -> list
+
+    def get_word(self, coordinates) -> str:
+        """
+        Get the word on the coordinates, without making the DataFrames
+
+        :param coordinates:  A tuple of (x, y) coordinates, like the ones in solution_coordinates
+        :return str:  The letters on the coordinates
+        """
+        return self._get_grid().get_letters(coordinates)  # -> str
+
+    def find_words_in_puzzle(self, word_set: set = None, min_length: int = 0, method: str = 'index',
+                             partition: str = None, max_workers: int = None, mismatches: int = 0,
+                             directions: int = 8) -> set:
         """
         Finds the words in the puzzle and returns its coordinates
 
         :param word_set:  A set('words', ...) to find in the
                           If None is given the word_search_set_file will be chosen
         :param min_length:  minimal length of the word to search for
+        :param method:  How the lines are searched, one of METHODS
+                        'index' searches the lines once per word
+                        'aho-corasick' searches the lines once for all the words together
+                        'suffix-array' looks up every word in an index of the lines, made once per puzzle
+                        'bent-path' searches paths of neighbouring cells that can turn corners, a cell is used once
+        :param partition:  optional - How the search is split over worker processes, one of PARTITIONS
+                           'tiles' searches tiles of the grid, for very large grids
+                           'words' searches chunks of the words, for very large word sets
+        :param max_workers:  The amount of worker processes of the partition, None uses the amount of cores
+        :param mismatches:  The amount of wrong letters allowed when the words that are not found are searched again
+                            the matches with the fewest wrong letters are added to the solution
+                            and kept in approximate_matches
+        :param directions:  The amount of directions of the lines that are searched, 8 or 4
+                            4 searches the lines of grid_engine.FORWARD_DIRECTIONS for every word and its reverse,
+                            half the lines of 8, a palindrome is found once, read in the forward direction
         :return set:  A set of coordinates that correspond with letters of the found words in the puzzle
+                      the words on straight lines are a match_records.MatchRecords with the methods of a set
         """
         assert word_set or self.word_set, 'needs a set of words to search for'
+        assert method in self.METHODS, 'method should be one of %s, given: %s' % (self.METHODS, method)
+        assert partition is None or partition in self.PARTITIONS, \
+            'partition should be one of %s, given: %s' % (self.PARTITIONS, partition)
+        assert partition is None or method in ('index', 'aho-corasick'), \
+            'the %s method can not be partitioned' % method
+        assert directions in (8, 4), 'directions should be 8 or 4, given: %s' % directions
+        assert directions == 8 or (partition is None and method != 'bent-path'), \
+            '4 directions are only searched on the lines, without partition'
 
         if word_set is not None:
             assert type(word_set) in [set, list, tuple]
@@ -272,61 +589,227 @@ class WordSearchPuzzle:
 
         assert type(min_length) in [int, tuple]
         min_length = int(min_length) if int(min_length) >= 0 else 0  # negative numbers becomes 0
+        assert int(mismatches) >= 0, 'mismatches should not be negative, given: %s' % mismatches
+        mismatches = int(mismatches)
+
+        # if the word is smaller than the given minimal length it is not searched for
+        # or the word is a False == ''
+        words = [word for word in word_set if len(word) >= min_length and bool(word)]
+        self._search_options = {'word_set': words, 'min_length': min_length, 'method': method,
+                                'partition': partition, 'max_workers': max_workers, 'mismatches': mismatches,
+                                'directions': directions}
+        self._line_records, self._automaton = None, None
+
+        with self.profile.phase('grid'):
+            grid = self._get_grid()
+
+        # a word longer than any line is not on a line, only a bent path can be that long
+        longest = max(grid.shape) if method != 'bent-path' else grid.grid.size
+        searched_words = [word for word in words if len(word) <= longest]
+        self._search_words = self._get_search_words(searched_words, backwards=directions == 4)
+
+        if self.cache is not None:  # a solution of the same grid, words and options skips the search
+            with self.profile.phase('cache'):
+                options = {'min_length': min_length}
+                if mismatches:
+                    options['mismatches'] = mismatches
+                if directions != 8:  # a palindrome is found once
+                    options['directions'] = directions
+                if method == 'bent-path':  # finds words that turn corners, the other methods find the same words
+                    options['method'] = method
+                cache_key = self.cache.make_key(grid.grid, words, options)
+                solution = self.cache.get(cache_key)
+            if solution is not None:
+                self.profile.count('words_not_found', len(solution['words_not_found']))
+                approximate_matches = {word: [(tuple(map(tuple, coordinates)), tuple(map(tuple, wrong)))
+                                              for coordinates, wrong in matches]
+                                       for word, matches in solution.get('approximate_matches', {}).items()}
+                self._set_solution(solution['solution_coordinates'], solution['words_not_found'],
+                                   solution['left_over_letters'], cache_key, approximate_matches)
+                return self.solution_coordinates  # -> set
+
+        line_directions = self._get_line_directions(directions)
+        if partition != 'tiles' and method != 'bent-path':
+            with self.profile.phase('lines'):
+                # the lines of the directions and a table to calculate the coordinates of a letter on a line
+                list_of_strings, line_table = grid.get_all_lines(line_directions)
+        if method == 'suffix-array':
+            with self.profile.phase('suffix_array'):
+                index = self.get_suffix_array(line_directions)
+
+        with self.profile.phase('search'):
+            if partition is not None:
+                parallel = _import_module('parallel')
+
+            if partition == 'tiles':  # the worker processes make the lines of their tiles
+                hits = parallel.search_tiled(grid, searched_words, method, max_workers=max_workers)
+            elif method == 'bent-path':  # walked from every cell along a trie of the words
+                hits = _import_module('bent_path').BentPathSearch(grid).search(searched_words)
+            elif partition == 'words':  # the worker processes share the lines made here
+                hits = parallel.search_words(grid, searched_words, method, max_workers=max_workers)
+                self.profile.count('lines_scanned',
+                                   len(list_of_strings) * (len(searched_words) if method == 'index' else 1))
+            else:
+                search_words = self._search_words
+                if method == 'aho-corasick':  # one automaton of all the words, every line is scanned once
+                    self._automaton = _import_module('aho_corasick').AhoCorasick(search_words)
+                    hits = self._automaton.search_lines(list_of_strings)
+                    self.profile.count('lines_scanned', len(list_of_strings))
+                elif method == 'suffix-array':  # every word is looked up in the index, no line is scanned
+                    hits = index.search_lines(search_words)
+                else:
+                    hits = self._search_lines_with_index(list(search_words), list_of_strings)
+                    self.profile.count('lines_scanned', len(list_of_strings) * len(search_words))
+                # the records of the words, kept for update_cells
+                solution = self._get_match_records(line_table, hits)
+                if not mismatches:  # approximate matches are not searched again along the changed lines
+                    self._line_records = solution
+
+            if method == 'bent-path':  # a path that turns corners is kept as its coordinates
+                hits = list(hits)
+                solution = {coordinates for _, coordinates in hits}
+                found_words = {word for word, _ in hits}
+                self.profile.count('candidate_hits', len(hits))
+            else:
+                if partition is not None:  # the worker processes give (word, coordinates)
+                    hits = list(hits)
+                    solution = match_records.MatchRecords.from_coordinates(words, hits)
+                    self.profile.count('candidate_hits', len(hits))
+                found_words = solution.get_found_words()
+            words_not_found = [word for word in words if word not in found_words]
+        self.profile.count('verified_hits', len(solution))
+
+        approximate_matches = {}
+        if mismatches and words_not_found:  # search the missing words again, allowing wrong letters
+            with self.profile.phase('approximate'):
+                approximate_matches = self._find_approximate_matches(grid, words_not_found, mismatches)
+            hits = [(word, coordinates) for word, matches in approximate_matches.items() for coordinates, _ in matches]
+            if isinstance(solution, set):
+                solution.update(coordinates for _, coordinates in hits)
+            else:
+                solution = solution.merge(match_records.MatchRecords.from_coordinates(words, hits))
+            words_not_found = [word for word in words_not_found if word not in approximate_matches]
+        self.profile.count('words_not_found', len(words_not_found))
+
+        self._set_solution(solution, words_not_found, None, None, approximate_matches)
+        if self.cache is not None:
+            self._cache_key = cache_key
+            self.cache.put(cache_key, self._get_cache_entry(None))
+        return solution  # -> set
+
+    def _find_approximate_matches(self, grid: grid_engine.GridEngine, words: list, mismatches: int) -> dict:
+        """
+        Search words allowing wrong letters, with one bit-parallel scan of the lines for all the words
 
-        combined_puzzle_df = self.get_all_possibilities(self.puzzle_df)
-        combined_position_df = self.get_all_possibilities(self.position_df)
-
-        # make a list of strings
-        # a list that keeps the empty spaces that might be in the DataFrame
-        list_of_strings = [''.join(row.tolist()) for _, row in combined_puzzle_df.iterrows()]
+        :param grid:  The grid of the puzzle
+        :param words:  A list of words to search for
+        :param mismatches:  The maximum amount of wrong letters
+        :return dict:  word -> [(coordinates, coordinates of the wrong letters), ...] of the matches
+                       with the fewest wrong letters, words without matches are left out
+        """
+        list_of_strings, line_table = grid.get_all_lines()
 
-        found_word_positions_set = set()
-        for word in word_set:
-            # if the word is smaller than the given minimal length continue to the next word
-            # or the word is a False == ''
-            if len(word) < min_length or not bool(word):
+        best = {}  # word -> (amount of wrong letters, matches)
+        for word, line_number, start_pos, wrong_letters in \
+                _import_module('approximate').ShiftAnd(words, mismatches).search_lines(list_of_strings):
+            if word in best and best[word][0] < wrong_letters:
                 continue
+            if word not in best or wrong_letters < best[word][0]:
+                best[word] = (wrong_letters, [])
+            coordinates = grid.get_coordinates(line_table[line_number], start_pos, len(word))
+            letters = list_of_strings[line_number][start_pos:start_pos + len(word)]
+            wrong = tuple(coordinate for coordinate, letter, found_letter in zip(coordinates, word, letters)
+                          if letter != found_letter)
+            best[word][1].append((coordinates, wrong))
+        return {word: matches for word, (_, matches) in best.items()}  # -> dict
+
+    def _get_cache_entry(self, left_over_letters: str = None) -> dict:
+        """ the current solution as it is stored in the cache """
+        entry = {'solution_coordinates': self.solution_coordinates,
+                 'words_not_found': self.words_not_found,
+                 'left_over_letters': left_over_letters}
+        if self.approximate_matches:
+            entry['approximate_matches'] = {word: [[list(map(list, coordinates)), list(map(list, wrong))]
+                                                   for coordinates, wrong in matches]
+                                            for word, matches in self.approximate_matches.items()}
+        return entry  # -> dict
+
+    def _set_solution(self, solution_coordinates: set, words_not_found: list, left_over_letters: str = None,
+                      cache_key: str = None, approximate_matches: dict = None):
+        """ keep the solution of find_words_in_puzzle and print the words that are not found """
+        self.solution_coordinates = solution_coordinates
+        self.words_not_found = list(words_not_found)
+        self.approximate_matches = dict(approximate_matches or {})
+        self._left_over = (solution_coordinates, left_over_letters) if left_over_letters is not None else None
+        self._cache_key = cache_key
+        for word, matches in sorted(self.approximate_matches.items()):
+            for _, wrong in matches:
+                print('%s is found with wrong letters on %s' % (word, str(wrong)))
+        for word in self.words_not_found:
+            print('%s is not found' % word)
+
+    def discover_words(self, dictionary=None, min_length: int = 0) -> set:
+        """
+        Finds every word of a dictionary that is in the puzzle
+        From every letter the 8 directions are walked along a prefix trie of the dictionary,
+        a walk stops as soon as no word of the dictionary starts with the letters walked
+
+        :param dictionary:  A set('words', ...), a trie.Trie or a compact_dictionary.CompactDictionary
+                            of words that could be in the puzzle, the last two are used as they are
+                            If None is given the word_search_set_file will be chosen
+        :param min_length:  minimal length of the words to find
+        :return set:  A set of coordinates that correspond with letters of the found words in the puzzle
+        """
+        dictionary = dictionary if dictionary is not None else self.word_set
+        assert dictionary, 'needs a dictionary of words to search for'
 
-            found = False
-            for line_number, string in enumerate(list_of_strings):
-                try:  # find the word in the string and return the 1st letter
-                    start_pos = string.index(word)
-                except ValueError:  # word not found in string
-                    continue
-                # get the end pos of the list where the word should be located
-                end_pos = start_pos + len(word)
-
-                # get the coordinates in the positions DataFrame of the word in the puzzle DataFrame
-                coordinates = combined_position_df.iloc[line_number, start_pos:end_pos]
-
-                # check if the found word in the puzzle DataFrame matches the word that was searched
-                found_word = self.find_word_with_coordinates(self.puzzle_df, coordinates)
-                found = bool(found_word == word)  # sets found to True if words match
-
-                if found:  # if the word matches, add the tuple of coordinates to the set
-                    found_word_positions_set.add(tuple(coordinates))
-
-            if not found:
-                print('%s is not found' % word)
+        trie, compact_dictionary = _import_module('trie'), _import_module('compact_dictionary')
+        if not isinstance(dictionary, (trie.Trie, compact_dictionary.CompactDictionary)):
+            assert type(dictionary) in [set, list, tuple, frozenset]
+            dictionary = trie.Trie(str(word).lower() for word in dictionary)
 
-        self.solution_coordinates = found_word_positions_set
-        return found_word_positions_set  # -> set
+        assert type(min_length) in [int, tuple]
+        min_length = int(min_length) if int(min_length) >= 0 else 0  # negative numbers becomes 0
 
-    def get_left_over_coordinates(self) -> pd.Series:
+        with self.profile.phase('grid'):
+            grid = self._get_grid()
+        with self.profile.phase('lines'):
+            list_of_strings, line_table = grid.get_all_lines()
+
+        with self.profile.phase('search'):
+            word_ids, rows = {}, array('q')  # a word of the dictionary gets an id when it is found
+            for word, line_number, start_pos in dictionary.search_lines(list_of_strings, min_length):
+                rows.extend((word_ids.setdefault(word, len(word_ids)), line_number, start_pos, len(word), 0))
+            solution = match_records.MatchRecords.from_lines(list(word_ids), line_table, rows)
+        self.profile.count('lines_scanned', len(list_of_strings))
+        self.profile.count('candidate_hits', len(rows) // 5)
+        self.profile.count('verified_hits', len(solution))
+
+        self._search_options, self._line_records = None, None
+        self._set_solution(solution, [])
+        return solution  # -> set
+
+    def _get_coverage_mask(self) -> np.ndarray:
+        """ the mask of the cells of the solution, the records of the words on straight lines are not expanded """
+        grid = self._get_grid()
+        if isinstance(self.solution_coordinates, match_records.MatchRecords):
+            return self.solution_coordinates.get_coverage_mask(grid.grid.shape)  # -> np.ndarray
+        return grid.get_coverage_mask(self.solution_coordinates)  # -> np.ndarray
+
+    def get_left_over_coordinates(self) -> 'pd.Series':
         """
         This returns the Cartesian positions that are not used to solve the puzzle.
 
         :return pandas.Series: series of Cartesian positions
         """
+        pd = _import_pandas()
         if self.solution_coordinates is None:
             self.find_words_in_puzzle()
 
-        position_df = self.position_df.copy()  # save the original
-        for coordinates in self.solution_coordinates:
-            for column, row in coordinates:
-                position_df[column][row] = ''
-
-        left_over = pd.Series(pos for _, row in position_df.iterrows() for pos in row if pos)
+        # the cells of the solution are marked in a mask, the other cells are the left over, row by row
+        mask = self._get_coverage_mask()
+        rows, columns = np.nonzero(~mask)
+        left_over = pd.Series(list(zip(columns.tolist(), rows.tolist())), dtype=object)
         return left_over  # -> pd.Series
 
     def get_left_over_letters(self) -> str:
@@ -335,9 +818,19 @@ class WordSearchPuzzle:
 
         :return str:  A string of unused letters
         """
-        left_over = self.get_left_over_coordinates()
-        letters = self.find_word_with_coordinates(self.puzzle_df, left_over)
-        return letters.replace(' ', '')  # -> str
+        if self._left_over is not None and self._left_over[0] is self.solution_coordinates:
+            return self._left_over[1]  # -> str
+
+        if self.solution_coordinates is None:
+            self.find_words_in_puzzle()
+
+        with self.profile.phase('left_over'):
+            letters = self._get_grid().get_left_over_letters(self._get_coverage_mask())
+
+        if self.cache is not None and self._cache_key is not None:  # complete the stored solution
+            self.cache.put(self._cache_key, self._get_cache_entry(letters))
+        self._left_over = (self.solution_coordinates, letters)
+        return letters  # -> str
 
     def visualize_solution(self):
         """